@@ -0,0 +1,331 @@
+"""
+Throughput and latency of every API endpoint, as JSON to compare commits.
+
+Seeds a throwaway SQLite database with ``benchmarks.data``, drives each
+endpoint in-process through the Django test client, then (unless
+``--no-server``) with concurrent clients against a local server.
+
+    python -m benchmarks.api [--duration S] [--output results.json]
+    python -m benchmarks.api --compare baseline.json
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from .data import CONDITION_WEIGHTS, PROVINCE_WEIGHTS, SPECIES_WEIGHTS, generate
+from .server import ROOT, load, percentiles, server_commands, server_env, wait_for
+from .utils import setup_django
+
+
+class Pool:
+    """Ids that can only be used once, e.g. conditions to delete."""
+
+    def __init__(self, items):
+        self.items = list(items)
+
+    def take(self):
+        try:
+            # list.pop is atomic, the pool is shared by the client threads
+            return self.items.pop()
+        except IndexError:
+            return None
+
+
+class Fixtures:
+    def __init__(self, owner_ids, pet_ids):
+        from core.models import Pet, PetMedicalCondition
+
+        self.owner_ids = [str(pk) for pk in owner_ids]
+        self.pet_ids = [str(pk) for pk in pet_ids]
+        self.deletable = Pool(
+            (str(pet_id), str(pk))
+            for pk, pet_id in PetMedicalCondition.objects.values_list("id", "pet_id")
+        )
+        self.without_conditions = Pool(
+            str(pk)
+            for pk in Pet.objects.filter(petmedicalcondition__isnull=True)
+            .values_list("id", flat=True)
+            .distinct()
+        )
+
+    def owner(self, rng):
+        return rng.choice(self.owner_ids)
+
+    def pet(self, rng):
+        return rng.choice(self.pet_ids)
+
+
+def owner_body(rng):
+    return {
+        "first_name": "Bench",
+        "last_name": "Mark",
+        "province": rng.choice(list(PROVINCE_WEIGHTS)),
+    }
+
+
+def pet_body(fixtures, rng):
+    return {
+        "name": "Bench",
+        "species": rng.choice(list(SPECIES_WEIGHTS)),
+        "age": rng.randint(0, 15),
+        "owner": fixtures.owner(rng),
+    }
+
+
+def destroy_condition(fixtures, rng):
+    taken = fixtures.deletable.take()
+    if taken is None:
+        return None
+    pet_id, condition_id = taken
+    return "DELETE", f"/api/pets/{pet_id}/medical-conditions/{condition_id}", None
+
+
+def create_condition(fixtures, rng):
+    pet_id = fixtures.without_conditions.take()
+    if pet_id is None:
+        return None
+    body = {"condition": rng.choice(list(CONDITION_WEIGHTS))}
+    return "POST", f"/api/pets/{pet_id}/medical-conditions/", body
+
+
+# Request factories by benchmark name, each returns (method, path, JSON body)
+# or None when its fixtures are used up
+ENDPOINTS = {
+    "metrics": lambda f, rng: ("GET", "/api/_metrics", None),
+    "owner-list": lambda f, rng: ("GET", "/api/owners/", None),
+    "owner-create": lambda f, rng: ("POST", "/api/owners/", owner_body(rng)),
+    "owner-bulk-create": lambda f, rng: (
+        "POST",
+        "/api/owners/",
+        [owner_body(rng) for _ in range(100)],
+    ),
+    "owner-export": lambda f, rng: ("GET", "/api/owners/export", None),
+    "owner-retrieve": lambda f, rng: ("GET", f"/api/owners/{f.owner(rng)}/", None),
+    "owner-update": lambda f, rng: (
+        "PATCH",
+        f"/api/owners/{f.owner(rng)}/",
+        {"first_name": "Updated"},
+    ),
+    "owner-pet-list": lambda f, rng: (
+        "GET",
+        f"/api/owners/{f.owner(rng)}/pets/",
+        None,
+    ),
+    "pet-list": lambda f, rng: ("GET", "/api/pets/", None),
+    "pet-create": lambda f, rng: ("POST", "/api/pets/", pet_body(f, rng)),
+    "pet-bulk-create": lambda f, rng: (
+        "POST",
+        "/api/pets/",
+        [pet_body(f, rng) for _ in range(100)],
+    ),
+    "pet-export": lambda f, rng: ("GET", "/api/pets/export", None),
+    "pet-retrieve": lambda f, rng: ("GET", f"/api/pets/{f.pet(rng)}/", None),
+    "pet-update": lambda f, rng: (
+        "PATCH",
+        f"/api/pets/{f.pet(rng)}/",
+        {"name": "Updated"},
+    ),
+    "medical-condition-list": lambda f, rng: (
+        "GET",
+        f"/api/pets/{f.pet(rng)}/medical-conditions/",
+        None,
+    ),
+    "medical-condition-create": create_condition,
+    "medical-condition-destroy": destroy_condition,
+    "estimate": lambda f, rng: ("POST", f"/api/pets/{f.pet(rng)}/estimate/", None),
+    "estimate-batch": lambda f, rng: (
+        "POST",
+        "/api/estimates/batch",
+        {"ids": [f.pet(rng) for _ in range(100)]},
+    ),
+    "estimate-cache-stats": lambda f, rng: ("GET", "/api/estimates/cache", None),
+    "portfolio-stats": lambda f, rng: ("GET", "/api/stats/portfolio", None),
+    "portfolio-stats-exact": lambda f, rng: (
+        "GET",
+        "/api/stats/portfolio?exact=1",
+        None,
+    ),
+    "async-pet-retrieve": lambda f, rng: (
+        "GET",
+        f"/api/async/pets/{f.pet(rng)}/",
+        None,
+    ),
+    "async-medical-condition-list": lambda f, rng: (
+        "GET",
+        f"/api/async/pets/{f.pet(rng)}/medical-conditions/",
+        None,
+    ),
+    "async-estimate": lambda f, rng: (
+        "POST",
+        f"/api/async/pets/{f.pet(rng)}/estimate/",
+        None,
+    ),
+}
+
+
+def uncovered(fixtures):
+    """URL names of core.urls that no benchmark requests."""
+    from django.urls import resolve
+    from core.urls import urlpatterns
+
+    covered = set()
+    rng = random.Random(0)
+    for make_request in ENDPOINTS.values():
+        request = make_request(fixtures, rng)
+        if request is not None:
+            covered.add(resolve(request[1].split("?")[0]).url_name)
+    return sorted({pattern.name for pattern in urlpatterns} - covered)
+
+
+def run_in_process(make_request, fixtures, duration):
+    from django.test import Client
+
+    client = Client()
+    rng = random.Random(0)
+    samples = []
+    errors = 0
+    start = time.perf_counter()
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        request = make_request(fixtures, rng)
+        if request is None:
+            break
+        method, path, body = request
+        data = "" if body is None else json.dumps(body)
+        begin = time.perf_counter()
+        response = client.generic(method, path, data, "application/json")
+        if response.streaming:
+            for _ in response.streaming_content:
+                pass
+        samples.append(time.perf_counter() - begin)
+        errors += response.status_code >= 400
+    return percentiles(samples, time.perf_counter() - start, errors)
+
+
+def run_server(database, fixtures, args):
+    command = server_commands(args.port, args.workers)[args.server]
+    if command is None:
+        return None
+    server = subprocess.Popen(
+        command,
+        cwd=ROOT,
+        env=server_env(args.server, database),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for(args.port)
+        return {
+            name: load(
+                args.port,
+                lambda rng, make_request=make_request: make_request(fixtures, rng),
+                args.clients,
+                args.duration,
+            )
+            for name, make_request in selected(args)
+        }
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def selected(args):
+    return [
+        (name, make_request)
+        for name, make_request in ENDPOINTS.items()
+        if not args.only or name in args.only
+    ]
+
+
+def metadata(args):
+    import django
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "date": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "cpus": os.cpu_count(),
+        "config": vars(args),
+    }
+
+
+def compare(results, baseline, out=sys.stderr):
+    """Print the throughput change of each endpoint against a baseline run."""
+    for mode in ("in_process", "server"):
+        current, previous = results.get(mode) or {}, baseline.get(mode) or {}
+        for name in sorted(current.keys() & previous.keys()):
+            before, after = previous[name].get("rps"), current[name].get("rps")
+            if before and after:
+                out.write(
+                    f"{mode:<11}{name:<30}{before:>10.0f}{after:>10.0f} req/s "
+                    f"{(after / before - 1) * 100:+6.1f}%\n"
+                )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--owners", type=int, default=5_000)
+    parser.add_argument("--pets", type=int, default=20_000)
+    parser.add_argument("--conditions", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--duration", type=float, default=2.0, help="Seconds per endpoint and mode."
+    )
+    parser.add_argument("--only", nargs="+", choices=ENDPOINTS, metavar="ENDPOINT")
+    parser.add_argument("--no-server", action="store_true")
+    parser.add_argument("--server", choices=["wsgi", "asgi"], default="wsgi")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--output", help="Write the JSON results to a file.")
+    parser.add_argument("--compare", help="A previous JSON output to compare with.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = Path(directory) / "benchmark.sqlite3"
+        setup_django(database)
+        owner_ids, pet_ids = generate(
+            args.owners, args.pets, args.conditions, seed=args.seed
+        )
+        fixtures = Fixtures(owner_ids, pet_ids)
+
+        results = metadata(args)
+        results["uncovered"] = uncovered(fixtures)
+        results["in_process"] = {
+            name: run_in_process(make_request, fixtures, args.duration)
+            for name, make_request in selected(args)
+        }
+        if not args.no_server:
+            results["server"] = run_server(database, fixtures, args)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    else:
+        print(output)
+    if args.compare:
+        compare(results, json.loads(Path(args.compare).read_text()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Requests per second and latency percentiles of the estimate, pet retrieve and
+medical condition list endpoints, served by a WSGI server (sync DRF views)
+and by an ASGI server (async views), under concurrent clients.
+
+    python -m benchmarks.asgi_vs_wsgi [--clients N] [--duration S]
+
+The WSGI server is gunicorn when installed and Django's threaded runserver
+otherwise. The ASGI server is uvicorn and is skipped when not installed.
+"""
+
+import argparse
+import os
+import subprocess
+import tempfile
+from pathlib import Path
+
+from .server import ROOT, load, server_commands, server_env, wait_for
+from .utils import seed, setup_django
+
+# (method, sync path, async path) per endpoint, {pk} is a random pet id
+ENDPOINTS = {
+    "estimate": ("POST", "/api/pets/{pk}/estimate/", "/api/async/pets/{pk}/estimate/"),
+    "pet": ("GET", "/api/pets/{pk}/", "/api/async/pets/{pk}/"),
+    "medical-conditions": (
+        "GET",
+        "/api/pets/{pk}/medical-conditions/",
+        "/api/async/pets/{pk}/medical-conditions/",
+    ),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--owners", type=int, default=2_000)
+    parser.add_argument("--pets", type=int, default=10_000)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = Path(directory) / "benchmark.sqlite3"
+        setup_django(database)
+        seed(args.owners, args.pets)
+
+        from core.models import Pet
+
+        pet_ids = [str(pk) for pk in Pet.objects.values_list("id", flat=True)[:1000]]
+
+        for mode, command in server_commands(args.port, args.workers).items():
+            if command is None:
+                print(f"{mode}: skipped, server not installed")
+                continue
+            server = subprocess.Popen(
+                command,
+                cwd=ROOT,
+                env=server_env(mode, database),
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            try:
+                wait_for(args.port)
+                for name, (method, sync_path, async_path) in ENDPOINTS.items():
+                    path = async_path if mode == "asgi" else sync_path
+                    result = load(
+                        args.port,
+                        lambda rng: (method, path.format(pk=rng.choice(pet_ids)), None),
+                        args.clients,
+                        args.duration,
+                    )
+                    print(
+                        f"{mode} {name}: {result['rps']:,.0f} req/s, "
+                        f"p50 {result['p50_ms']:.1f} ms, p99 {result['p99_ms']:.1f} ms"
+                    )
+            finally:
+                server.terminate()
+                server.wait()
+
+
+if __name__ == "__main__":
+    main()
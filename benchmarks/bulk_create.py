@@ -0,0 +1,68 @@
+"""
+Per-row vs bulk creation of owners and pets through the API.
+
+    python -m benchmarks.bulk_create [--rows N]
+"""
+
+import argparse
+import json
+
+from .utils import setup_django, timer
+
+
+def post_rows(client, url, rows):
+    for row in rows:
+        response = client.post(url, json.dumps(row), content_type="application/json")
+        assert response.status_code == 201, response.content
+
+
+def post_bulk(client, url, rows):
+    response = client.post(url, json.dumps(rows), content_type="application/json")
+    assert response.status_code == 201, response.content
+    return response.json()
+
+
+def run(rows):
+    from django.test import Client
+
+    client = Client()
+    owners = [
+        {"first_name": f"First {i}", "last_name": "Last", "province": "ON"}
+        for i in range(rows)
+    ]
+
+    with timer() as per_row:
+        post_rows(client, "/api/owners/", owners)
+    with timer() as bulk:
+        created = post_bulk(client, "/api/owners/", owners)
+
+    pets = [
+        {"name": f"Pet {i}", "species": "DOG", "age": 3, "owner": owner["id"]}
+        for i, owner in enumerate(created)
+    ]
+    with timer() as pets_per_row:
+        post_rows(client, "/api/pets/", pets)
+    with timer() as pets_bulk:
+        post_bulk(client, "/api/pets/", pets)
+
+    return {
+        "owners": (rows / per_row["elapsed"], rows / bulk["elapsed"]),
+        "pets": (rows / pets_per_row["elapsed"], rows / pets_bulk["elapsed"]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5_000)
+    args = parser.parse_args()
+
+    setup_django()
+    for model, (per_row, bulk) in run(args.rows).items():
+        print(
+            f"{model}: per-row {per_row:,.0f} rows/s, bulk {bulk:,.0f} rows/s "
+            f"({bulk / per_row:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
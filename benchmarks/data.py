@@ -0,0 +1,124 @@
+"""
+Realistic benchmark data: owners spread across provinces like the Canadian
+population, mostly dogs and cats, more young pets than old ones, and medical
+conditions weighted towards the common ones.
+
+    python -m benchmarks.data --database bench.sqlite3 [--owners N] ...
+"""
+
+import argparse
+import random
+
+from .utils import setup_django, timer
+
+# Share of the population by province, 2021 census
+PROVINCE_WEIGHTS = {
+    "ON": 38.5,
+    "QC": 22.6,
+    "BC": 13.5,
+    "AB": 11.5,
+    "MB": 3.6,
+    "SK": 3.0,
+    "NS": 2.6,
+    "NB": 2.1,
+    "NL": 1.4,
+    "PE": 0.4,
+    "NT": 0.1,
+    "YT": 0.1,
+    "NU": 0.1,
+}
+SPECIES_WEIGHTS = {"DOG": 55, "CAT": 38, "BIRD": 5, "FISH": 2}
+CONDITION_WEIGHTS = {
+    "OTHER": 40,
+    "HEART_DISEASE": 25,
+    "DIABETES": 20,
+    "CANCER": 15,
+}
+MAX_AGE = 15
+# Each year of age is a bit less common than the previous one
+AGE_WEIGHTS = [0.85**age for age in range(MAX_AGE + 1)]
+
+FIRST_NAMES = ["Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Avery"]
+LAST_NAMES = ["Tremblay", "Smith", "Roy", "Brown", "Wilson", "Martin", "Lee", "Gagnon"]
+PET_NAMES = ["Buddy", "Luna", "Max", "Bella", "Charlie", "Coco", "Milo", "Daisy"]
+
+
+def choices(rng, weights, k):
+    return rng.choices(list(weights), weights=list(weights.values()), k=k)
+
+
+def generate(owners, pets, conditions, seed=0, batch_size=5000):
+    """
+    Insert ``owners`` owners, ``pets`` pets and ``conditions`` distinct
+    (pet, condition) rows, then bring the risk summaries and materialized
+    estimates up to date. Returns the owner and pet ids.
+    """
+    from core.estimates import refresh
+    from core.models import Owner, Pet, PetMedicalCondition
+    from core.risk import rebuild_summaries
+
+    if conditions > pets * len(CONDITION_WEIGHTS):
+        raise ValueError("More conditions than distinct (pet, condition) pairs.")
+
+    rng = random.Random(seed)
+    owner_objs = [
+        Owner(
+            first_name=rng.choice(FIRST_NAMES),
+            last_name=rng.choice(LAST_NAMES),
+            province=province,
+        )
+        for province in choices(rng, PROVINCE_WEIGHTS, owners)
+    ]
+    Owner.objects.bulk_create(owner_objs, batch_size=batch_size)
+
+    pet_objs = [
+        Pet(
+            name=rng.choice(PET_NAMES),
+            species=species,
+            age=age,
+            owner=rng.choice(owner_objs),
+        )
+        for species, age in zip(
+            choices(rng, SPECIES_WEIGHTS, pets),
+            rng.choices(range(MAX_AGE + 1), weights=AGE_WEIGHTS, k=pets),
+        )
+    ]
+    Pet.objects.bulk_create(pet_objs, batch_size=batch_size)
+
+    pairs = set()
+    while len(pairs) < conditions:
+        pairs.add((rng.randrange(pets), choices(rng, CONDITION_WEIGHTS, 1)[0]))
+    PetMedicalCondition.objects.bulk_create(
+        (
+            PetMedicalCondition(pet=pet_objs[pet], condition=condition)
+            for pet, condition in sorted(pairs)
+        ),
+        batch_size=batch_size,
+    )
+
+    # bulk_create skips the signals maintaining these
+    rebuild_summaries()
+    refresh(batch_size=batch_size)
+    return [owner.pk for owner in owner_objs], [pet.pk for pet in pet_objs]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database", required=True, help="SQLite file to seed.")
+    parser.add_argument("--owners", type=int, default=20_000)
+    parser.add_argument("--pets", type=int, default=50_000)
+    parser.add_argument("--conditions", type=int, default=30_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    setup_django(args.database)
+    with timer() as timing:
+        generate(args.owners, args.pets, args.conditions, seed=args.seed)
+    print(
+        f"Seeded {args.owners} owners, {args.pets} pets and {args.conditions} "
+        f"conditions in {timing['elapsed']:.1f}s."
+    )
+
+
+if __name__ == "__main__":
+    main()
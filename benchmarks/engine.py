@@ -0,0 +1,68 @@
+"""
+Micro-benchmark for the underwriting rules engine, without Django or the ORM.
+
+    python -m benchmarks.engine [--iterations N]
+"""
+
+import argparse
+import random
+import time
+
+from core.underwriting import compile_rules
+
+SPECIES = ["DOG", "CAT", "BIRD", "FISH"]
+PROVINCES = [
+    "AB",
+    "BC",
+    "MB",
+    "NB",
+    "NL",
+    "NS",
+    "ON",
+    "PE",
+    "QC",
+    "SK",
+    "YT",
+    "NT",
+    "NU",
+]
+CONDITIONS = ["CANCER", "DIABETES", "HEART_DISEASE", "OTHER"]
+
+
+def make_pets(count, seed=0):
+    rng = random.Random(seed)
+    return [
+        (
+            rng.choice(SPECIES),
+            rng.randint(0, 15),
+            rng.choice(PROVINCES),
+            rng.sample(CONDITIONS, rng.choice([0, 0, 0, 1, 1, 2])),
+        )
+        for _ in range(count)
+    ]
+
+
+def run(iterations, pets=10_000):
+    engine = compile_rules()
+    sample = make_pets(pets)
+    evaluate = engine.evaluate
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for species, age, province, conditions in sample:
+            evaluate(species, age, province, conditions)
+    elapsed = time.perf_counter() - start
+    return iterations * pets / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    rate = run(args.iterations)
+    print(f"{rate:,.0f} estimates/s")
+
+
+if __name__ == "__main__":
+    main()
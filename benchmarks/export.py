@@ -0,0 +1,51 @@
+"""
+Throughput and peak memory of the NDJSON export endpoints.
+
+    python -m benchmarks.export [--pets N]
+"""
+
+import argparse
+import tracemalloc
+
+from .utils import seed, setup_django, timer
+
+
+def export(url):
+    from django.test import Client
+
+    response = Client().get(url)
+    return sum(chunk.count(b"\n") for chunk in response.streaming_content)
+
+
+def run(url, expected_rows):
+    with timer() as timing:
+        rows = export(url)
+    assert rows == expected_rows, (rows, expected_rows)
+
+    # Memory is traced in a separate pass, tracing slows the export down a lot
+    tracemalloc.start()
+    export(url)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return rows / timing["elapsed"], peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--owners", type=int, default=20_000)
+    parser.add_argument("--pets", type=int, default=100_000)
+    args = parser.parse_args()
+
+    setup_django()
+    seed(args.owners, args.pets)
+
+    for url, rows in [
+        ("/api/owners/export", args.owners),
+        ("/api/pets/export", args.pets),
+    ]:
+        rate, peak = run(url, rows)
+        print(f"{url}: {rate:,.0f} rows/s, peak {peak / 2**20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Per-request overhead of the request metrics middleware.
+
+Times a minimal view issuing one query with and without the middleware, then
+the owner retrieve endpoint through the full stack both ways. The full stack
+takes milliseconds per request, so its difference is mostly noise and the
+first figure is the one to compare with the 50µs budget.
+
+    python -m benchmarks.metrics [--requests N]
+"""
+
+import argparse
+import statistics
+
+from .utils import seed, setup_django, timer
+
+
+def minimal_view(request):
+    from django.db import connection
+    from django.http import HttpResponse
+    from django.urls import ResolverMatch
+
+    request.resolver_match = ResolverMatch(minimal_view, (), {}, "benchmark")
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+    return HttpResponse()
+
+
+def per_request(call, request, requests):
+    with timer() as timing:
+        for _ in range(requests):
+            call(request)
+    return timing["elapsed"] / requests
+
+
+def full_stack(enabled, url, requests):
+    from django.test import Client, override_settings
+
+    with override_settings(REQUEST_METRICS=enabled):
+        client = Client()
+        client.get(url)
+        with timer() as timing:
+            for _ in range(requests):
+                client.get(url)
+    return timing["elapsed"] / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    seed(100, 100)
+
+    from django.test import RequestFactory, override_settings
+    from core.metrics import RequestMetricsMiddleware
+    from core.models import Owner
+
+    request = RequestFactory().get("/")
+    with override_settings(REQUEST_METRICS=True):
+        middleware = RequestMetricsMiddleware(minimal_view)
+    bare, wrapped = [], []
+    for _ in range(args.rounds):
+        bare.append(per_request(minimal_view, request, args.requests))
+        wrapped.append(per_request(middleware, request, args.requests))
+    overhead = statistics.median(wrapped) - statistics.median(bare)
+    print(f"Middleware overhead: {overhead * 1e6:.1f}µs per request")
+
+    url = f"/api/owners/{Owner.objects.first().id}/"
+    requests = args.requests // 10
+    without, with_ = [], []
+    for _ in range(args.rounds):
+        without.append(full_stack(False, url, requests))
+        with_.append(full_stack(True, url, requests))
+    # The fastest round of each, the least disturbed by the rest of the machine
+    without, with_ = min(without), min(with_)
+    print(
+        f"{url}: {without * 1e6:.0f}µs without, {with_ * 1e6:.0f}µs with metrics "
+        f"({(with_ - without) * 1e6:+.1f}µs)"
+    )
+
+
+if __name__ == "__main__":
+    main()
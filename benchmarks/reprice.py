@@ -0,0 +1,38 @@
+"""
+Pets repriced per second by ``manage.py reprice_portfolio``.
+
+    python -m benchmarks.reprice [--pets N] [--batch-size N]
+"""
+
+import argparse
+import tracemalloc
+
+from .utils import seed, setup_django, timer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--owners", type=int, default=50_000)
+    parser.add_argument("--pets", type=int, default=500_000)
+    parser.add_argument("--batch-size", type=int, default=100_000)
+    args = parser.parse_args()
+
+    setup_django()
+    seed(args.owners, args.pets)
+
+    from io import StringIO
+
+    from django.core.management import call_command
+
+    with timer() as timing:
+        call_command("reprice_portfolio", batch_size=args.batch_size, stdout=StringIO())
+    print(f"{args.pets / timing['elapsed']:,.0f} pets/s")
+
+    tracemalloc.start()
+    call_command("reprice_portfolio", batch_size=args.batch_size, stdout=StringIO())
+    _, peak = tracemalloc.get_traced_memory()
+    print(f"peak {peak / 2**20:.0f} MiB with batches of {args.batch_size:,}")
+
+
+if __name__ == "__main__":
+    main()
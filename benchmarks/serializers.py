@@ -0,0 +1,78 @@
+"""
+Serialization throughput of the pet list: the ModelSerializer over model
+instances against the ValuesSerializer fast path over value rows, both
+rendered to JSON, and through the paginated list endpoint.
+
+    python -m benchmarks.serializers [--pets N]
+"""
+
+import argparse
+
+from .utils import seed, setup_django, timer
+
+
+def model_serializer(queryset):
+    from core.serializers import PetSerializer
+    from rest_framework.renderers import JSONRenderer
+
+    return JSONRenderer().render(PetSerializer(queryset, many=True).data)
+
+
+def values_serializer(queryset):
+    from core.serializers import PetSerializer, ValuesSerializer
+    from rest_framework.renderers import JSONRenderer
+
+    values = ValuesSerializer.for_serializer(PetSerializer)
+    rows = queryset.values_list(*values.columns, named=True)
+    return JSONRenderer().render([values.to_representation(row) for row in rows])
+
+
+def list_pages(use_values, page_size=1000):
+    """Page through /api/pets/, returning the number of rows read."""
+    from unittest import mock
+
+    from django.test import Client
+    from core.views import ValuesListMixin
+
+    client = Client()
+    url = f"/api/pets/?page_size={page_size}"
+    rows = 0
+    with mock.patch.object(ValuesListMixin, "use_values", use_values):
+        while url:
+            data = client.get(url).json()
+            rows += len(data["results"])
+            url = data["next"]
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--owners", type=int, default=20_000)
+    parser.add_argument("--pets", type=int, default=100_000)
+    args = parser.parse_args()
+
+    setup_django()
+    seed(args.owners, args.pets)
+
+    from core.models import Pet
+
+    queryset = Pet.objects.order_by("created_at", "id")
+    results = {}
+    for name, serialize in [
+        ("ModelSerializer", model_serializer),
+        ("ValuesSerializer", values_serializer),
+    ]:
+        with timer() as timing:
+            results[name] = serialize(queryset.all())
+        print(f"{name}: {args.pets / timing['elapsed']:,.0f} rows/s")
+    assert len(set(results.values())) == 1, "The outputs differ"
+
+    for name, use_values in [("ModelSerializer", False), ("ValuesSerializer", True)]:
+        with timer() as timing:
+            rows = list_pages(use_values)
+        assert rows == args.pets, (rows, args.pets)
+        print(f"/api/pets/ {name}: {rows / timing['elapsed']:,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Start benchmark servers and drive them with concurrent keep-alive clients."""
+
+import http.client
+import importlib.util
+import json
+import os
+import random
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def server_commands(port, workers):
+    address = f"127.0.0.1:{port}"
+    if importlib.util.find_spec("gunicorn"):
+        wsgi = [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            "pawsitive_assurance.wsgi",
+            "--bind",
+            address,
+            "--workers",
+            str(workers),
+            "--threads",
+            "4",
+        ]
+    else:
+        wsgi = [sys.executable, "manage.py", "runserver", "--noreload", address]
+
+    asgi = None
+    if importlib.util.find_spec("uvicorn"):
+        asgi = [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "pawsitive_assurance.asgi:application",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--no-access-log",
+        ]
+    return {"wsgi": wsgi, "asgi": asgi}
+
+
+def server_env(mode, database):
+    """The environment of a benchmark server on the ``database`` file."""
+    env = {
+        **os.environ,
+        "DJANGO_SETTINGS_MODULE": "benchmarks.settings",
+        "BENCHMARK_DATABASE": str(database),
+    }
+    if mode == "asgi":
+        # Async views run their queries in threads that don't close their
+        # connections at the end of a request, persistent ones would pile up
+        env.setdefault("CONN_MAX_AGE", "0")
+    return env
+
+
+def wait_for(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            connection.request("GET", "/api/estimates/cache")
+            connection.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server on port {port} did not start")
+
+
+def connect(port):
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    connection.connect()
+    # Avoid Nagle/delayed ACK stalls dominating the measured latency
+    connection.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return connection
+
+
+def percentiles(samples, duration, errors=0):
+    """Throughput and latency percentiles (ms) of a list of latencies (s)."""
+    samples = sorted(samples)
+    if not samples:
+        return {"requests": 0, "errors": errors, "rps": 0.0}
+    last = len(samples) - 1
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "rps": len(samples) / duration,
+        "mean_ms": sum(samples) / len(samples) * 1000,
+        "p50_ms": samples[round(0.5 * last)] * 1000,
+        "p90_ms": samples[round(0.9 * last)] * 1000,
+        "p99_ms": samples[round(0.99 * last)] * 1000,
+    }
+
+
+def load(port, make_request, clients, duration):
+    """
+    Run ``clients`` keep-alive clients for ``duration`` seconds. Each request
+    is ``make_request(rng)``, a (method, path, JSON body or None) tuple, or
+    None once the client should stop.
+    """
+    latencies = [[] for _ in range(clients)]
+    errors = [0] * clients
+    deadline = time.monotonic() + duration
+
+    def client(index, samples):
+        rng = random.Random(index)
+        connection = connect(port)
+        while time.monotonic() < deadline:
+            request = make_request(rng)
+            if request is None:
+                break
+            method, path, body = request
+            headers = {}
+            if body is not None:
+                body = json.dumps(body)
+                headers["Content-Type"] = "application/json"
+            start = time.perf_counter()
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            samples.append(time.perf_counter() - start)
+            if response.status >= 400:
+                errors[index] += 1
+            if response.getheader("Connection", "").lower() == "close":
+                connection.close()
+                connection = connect(port)
+        connection.close()
+
+    threads = [
+        threading.Thread(target=client, args=(index, samples))
+        for index, samples in enumerate(latencies)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    return percentiles(
+        [sample for client_samples in latencies for sample in client_samples],
+        elapsed,
+        sum(errors),
+    )
@@ -0,0 +1,17 @@
+"""Settings for benchmarks run against real servers, on a dedicated database."""
+
+import os
+
+from pawsitive_assurance.settings import *  # noqa: F401,F403
+
+DEBUG = False
+ALLOWED_HOSTS = ["127.0.0.1", "localhost", "testserver"]
+
+# CONN_MAX_AGE is inherited, benchmarks.server sets it to 0 for the ASGI server
+DATABASES = {
+    **DATABASES,  # noqa: F405
+    "default": {
+        **DATABASES["default"],  # noqa: F405
+        "NAME": os.environ.get("BENCHMARK_DATABASE", "benchmark.sqlite3"),
+    },
+}
@@ -0,0 +1,124 @@
+"""
+Concurrent mixed read/write throughput on SQLite, with SQLite's defaults and
+a new connection per request, then with the WAL/pragma tuning and persistent
+connections from settings.py.
+
+Writers add medical conditions while readers request estimates, against a
+WSGI server started on a copy of the same seeded database for each mode.
+
+    python -m benchmarks.sqlite [--readers N] [--writers N] [--duration S]
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from pathlib import Path
+
+from .data import CONDITION_WEIGHTS, generate
+from .server import ROOT, load, server_commands, wait_for
+from .utils import setup_django
+
+MODES = {
+    "default": {"SQLITE_TUNING": "0", "CONN_MAX_AGE": "0"},
+    "tuned": {"SQLITE_TUNING": "1", "CONN_MAX_AGE": "60"},
+}
+
+
+def mixed_load(port, pet_ids, writable, args):
+    """Run the readers and writers at the same time, return both results."""
+    conditions = list(CONDITION_WEIGHTS)
+    writable = list(writable)
+
+    def read(rng):
+        return "POST", f"/api/pets/{rng.choice(pet_ids)}/estimate/", None
+
+    def write(rng):
+        try:
+            pet_id = writable.pop()
+        except IndexError:
+            return None
+        body = {"condition": rng.choice(conditions)}
+        return "POST", f"/api/pets/{pet_id}/medical-conditions/", body
+
+    results = {}
+
+    def run(name, make_request, clients):
+        results[name] = load(port, make_request, clients, args.duration)
+
+    threads = [
+        threading.Thread(target=run, args=("reads", read, args.readers)),
+        threading.Thread(target=run, args=("writes", write, args.writers)),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--owners", type=int, default=5_000)
+    parser.add_argument("--pets", type=int, default=20_000)
+    parser.add_argument("--conditions", type=int, default=5_000)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Seed without the tuning so the template is in rollback journal mode
+        os.environ["SQLITE_TUNING"] = "0"
+        template = Path(directory) / "template.sqlite3"
+        setup_django(template)
+        _, pet_ids = generate(args.owners, args.pets, args.conditions)
+
+        from core.models import Pet
+
+        pet_ids = [str(pk) for pk in pet_ids]
+        writable = [
+            str(pk)
+            for pk in Pet.objects.filter(petmedicalcondition__isnull=True).values_list(
+                "id", flat=True
+            )
+        ]
+
+        for mode, environ in MODES.items():
+            database = Path(directory) / f"{mode}.sqlite3"
+            shutil.copy(template, database)
+            env = {
+                **os.environ,
+                **environ,
+                "DJANGO_SETTINGS_MODULE": "benchmarks.settings",
+                "BENCHMARK_DATABASE": str(database),
+            }
+            server = subprocess.Popen(
+                server_commands(args.port, args.workers)["wsgi"],
+                cwd=ROOT,
+                env=env,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            try:
+                wait_for(args.port)
+                results = mixed_load(args.port, pet_ids, writable, args)
+            finally:
+                server.terminate()
+                server.wait()
+
+            for name, result in results.items():
+                print(
+                    f"{mode} {name}: {result['rps']:,.0f} req/s, "
+                    f"p50 {result.get('p50_ms', 0):.1f} ms, "
+                    f"p99 {result.get('p99_ms', 0):.1f} ms, "
+                    f"{result['errors']} errors"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Helpers shared by the benchmarks that need Django and a database."""
+
+import os
+import random
+import time
+from contextlib import contextmanager
+
+
+def setup_django(database=None):
+    """
+    Configure Django and create a throwaway test database, or migrate the
+    sqlite file ``database`` that benchmark servers will be started on.
+    """
+    if database is not None:
+        os.environ["DJANGO_SETTINGS_MODULE"] = "benchmarks.settings"
+        os.environ["BENCHMARK_DATABASE"] = str(database)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "pawsitive_assurance.settings")
+
+    import django
+
+    django.setup()
+
+    from django.core.management import call_command
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    if database is not None:
+        call_command("migrate", verbosity=0)
+        return
+
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0)
+
+
+def seed(owners, pets, seed=0, batch_size=5000):
+    """Bulk insert ``owners`` owners and ``pets`` pets spread across them."""
+    from core.models import Owner, Pet, Province, Species
+
+    rng = random.Random(seed)
+    owner_objs = [
+        Owner(first_name=f"First {i}", last_name=f"Last {i}", province=province)
+        for i, province in enumerate(rng.choices(Province.values, k=owners))
+    ]
+    Owner.objects.bulk_create(owner_objs, batch_size=batch_size)
+    Pet.objects.bulk_create(
+        (
+            Pet(
+                name=f"Pet {i}",
+                species=rng.choice(Species.values),
+                age=rng.randint(0, 15),
+                owner=rng.choice(owner_objs),
+            )
+            for i in range(pets)
+        ),
+        batch_size=batch_size,
+    )
+
+
+@contextmanager
+def timer():
+    """Yield a dict whose ``elapsed`` is set to the wall time on exit."""
+    result = {}
+    start = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result["elapsed"] = time.perf_counter() - start
@@ -0,0 +1,110 @@
+"""
+Async variants of the hottest read endpoints for ASGI deployments.
+
+DRF views are synchronous, so under ASGI every request hops to a worker
+thread. These views use Django's async ORM and run on the event loop, and
+return the same JSON shapes as their DRF counterparts in ``core.views``.
+"""
+
+from django.db.models import F
+from django.http import HttpResponse, HttpResponseNotModified, JsonResponse
+from django.views import View
+from .cache import estimate_cache
+from .conditional import (
+    acached_estimate,
+    acurrent_estimate_etag,
+    estimate_etag,
+    none_match,
+)
+from .estimates import current_estimate
+from .models import Pet, PetMedicalCondition
+from .rates import active_rates
+from .serializers import PetMedicalConditionSerializer, PetSerializer
+
+
+class AsyncAPIView(View):
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        # Like DRF views these endpoints don't use session authentication
+        view.csrf_exempt = True
+        return view
+
+    @staticmethod
+    def not_found():
+        # The views in core.views answer a missing pet with an empty 404
+        return HttpResponse(status=404)
+
+    @staticmethod
+    def not_modified(etag):
+        response = HttpResponseNotModified()
+        response["ETag"] = etag
+        return response
+
+
+class AsyncPetRetrieveView(AsyncAPIView):
+    fields = PetSerializer.Meta.fields
+
+    @staticmethod
+    def not_found():
+        # Like get_object_or_404 in the DRF view
+        return JsonResponse({"detail": "No Pet matches the given query."}, status=404)
+
+    async def get(self, request, pk):
+        pet = await Pet.objects.filter(id=pk).values(*self.fields).afirst()
+        if pet is None:
+            return self.not_found()
+        return JsonResponse(pet)
+
+
+class AsyncPetMedicalConditionListView(AsyncAPIView):
+    fields = PetMedicalConditionSerializer.Meta.fields
+
+    # The paginated response of the DRF view. (pet, condition) is unique, so a
+    # pet's conditions fit in the default page and there is never a cursor,
+    # ?page_size isn't supported
+    async def get(self, request, pk):
+        if not await Pet.objects.filter(id=pk).aexists():
+            return self.not_found()
+        medical_conditions = PetMedicalCondition.objects.filter(pet_id=pk).order_by(
+            "created_at", "id"
+        )
+        rows = [row async for row in medical_conditions.values(*self.fields)]
+        return JsonResponse({"next": None, "previous": None, "results": rows})
+
+
+class AsyncPetEstimateView(AsyncAPIView):
+    async def post(self, request, pk):
+        engine = await active_rates.aengine()
+        cached = await acached_estimate(pk, engine.version)
+        if cached is None and "If-None-Match" in request.headers:
+            etag = await acurrent_estimate_etag(pk, engine.version)
+            if etag is not None and none_match(request, etag):
+                return self.not_modified(etag)
+
+        if cached is None:
+            pet = (
+                await Pet.objects.with_estimate_inputs()
+                .annotate(owner_revision=F("owner__revision"))
+                .select_related("materialized_estimate")
+                .filter(id=pk)
+                .afirst()
+            )
+            if pet is None:
+                return self.not_found()
+            estimate = current_estimate(pet, engine) or pet.estimate(engine)
+            data = estimate.as_dict()
+            etag = estimate_etag(
+                pet.revision,
+                pet.conditions_revision,
+                pet.owner_revision,
+                engine.version,
+            )
+            estimate_cache.add(pk, engine.version, (data, etag))
+        else:
+            data, etag = cached
+            if none_match(request, etag):
+                return self.not_modified(etag)
+        response = JsonResponse(data)
+        response["ETag"] = etag
+        return response
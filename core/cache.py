@@ -0,0 +1,109 @@
+"""
+Estimate result cache.
+
+Estimates only depend on the pet's species and age, the owner's province and
+the pet's medical conditions, so they are cached per pet and invalidated by
+the signal handlers in ``core.signals`` whenever one of those rows changes.
+Keys include the rate version, entries from a previous version of the rates
+are never read again and age out of the cache. The views cache the response
+data with its ETag.
+
+The invalidations only reach the cache of the process whose signal fired when
+the backend is a local-memory cache. Its entries are then only served while
+their ETag still matches the pet's revisions, see
+``core.conditional.cached_estimate``, which costs one primary key lookup.
+"""
+
+import threading
+
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+# Counters of the entries culled from each CountingLocMemCache, keyed by name
+# like the cache storage itself
+_evictions = {}
+
+
+class CountingLocMemCache(LocMemCache):
+    """Bounded local-memory cache that counts the entries it evicts."""
+
+    def __init__(self, name, params):
+        super().__init__(name, params)
+        self._name = name
+        _evictions.setdefault(name, 0)
+
+    # Called with the cache lock held when the cache reaches MAX_ENTRIES
+    def _cull(self):
+        before = len(self._cache)
+        super()._cull()
+        _evictions[self._name] += before - len(self._cache)
+
+    @property
+    def evictions(self):
+        return _evictions[self._name]
+
+    def __len__(self):
+        return len(self._cache)
+
+
+class EstimateCache:
+    # Marker stored in place of an invalidated estimate. While it is present
+    # a request that read the database before the invalidation cannot put its
+    # stale result back, because entries are only written with cache.add().
+    INVALIDATED = "invalidated"
+    # Seconds the marker is kept, longer than any request computing an estimate
+    invalidation_grace = 10
+
+    def __init__(self, alias="estimates"):
+        self.alias = alias
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    @staticmethod
+    def key(pet_id, rate_version):
+        return f"estimate:{rate_version}:{pet_id}"
+
+    @property
+    def local(self):
+        """Whether each process has its own entries, e.g. gunicorn workers."""
+        return isinstance(self.cache, LocMemCache)
+
+    def get(self, pet_id, rate_version):
+        """Return the cached estimate for a pet, or None on a miss."""
+        value = self.cache.get(self.key(pet_id, rate_version))
+        hit = value is not None and value != self.INVALIDATED
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return value if hit else None
+
+    def add(self, pet_id, rate_version, estimate):
+        """Cache an estimate unless the pet was invalidated in the meantime."""
+        self.cache.add(self.key(pet_id, rate_version), estimate)
+
+    def invalidate(self, pet_ids, rate_version):
+        self.cache.set_many(
+            {self.key(pet_id, rate_version): self.INVALIDATED for pet_id in pet_ids},
+            timeout=self.invalidation_grace,
+        )
+
+    def stats(self):
+        cache = self.cache
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": getattr(cache, "evictions", None),
+            "entries": len(cache) if hasattr(cache, "__len__") else None,
+        }
+
+
+estimate_cache = EstimateCache()
@@ -0,0 +1,75 @@
+"""
+HTTP conditional requests.
+
+Owners and pets have a ``revision`` bumped by every save and pets a
+``conditions_revision`` bumped whenever their medical conditions change, so
+strong ETags come from a couple of integer columns. ``If-None-Match`` is
+checked against those columns alone, the object is only loaded and
+serialized when it changed.
+
+An estimate depends on the pet, its conditions, its owner's province and the
+rates, its ETag covers the pet and owner revisions and the rate version.
+"""
+
+from django.utils.http import parse_etags, quote_etag
+from .cache import estimate_cache
+from .models import Pet
+
+
+def make_etag(*parts):
+    return quote_etag(".".join(str(part) for part in parts))
+
+
+def none_match(request, etag):
+    """Whether the request's If-None-Match lists ``etag``."""
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    # If-None-Match uses the weak comparison
+    etags = [tag.removeprefix("W/") for tag in parse_etags(header)]
+    return "*" in etags or etag in etags
+
+
+def estimate_etag(pet_revision, conditions_revision, owner_revision, rate_version):
+    return make_etag(
+        pet_revision, conditions_revision, owner_revision, rate_version or 0
+    )
+
+
+def estimate_revisions(pet_id):
+    """Query of the revisions in a pet's estimate ETag."""
+    return Pet.objects.filter(pk=pet_id).values_list(
+        "revision", "conditions_revision", "owner__revision"
+    )
+
+
+def current_estimate_etag(pet_id, rate_version):
+    """The estimate ETag of a pet from its revisions, None if it doesn't exist."""
+    revisions = estimate_revisions(pet_id).first()
+    return None if revisions is None else estimate_etag(*revisions, rate_version)
+
+
+async def acurrent_estimate_etag(pet_id, rate_version):
+    revisions = await estimate_revisions(pet_id).afirst()
+    return None if revisions is None else estimate_etag(*revisions, rate_version)
+
+
+def cached_estimate(pet_id, rate_version):
+    """
+    The cached (data, ETag) of a pet's estimate, None on a miss. The entries of
+    a local cache miss the invalidations of other processes, they are only
+    returned while their ETag matches the pet's revisions.
+    """
+    cached = estimate_cache.get(pet_id, rate_version)
+    if cached is not None and estimate_cache.local:
+        if current_estimate_etag(pet_id, rate_version) != cached[1]:
+            return None
+    return cached
+
+
+async def acached_estimate(pet_id, rate_version):
+    cached = estimate_cache.get(pet_id, rate_version)
+    if cached is not None and estimate_cache.local:
+        if await acurrent_estimate_etag(pet_id, rate_version) != cached[1]:
+            return None
+    return cached
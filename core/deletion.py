@@ -0,0 +1,111 @@
+"""
+Set-based deletion of owners, pets and medical conditions.
+
+Deleting an owner through the ORM collects all its pets, their conditions and
+materialized estimates in memory, then fires the delete signals of each row,
+which adjusts the risk summary of a pet being deleted once per condition.
+These functions issue one DELETE per table in dependency order instead, and
+perform what the ``core.signals`` delete handlers are there for themselves:
+the pets' cached estimates are invalidated, their estimates are uncounted from
+the portfolio counters and the risk summary of a pet that remains is adjusted.
+
+The API uses them when ``fast_deletes`` finds that nothing else depends on
+the row by row deletes: no other receiver of the delete signals and no other
+relation to cascade. They rely on ``QuerySet._raw_delete``, which is private
+to Django and was checked against the pinned Django 4.2, and on
+``Signal._live_receivers`` to tell the receivers apart. Check them again
+before upgrading Django.
+"""
+
+from itertools import islice
+
+from django.db import router, transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, pre_delete
+from .models import Owner, Pet, PetEstimate, PetMedicalCondition
+from .portfolio import subtract
+from .risk import apply_conditions
+from .signals import (
+    estimate_deleted,
+    invalidate_cached_estimates,
+    invalidate_estimates,
+    medical_condition_deleted,
+    pet_changed,
+)
+
+# Pet ids read per query to invalidate their cached estimates
+CHUNK_SIZE = 2000
+
+# The delete receivers of core.signals, which these functions do the work of
+HANDLED_RECEIVERS = {pet_changed, estimate_deleted, medical_condition_deleted}
+
+# The models whose rows the deletes of each model cascade to
+CASCADES = {
+    Owner: {Pet},
+    Pet: {PetEstimate, PetMedicalCondition},
+    PetEstimate: set(),
+    PetMedicalCondition: set(),
+}
+
+
+def fast_deletes(model):
+    """
+    Whether deleting ``model`` rows with these functions does everything the
+    ORM would, including for the rows they cascade to.
+    """
+    if not hasattr(QuerySet, "_raw_delete"):
+        return False
+    models = [model]
+    while models:
+        model = models.pop()
+        related = {rel.related_model for rel in model._meta.related_objects}
+        if related != CASCADES.get(model):
+            return False
+        for signal in (pre_delete, post_delete):
+            if not HANDLED_RECEIVERS.issuperset(signal._live_receivers(model)):
+                return False
+        models.extend(related)
+    return True
+
+
+def delete_pets(pets):
+    """Delete the pets of a queryset with their dependent rows, return how many."""
+    using = router.db_for_write(Pet)
+    pets = pets.using(using)
+    with transaction.atomic(using=using):
+        pet_ids = pets.values_list("pk", flat=True).order_by().iterator(CHUNK_SIZE)
+        while chunk := list(islice(pet_ids, CHUNK_SIZE)):
+            invalidate_cached_estimates(chunk)
+
+        pet_ids = pets.values("pk")
+        subtract(PetEstimate.objects.using(using).filter(pet__in=pet_ids))
+        for model in (PetEstimate, PetMedicalCondition):
+            model.objects.using(using).filter(pet__in=pet_ids)._raw_delete(using)
+        return pets._raw_delete(using)
+
+
+def delete_owners(owners):
+    """Delete the owners of a queryset and their pets, return how many."""
+    using = router.db_for_write(Owner)
+    owners = owners.using(using)
+    with transaction.atomic(using=using):
+        delete_pets(Pet.objects.filter(owner__in=owners.values("pk")))
+        return owners._raw_delete(using)
+
+
+def delete_medical_conditions(pet, conditions):
+    """Delete the pet's rows among ``conditions``, return how many."""
+    using = router.db_for_write(PetMedicalCondition)
+    with transaction.atomic(using=using):
+        # A pet has at most one row per MedicalCondition
+        rows = list(
+            conditions.using(using).filter(pet=pet).values_list("pk", "condition")
+        )
+        if not rows:
+            return 0
+        PetMedicalCondition.objects.using(using).filter(
+            pk__in=[pk for pk, _ in rows]
+        )._raw_delete(using)
+        apply_conditions(pet.pk, [condition for _, condition in rows], added=False)
+        invalidate_estimates([pet.pk])
+    return len(rows)
@@ -0,0 +1,174 @@
+"""
+Maintenance of the materialized estimates (``PetEstimate``).
+
+The signal handlers in ``core.signals`` create a pet's row, dirty, in the
+transaction that creates the pet and mark it dirty again in the same
+transaction as any change to its inputs. ``refresh`` recomputes the dirty rows
+and the rows computed with another rate version. Each batch moves the rows' contributions to the portfolio counters
+in the same transaction, see ``core.portfolio``. ``estimate_mismatches``
+checks the current rows against a live computation.
+"""
+
+from itertools import islice
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from .models import Pet, PetEstimate
+from .portfolio import LEDGER_FIELDS, CounterDeltas
+from .rates import active_rates
+
+REFRESHED_FIELDS = [
+    "province",
+    "species",
+    "eligible",
+    "reason",
+    "cost_of_insurance",
+    "rate_version",
+    "refreshed_at",
+]
+
+
+def add_dirty(pet_ids):
+    """Create the rows of new pets, dirty until the refresher computes them."""
+    PetEstimate.objects.bulk_create(
+        [PetEstimate(pet_id=pet_id) for pet_id in pet_ids], ignore_conflicts=True
+    )
+
+
+def mark_dirty(pet_ids):
+    """Flag the materialized estimates of pets for the refresher."""
+    PetEstimate.objects.filter(pet_id__in=pet_ids, dirty=False).update(dirty=True)
+
+
+def _version_filter(version):
+    """Match rows computed with a rate version other than ``version``."""
+    if version is None:
+        return Q(rate_version__isnull=False)
+    # Ranges rather than a negation so the rate_version index is used
+    return (
+        Q(rate_version__lt=version)
+        | Q(rate_version__gt=version)
+        | Q(rate_version__isnull=True)
+    )
+
+
+def current_estimate(pet, engine):
+    """
+    Return the materialized estimate of a pet loaded with
+    ``select_related("materialized_estimate")``, or None if it isn't current.
+    """
+    try:
+        materialized = pet.materialized_estimate
+    except PetEstimate.DoesNotExist:
+        return None
+    if materialized.dirty or materialized.rate_version != engine.version:
+        return None
+    return materialized.as_estimate()
+
+
+def add_missing(batch_size=1000):
+    """
+    Create the rows of the pets that have none, return how many. Only pets
+    inserted without the signals, with raw SQL or ``Pet.objects.bulk_create``,
+    lack one. This scans every pet, so ``refresh`` doesn't call it.
+    """
+    missing = (
+        Pet.objects.filter(materialized_estimate__isnull=True)
+        .values_list("pk", flat=True)
+        .iterator(chunk_size=batch_size)
+    )
+    added = 0
+    # A batch at a time, the pets without a row can be the whole table
+    while pet_ids := list(islice(missing, batch_size)):
+        add_dirty(pet_ids)
+        added += len(pet_ids)
+    return added
+
+
+def refresh(batch_size=1000, engine=None, progress=None):
+    """
+    Recompute the estimates that are not current, return how many. Calls
+    ``progress`` with the running count after each batch.
+    """
+    engine = engine or active_rates.engine()
+
+    PetEstimate.objects.filter(_version_filter(engine.version), dirty=False).update(
+        dirty=True
+    )
+
+    refreshed = 0
+    while True:
+        pet_ids = list(
+            PetEstimate.objects.filter(dirty=True).values_list("pet_id", flat=True)[
+                :batch_size
+            ]
+        )
+        if not pet_ids:
+            return refreshed
+
+        with transaction.atomic():
+            refreshed += _refresh_batch(pet_ids, engine)
+        if progress is not None:
+            progress(refreshed)
+
+
+def _refresh_batch(pet_ids, engine):
+    # Claim the rows before reading the pets, a change committed after this
+    # point marks its row dirty again and it is picked up next time
+    PetEstimate.objects.filter(pk__in=pet_ids, dirty=True).update(dirty=False)
+    deltas = CounterDeltas()
+    previous = (
+        PetEstimate.objects.select_for_update()
+        .filter(pk__in=pet_ids)
+        .values_list(*LEDGER_FIELDS)
+    )
+    for province, species, eligible, cost in previous:
+        deltas.add(province, species, eligible, cost, pets=-1)
+
+    now = timezone.now()
+    rows = []
+    for pet in Pet.objects.with_estimate_inputs().filter(pk__in=pet_ids):
+        estimate = pet.estimate(engine)
+        rows.append(
+            PetEstimate(
+                pet_id=pet.pk,
+                province=pet.owner_province,
+                species=pet.species,
+                eligible=estimate.eligible,
+                reason=estimate.reason,
+                cost_of_insurance=estimate.cost_of_insurance,
+                rate_version=engine.version,
+                refreshed_at=now,
+            )
+        )
+        deltas.add(
+            pet.owner_province,
+            pet.species,
+            estimate.eligible,
+            estimate.cost_of_insurance,
+        )
+    PetEstimate.objects.bulk_update(rows, REFRESHED_FIELDS)
+    deltas.apply()
+    return len(rows)
+
+
+def estimate_mismatches(engine=None, chunk_size=2000):
+    """
+    Yield (pet id, materialized, live) for the current materialized estimates
+    that disagree with the rules evaluated now.
+    """
+    engine = engine or active_rates.engine()
+    pets = (
+        Pet.objects.with_estimate_inputs()
+        .select_related("materialized_estimate")
+        .filter(
+            materialized_estimate__dirty=False,
+            materialized_estimate__rate_version=engine.version,
+        )
+    )
+    for pet in pets.iterator(chunk_size=chunk_size):
+        materialized = pet.materialized_estimate.as_estimate()
+        live = pet.estimate(engine)
+        if materialized != live:
+            yield pet.pk, materialized, live
@@ -0,0 +1,118 @@
+"""
+``Idempotency-Key`` support for POST endpoints that partners retry.
+
+The first request with a key runs and its response is kept in the
+``idempotency`` cache until the cache's TIMEOUT expires. Retries with the same
+key and body get that response again, with ``Idempotent-Replayed: true``,
+without running the view. Reusing a key with a different body is a 422, and a
+retry while the first request is still running a 409. Only successful
+responses are kept, a request that failed can be retried with its key.
+
+Entries are compact: a hash of the path and key, and the status, data and a
+body hash. With several worker processes the cache must be shared, the
+database cache by default or Redis or Memcached. A LocMemCache only dedupes
+per process.
+"""
+
+import functools
+import hashlib
+
+from django.core.cache import caches
+from rest_framework import status
+from rest_framework.response import Response
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+
+def _digest(*parts):
+    return hashlib.blake2b(b"\0".join(parts), digest_size=16).hexdigest()
+
+
+class IdempotencyStore:
+    # Marker stored while the first request with a key runs
+    IN_PROGRESS = "in-progress"
+    # Seconds the marker is kept, longer than any request takes
+    in_progress_timeout = 60
+
+    def __init__(self, alias="idempotency"):
+        self.alias = alias
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    @staticmethod
+    def key(path, idempotency_key):
+        return f"idempotency:{_digest(path.encode(), idempotency_key.encode())}"
+
+    def run(self, request, idempotency_key, get_response):
+        """Return the stored response for the key, or store ``get_response()``."""
+        key = self.key(request.path, idempotency_key)
+        fingerprint = _digest(request.body)
+        if not self.start(key):
+            stored = self.cache.get(key)
+            if stored not in (None, self.IN_PROGRESS):
+                return self.replay(stored, fingerprint)
+            # Unless the entry was deleted or expired since, and can be taken
+            if stored == self.IN_PROGRESS or not self.start(key):
+                return error(
+                    status.HTTP_409_CONFLICT,
+                    "A request with this Idempotency-Key is in progress.",
+                )
+
+        try:
+            response = get_response()
+        except BaseException:
+            self.cache.delete(key)
+            raise
+        if status.is_success(response.status_code):
+            self.cache.set(key, (fingerprint, response.status_code, response.data))
+        else:
+            self.cache.delete(key)
+        return response
+
+    def start(self, key):
+        """Claim a key with the in-progress marker, False if it has an entry."""
+        return self.cache.add(key, self.IN_PROGRESS, self.in_progress_timeout)
+
+    @staticmethod
+    def replay(stored, fingerprint):
+        stored_fingerprint, status_code, data = stored
+        if stored_fingerprint != fingerprint:
+            return error(
+                status.HTTP_422_UNPROCESSABLE_ENTITY,
+                "This Idempotency-Key was used with a different request body.",
+            )
+        return Response(
+            data, status=status_code, headers={"Idempotent-Replayed": "true"}
+        )
+
+
+def error(status_code, detail):
+    return Response({"detail": detail}, status=status_code)
+
+
+idempotency_store = IdempotencyStore()
+
+
+def idempotent(method):
+    """Decorate a view's ``post`` to honour the Idempotency-Key header."""
+
+    @functools.wraps(method)
+    def post(view, request, *args, **kwargs):
+        idempotency_key = request.headers.get(HEADER)
+        if idempotency_key is None:
+            return method(view, request, *args, **kwargs)
+        if not idempotency_key or len(idempotency_key) > MAX_KEY_LENGTH:
+            return error(
+                status.HTTP_400_BAD_REQUEST,
+                f"Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters.",
+            )
+        return idempotency_store.run(
+            request,
+            idempotency_key,
+            lambda: method(view, request, *args, **kwargs),
+        )
+
+    return post
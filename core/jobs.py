@@ -0,0 +1,262 @@
+"""
+Background jobs for the operations too long for a request: batch estimates,
+repricing, exports and refreshing the materialized estimates.
+
+``POST /api/jobs`` queues a ``Job`` row and ``manage.py run_workers`` runs the
+queue in a pool of worker processes, without a broker. A worker claims the
+oldest queued job with a compare-and-set UPDATE from queued to running, only
+one worker's UPDATE can match the row, which holds on every database including
+SQLite where there are no row locks to take.
+
+Handlers report their progress, which also refreshes the job's heartbeat. A
+running job whose heartbeat is older than ``settings.JOB_STALE_SECONDS`` was
+left by a worker that died and is queued again, or failed after
+``MAX_ATTEMPTS`` runs. The pool's supervisor checks for them, and restarts
+workers that exit. Batch estimates and exports write their output to
+``settings.JOB_OUTPUT_DIR``, served by ``GET /api/jobs/<id>/output``.
+"""
+
+import logging
+import os
+import socket
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections
+from django.db.models import F
+from django.utils import timezone
+from .estimates import refresh
+from .models import Job, JobKind, JobStatus, Pet
+from .rates import active_rates
+from .serializers import JOB_PARAMS_SERIALIZERS
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 3
+# Seconds between the checks for stale jobs
+REQUEUE_INTERVAL = 60
+# Longest wait before retrying after a database error
+MAX_BACKOFF = 30
+# Pets repriced per batch by the reprice job
+REPRICE_BATCH_SIZE = 100_000
+CONTENT_TYPES = {"json": "application/json", "ndjson": "application/x-ndjson"}
+
+
+def stale_seconds():
+    return getattr(settings, "JOB_STALE_SECONDS", 600)
+
+
+def output_dir():
+    return getattr(settings, "JOB_OUTPUT_DIR", settings.BASE_DIR / "job_output")
+
+
+def output_path(job):
+    """Path of a job's output file, None if it has none."""
+    name = (job.result or {}).get("output")
+    return None if name is None else os.path.join(output_dir(), name)
+
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"[-64:]
+
+
+def claim(worker):
+    """Claim the oldest queued job for ``worker``, None if there is none."""
+    queued = Job.objects.filter(status=JobStatus.QUEUED)
+    while True:
+        pk = queued.order_by("created_at").values_list("pk", flat=True).first()
+        if pk is None:
+            return None
+        now = timezone.now()
+        claimed = queued.filter(pk=pk).update(
+            status=JobStatus.RUNNING,
+            worker=worker,
+            started_at=now,
+            heartbeat_at=now,
+            attempts=F("attempts") + 1,
+        )
+        if claimed:
+            return Job.objects.get(pk=pk)
+        # Another worker claimed it first
+
+
+def requeue_stale():
+    """Queue the jobs of workers that stopped again, return how many."""
+    now = timezone.now()
+    stale = Job.objects.filter(
+        status=JobStatus.RUNNING,
+        heartbeat_at__lt=now - timedelta(seconds=stale_seconds()),
+    )
+    # Read first, writes contend with the API for SQLite's lock
+    if not stale.exists():
+        return 0
+    stale.filter(attempts__gte=MAX_ATTEMPTS).update(
+        status=JobStatus.FAILED,
+        error="The worker running the job stopped.",
+        finished_at=now,
+    )
+    return stale.update(status=JobStatus.QUEUED, worker=None)
+
+
+class Progress:
+    """Callback reporting a running job's progress, beats its heartbeat."""
+
+    def __init__(self, job):
+        self.job = job
+
+    def __call__(self, done, total=None):
+        fields = {"done": done, "heartbeat_at": timezone.now()}
+        if total is not None:
+            fields["total"] = total
+        Job.objects.filter(pk=self.job.pk, worker=self.job.worker).update(**fields)
+
+
+def run(job):
+    """Run a claimed job and record its result or error."""
+    try:
+        result = HANDLERS[job.kind](job, validated_params(job), Progress(job))
+    except Exception as e:
+        logger.exception("Job %s (%s) failed", job.pk, job.kind)
+        fields = {"status": JobStatus.FAILED, "error": f"{type(e).__name__}: {e}"}
+    else:
+        fields = {"status": JobStatus.SUCCEEDED, "result": result}
+    # Unless the job was requeued meanwhile and belongs to another worker
+    Job.objects.filter(pk=job.pk, worker=job.worker, status=JobStatus.RUNNING).update(
+        finished_at=timezone.now(), **fields
+    )
+
+
+def work(
+    worker=None,
+    poll_interval=1.0,
+    burst=False,
+    stop=None,
+    requeue_interval=REQUEUE_INTERVAL,
+):
+    """
+    Run queued jobs until ``stop``, a threading or multiprocessing Event, is
+    set, or with ``burst`` until the queue is empty. Returns how many ran.
+
+    Stale jobs are requeued every ``requeue_interval`` seconds, None leaves it
+    to the caller, e.g. run_workers' supervisor. Database errors, such as a
+    lock timeout or a dropped connection, are logged and retried with a
+    backoff instead of stopping the worker.
+    """
+    worker = worker or worker_name()
+    stop = stop or threading.Event()
+    ran = 0
+    backoff = 0
+    next_requeue = 0.0
+    while not stop.is_set():
+        try:
+            if requeue_interval is not None and time.monotonic() >= next_requeue:
+                requeue_stale()
+                next_requeue = time.monotonic() + requeue_interval
+            job = claim(worker)
+            if job is None:
+                if burst:
+                    break
+                stop.wait(poll_interval)
+            else:
+                run(job)
+                ran += 1
+            backoff = 0
+        except DatabaseError:
+            backoff = min(max(backoff * 2, poll_interval), MAX_BACKOFF)
+            logger.exception("Job worker %s retries in %gs", worker, backoff)
+            close_old_connections()
+            stop.wait(backoff)
+    return ran
+
+
+def validated_params(job):
+    serializer = JOB_PARAMS_SERIALIZERS[job.kind](data=job.params)
+    serializer.is_valid(raise_exception=True)
+    return serializer.validated_data
+
+
+def write_output(job, extension, pieces):
+    """Write text pieces to the job's output file, return its result keys."""
+    directory = output_dir()
+    os.makedirs(directory, exist_ok=True)
+    name = f"{job.pk}.{extension}"
+    path = os.path.join(directory, name)
+    # A rerun of the job replaces the output of the previous attempt
+    with open(f"{path}.part", "w") as file:
+        file.writelines(pieces)
+    os.replace(f"{path}.part", path)
+    return {"output": name, "content_type": CONTENT_TYPES[extension]}
+
+
+def estimate_batch(job, params, progress):
+    from .views import PetEstimateBatchView
+
+    view = PetEstimateBatchView()
+    view.engine = active_rates.engine()
+    ids = params.get("ids")
+    progress(0, None if ids is None else len(ids))
+    estimated = 0
+
+    def chunks():
+        nonlocal estimated
+        for chunk in view.estimate_chunks(params):
+            yield chunk
+            estimated += len(chunk)
+            progress(estimated)
+
+    result = write_output(job, "json", view.stream(chunks()))
+    return {"pets": estimated, **result}
+
+
+def export(job, params, progress):
+    from .views import OwnerExportView, PetExportView
+
+    view = {"owners": OwnerExportView, "pets": PetExportView}[params["model"]]()
+    progress(0, view.get_queryset().count())
+    exported = 0
+
+    def rows():
+        nonlocal exported
+        for row in view.rows():
+            yield row
+            exported += 1
+            if exported % view.chunk_size == 0:
+                progress(exported)
+
+    result = write_output(job, "ndjson", view.stream(rows()))
+    progress(exported)
+    return {"rows": exported, **result}
+
+
+def reprice(job, params, progress):
+    from . import repricing
+
+    engine = repricing.repricing_engine(
+        params.get("multipliers", {}).items(), params.get("base_cost")
+    )
+    summary = repricing.PortfolioSummary()
+    progress(0, Pet.objects.count())
+    repriced = 0
+    for rows in repricing.pet_batches(REPRICE_BATCH_SIZE):
+        summary.add(*repricing.reprice(engine, rows))
+        repriced += len(rows)
+        progress(repriced)
+    keys = ("province", "species", "pets", "eligible", "premium", "average_premium")
+    return {
+        "rate_version": engine.version,
+        "groups": [dict(zip(keys, row)) for row in summary.rows()],
+    }
+
+
+def refresh_estimates(job, params, progress):
+    return {"refreshed": refresh(params["batch_size"], progress=progress)}
+
+
+HANDLERS = {
+    JobKind.ESTIMATE_BATCH: estimate_batch,
+    JobKind.REPRICE: reprice,
+    JobKind.EXPORT: export,
+    JobKind.REFRESH_ESTIMATES: refresh_estimates,
+}
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+from ...estimates import estimate_mismatches
+from ...models import Pet, PetEstimate
+
+
+class Command(BaseCommand):
+    help = "Compare the current materialized estimates with a live computation."
+
+    def handle(self, *args, **options):
+        mismatches = 0
+        for pet_id, materialized, live in estimate_mismatches():
+            mismatches += 1
+            if mismatches <= 20:
+                self.stderr.write(
+                    f"Mismatched estimate for pet {pet_id}: "
+                    f"{materialized.as_dict()} != {live.as_dict()}"
+                )
+
+        pending = PetEstimate.objects.filter(dirty=True).count()
+        missing = Pet.objects.filter(materialized_estimate__isnull=True).count()
+        if pending:
+            self.stdout.write(f"{pending} dirty estimates awaiting refresh.")
+        if missing:
+            self.stdout.write(
+                f"{missing} pets have no estimate, create them with "
+                "refresh_estimates --missing."
+            )
+        if mismatches:
+            raise CommandError(f"{mismatches} pets have a mismatched estimate.")
+        self.stdout.write(self.style.SUCCESS("All current estimates match."))
@@ -0,0 +1,48 @@
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from ...models import Pet
+from ...risk import rebuild_summaries, summary_mismatches
+from ...signals import invalidate_estimates
+
+# Pets rebuilt per UPDATE
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the per-pet risk summary columns that disagree with the "
+        "conditions and verify them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--verify-only",
+            action="store_true",
+            help="Only report pets whose summary disagrees with their conditions.",
+        )
+
+    def handle(self, *args, verify_only=False, **options):
+        if not verify_only:
+            with transaction.atomic():
+                updated = self.rebuild()
+            self.stdout.write(f"Rebuilt the risk summary of {updated} pets.")
+
+        mismatches = summary_mismatches().values_list("id", flat=True)
+        count = mismatches.count()
+        if count:
+            for pet_id in mismatches[:20]:
+                self.stderr.write(f"Mismatched risk summary for pet {pet_id}")
+            raise CommandError(f"{count} pets have a mismatched risk summary.")
+        self.stdout.write(self.style.SUCCESS("All risk summaries match."))
+
+    def rebuild(self):
+        # Only the pets that drifted, their estimates were computed from the
+        # wrong summary and are marked dirty and dropped from the cache
+        pet_ids = summary_mismatches().values_list("id", flat=True).iterator()
+        updated = 0
+        while batch := list(islice(pet_ids, BATCH_SIZE)):
+            updated += rebuild_summaries(Pet.objects.filter(pk__in=batch))
+            invalidate_estimates(batch)
+        return updated
@@ -0,0 +1,38 @@
+import time
+from django.core.management.base import BaseCommand
+from ...estimates import add_missing, refresh
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the materialized estimates marked dirty or computed with an "
+        "older rate version, once or every --interval seconds."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--missing",
+            action="store_true",
+            help="First create the estimates of pets inserted without the "
+            "signals, which scans every pet.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            help="Keep running, refreshing every INTERVAL seconds.",
+        )
+
+    def handle(self, *args, batch_size=1000, missing=False, interval=None, **options):
+        if missing:
+            added = add_missing(batch_size=batch_size)
+            self.stdout.write(f"Created {added} missing estimates.")
+        while True:
+            start = time.perf_counter()
+            refreshed = refresh(batch_size=batch_size)
+            elapsed = time.perf_counter() - start
+            if refreshed or interval is None:
+                self.stdout.write(f"Refreshed {refreshed} estimates in {elapsed:.2f}s.")
+            if interval is None:
+                return
+            time.sleep(interval)
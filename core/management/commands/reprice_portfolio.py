@@ -0,0 +1,147 @@
+import csv
+import time
+from django.core.management.base import BaseCommand, CommandError
+
+
+def rate(value):
+    """Parse a KEY=VALUE command line option."""
+    key, separator, amount = value.partition("=")
+    if not separator:
+        raise ValueError(value)
+    return key.upper(), float(amount)
+
+
+class Command(BaseCommand):
+    help = (
+        "Reprice every pet with NumPy from the active rate table, optionally with "
+        "new province multipliers, and print a summary by province and species."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--multiplier",
+            action="append",
+            type=rate,
+            default=[],
+            metavar="PROVINCE=VALUE",
+            help="Override a province multiplier, e.g. --multiplier QC=1.1",
+        )
+        parser.add_argument(
+            "--base-cost", type=float, help="Override the cost per year of age."
+        )
+        parser.add_argument("--batch-size", type=int, default=100_000)
+        parser.add_argument(
+            "--output", help="Write every pet's price to a .csv or .parquet file."
+        )
+
+    def handle(self, *args, **options):
+        try:
+            from ... import repricing
+        except ImportError as e:
+            raise CommandError(f"reprice_portfolio requires NumPy ({e}).")
+
+        try:
+            engine = repricing.repricing_engine(
+                options["multiplier"], options["base_cost"]
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        writer = self.open_output(options["output"]) if options["output"] else None
+        summary = repricing.PortfolioSummary()
+        start = time.perf_counter()
+        try:
+            for rows in repricing.pet_batches(options["batch_size"]):
+                priced = repricing.reprice(engine, rows)
+                summary.add(*priced)
+                if writer:
+                    writer.write(rows, *priced)
+        except ValueError as e:
+            raise CommandError(str(e))
+        finally:
+            if writer:
+                writer.close()
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(
+            f"{'province':<9}{'species':<8}{'pets':>10}{'eligible':>10}"
+            f"{'premium':>14}{'average':>10}"
+        )
+        total = 0
+        for province, species, pets, eligible, premium, average in summary.rows():
+            total += pets
+            self.stdout.write(
+                f"{province:<9}{species:<8}{pets:>10}{eligible:>10}"
+                f"{premium:>14.2f}{'-' if average is None else f'{average:.2f}':>10}"
+            )
+        self.stdout.write(f"Repriced {total} pets in {elapsed:.1f}s.")
+
+    def open_output(self, path):
+        if path.endswith(".parquet"):
+            try:
+                return ParquetOutput(path)
+            except ImportError as e:
+                raise CommandError(f"Parquet output requires pyarrow ({e}).")
+        if path.endswith(".csv"):
+            return CSVOutput(path)
+        raise CommandError("--output must end in .csv or .parquet.")
+
+
+class CSVOutput:
+    header = ["id", "province", "species", "eligible", "cost_of_insurance"]
+
+    def __init__(self, path):
+        self.file = open(path, "w", newline="")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(self.header)
+
+    def write(self, rows, province, species, eligible, costs):
+        from ...repricing import PROVINCES, SPECIES
+
+        self.writer.writerows(
+            zip(
+                (row[0] for row in rows),
+                PROVINCES[province],
+                SPECIES[species],
+                eligible,
+                (None if cost != cost else cost for cost in costs.tolist()),
+            )
+        )
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetOutput:
+    def __init__(self, path):
+        import pyarrow
+        import pyarrow.parquet
+
+        self.pyarrow = pyarrow
+        self.schema = pyarrow.schema(
+            [
+                ("id", pyarrow.string()),
+                ("province", pyarrow.string()),
+                ("species", pyarrow.string()),
+                ("eligible", pyarrow.bool_()),
+                ("cost_of_insurance", pyarrow.float64()),
+            ]
+        )
+        self.writer = pyarrow.parquet.ParquetWriter(path, self.schema)
+
+    def write(self, rows, province, species, eligible, costs):
+        from ...repricing import PROVINCES, SPECIES
+
+        columns = [
+            [str(row[0]) for row in rows],
+            PROVINCES[province],
+            SPECIES[species],
+            eligible,
+            self.pyarrow.array(costs, from_pandas=True),
+        ]
+        self.writer.write_table(
+            self.pyarrow.Table.from_arrays(columns, schema=self.schema)
+        )
+
+    def close(self):
+        self.writer.close()
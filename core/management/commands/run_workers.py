@@ -0,0 +1,159 @@
+import multiprocessing
+import os
+import signal
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connections
+from ... import jobs
+
+# Seconds between the supervisor's checks of the workers
+SUPERVISE_INTERVAL = 1.0
+
+# Seconds between a waiting worker's checks of its stop
+STOP_CHECK_INTERVAL = 0.5
+
+
+class WorkerStop:
+    """
+    Stops a worker once a signal was received, the pool's ``shared`` Event is
+    set or the ``parent`` process is gone, whichever comes first. The signal
+    handler only sets a flag, setting an Event in one can deadlock.
+    """
+
+    def __init__(self, shared=None, parent=None):
+        self.shared = shared
+        self.parent = parent
+        self.signalled = False
+
+    def handle(self, signum, frame):
+        self.signalled = True
+
+    def is_set(self):
+        return (
+            self.signalled
+            or (self.shared is not None and self.shared.is_set())
+            # An orphan is adopted by another process
+            or (self.parent is not None and os.getppid() != self.parent)
+        )
+
+    def wait(self, timeout):
+        deadline = time.monotonic() + timeout
+        while not self.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(remaining, STOP_CHECK_INTERVAL))
+        return True
+
+
+def run_worker(stop, poll_interval, burst, parent=None):
+    # Interrupts and terminations, which systemd and Docker send to the whole
+    # process group, stop the worker once its running job finishes, like the
+    # supervisor's stop
+    stop = WorkerStop(stop, parent)
+    signal.signal(signal.SIGINT, stop.handle)
+    signal.signal(signal.SIGTERM, stop.handle)
+    jobs.work(
+        poll_interval=poll_interval, burst=burst, stop=stop, requeue_interval=None
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the queued background jobs in a pool of worker processes, until "
+        "interrupted or with --burst until the queue is empty."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help="Worker processes, settings.JOB_WORKERS or the number of CPUs "
+            "by default. One runs the jobs in this process.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait when the queue is empty.",
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Stop once the queue is empty.",
+        )
+
+    def handle(self, *args, workers=None, poll_interval=1.0, burst=False, **options):
+        workers = (
+            workers or getattr(settings, "JOB_WORKERS", None) or os.cpu_count() or 1
+        )
+        if workers < 1:
+            raise CommandError("--workers must be at least 1.")
+        if workers == 1:
+            stop = WorkerStop()
+            previous = signal.signal(signal.SIGTERM, stop.handle)
+            try:
+                ran = jobs.work(poll_interval=poll_interval, burst=burst, stop=stop)
+            finally:
+                signal.signal(signal.SIGTERM, previous)
+            self.stdout.write(f"Ran {ran} jobs.")
+            return
+
+        try:
+            self.context = multiprocessing.get_context("fork")
+        except ValueError:
+            raise CommandError("Worker processes need fork, use --workers 1.")
+        stop = self.context.Event()
+        processes = [
+            self.start_worker(i, stop, poll_interval, burst) for i in range(workers)
+        ]
+        # Handled as an interrupt, setting stop in a signal handler deadlocks
+        # when the signal arrives while this process is in one of its methods
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+        self.stdout.write(f"Started {workers} workers.")
+        next_requeue = 0.0
+        while True:
+            try:
+                if not self.supervise(processes, stop, poll_interval, burst):
+                    break
+                if not stop.is_set() and time.monotonic() >= next_requeue:
+                    self.requeue_stale()
+                    next_requeue = time.monotonic() + jobs.REQUEUE_INTERVAL
+                time.sleep(SUPERVISE_INTERVAL)
+            except KeyboardInterrupt:
+                self.stdout.write("Stopping once the running jobs are done.")
+                stop.set()
+        self.stdout.write(f"{workers} workers stopped.")
+
+    def start_worker(self, i, stop, poll_interval, burst):
+        # The connections of this process can't be shared with the worker
+        connections.close_all()
+        process = self.context.Process(
+            target=run_worker,
+            args=(stop, poll_interval, burst, os.getpid()),
+            name=f"job-worker-{i}",
+        )
+        process.start()
+        return process
+
+    def supervise(self, processes, stop, poll_interval, burst):
+        """Restart the workers that died, return whether any is running."""
+        running = False
+        for i, process in enumerate(processes):
+            if process.is_alive():
+                running = True
+            elif process.exitcode != 0 and not stop.is_set():
+                self.stderr.write(
+                    f"{process.name} exited with {process.exitcode}, restarting it."
+                )
+                processes[i] = self.start_worker(i, stop, poll_interval, burst)
+                running = True
+        return running
+
+    def requeue_stale(self):
+        # Once for the pool, the workers don't poll for stale jobs
+        try:
+            jobs.requeue_stale()
+        except DatabaseError as e:
+            self.stderr.write(f"Couldn't requeue stale jobs ({e}).")
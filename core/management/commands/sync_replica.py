@@ -0,0 +1,50 @@
+import sqlite3
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from ...routers import REPLICA
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the default SQLite database onto the replica with SQLite's online "
+        "backup API, a stand-in for replication when developing locally."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=float,
+            help="Keep running, syncing every INTERVAL seconds.",
+        )
+
+    def handle(self, *args, interval=None, **options):
+        databases = settings.DATABASES
+        if REPLICA not in databases:
+            raise CommandError(
+                "No replica database, set REPLICA_DATABASE to a SQLite file."
+            )
+        for alias in ("default", REPLICA):
+            if not databases[alias]["ENGINE"].endswith("sqlite3"):
+                raise CommandError(f"The {alias} database is not SQLite.")
+
+        while True:
+            start = time.perf_counter()
+            self.sync(databases["default"]["NAME"], databases[REPLICA]["NAME"])
+            elapsed = time.perf_counter() - start
+            if interval is None:
+                self.stdout.write(f"Synced the replica in {elapsed:.2f}s.")
+                return
+            time.sleep(max(interval - elapsed, 0))
+
+    @staticmethod
+    def sync(source, target):
+        source = sqlite3.connect(source)
+        target = sqlite3.connect(target)
+        try:
+            # A consistent snapshot of the source, readers of the target wait
+            # on its lock while the pages are copied
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
@@ -0,0 +1,220 @@
+"""
+Per-endpoint request metrics.
+
+``RequestMetricsMiddleware`` records the query count, database time, render
+time and wall time of every request under the URL name it resolved to. Each
+metric keeps its most recent samples in a fixed-size ring buffer, so
+recording is a couple of list stores, and the quantiles are only computed
+when ``/api/_metrics`` is scraped. Totals are kept separately and cover every
+request since the process started, as Prometheus expects.
+
+Enabled with the ``REQUEST_METRICS`` setting, off by default. The metrics are per process,
+and the render time is DRF's response rendering (serializing the data to
+JSON). Streaming responses are timed until the response is returned, not
+until their content is consumed.
+"""
+
+import threading
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+# (metric name, help, EndpointMetrics attribute)
+METRICS = [
+    ("http_request_seconds", "Wall time of requests.", "seconds"),
+    ("http_request_db_seconds", "Time spent in database queries.", "db_seconds"),
+    ("http_request_render_seconds", "Time spent rendering.", "render_seconds"),
+    ("http_request_queries", "Database queries per request.", "queries"),
+]
+
+
+class RingBuffer:
+    """The last ``size`` samples of a metric, with their all-time sum and count."""
+
+    __slots__ = ("samples", "size", "count", "sum")
+
+    def __init__(self, size=1024):
+        self.samples = [0.0] * size
+        self.size = size
+        self.count = 0
+        self.sum = 0.0
+
+    def add(self, value):
+        self.samples[self.count % self.size] = value
+        self.count += 1
+        self.sum += value
+
+    def quantiles(self, quantiles=QUANTILES):
+        window = sorted(self.samples[: min(self.count, self.size)])
+        if not window:
+            return [(q, 0.0) for q in quantiles]
+        last = len(window) - 1
+        return [(q, window[round(q * last)]) for q in quantiles]
+
+
+class EndpointMetrics:
+    def __init__(self, size):
+        self.lock = threading.Lock()
+        self.seconds = RingBuffer(size)
+        self.db_seconds = RingBuffer(size)
+        self.render_seconds = RingBuffer(size)
+        self.queries = RingBuffer(size)
+
+    def add(self, seconds, db_seconds, render_seconds, queries):
+        with self.lock:
+            self.seconds.add(seconds)
+            self.db_seconds.add(db_seconds)
+            self.render_seconds.add(render_seconds)
+            self.queries.add(queries)
+
+
+class MetricsRegistry:
+    def __init__(self, size=1024):
+        self.size = size
+        self.endpoints = {}
+        self._lock = threading.Lock()
+
+    def endpoint(self, name):
+        metrics = self.endpoints.get(name)
+        if metrics is None:
+            with self._lock:
+                metrics = self.endpoints.setdefault(name, EndpointMetrics(self.size))
+        return metrics
+
+    def clear(self):
+        with self._lock:
+            self.endpoints = {}
+
+    def prometheus(self):
+        """Render the metrics in the Prometheus text exposition format."""
+        lines = []
+        endpoints = sorted(self.endpoints.items())
+        for metric, help, attribute in METRICS:
+            lines.append(f"# HELP {metric} {help}")
+            lines.append(f"# TYPE {metric} summary")
+            for name, metrics in endpoints:
+                with metrics.lock:
+                    buffer = getattr(metrics, attribute)
+                    quantiles = buffer.quantiles()
+                    total, count = buffer.sum, buffer.count
+                label = f'endpoint="{name}"'
+                for quantile, value in quantiles:
+                    lines.append(f'{metric}{{{label},quantile="{quantile}"}} {value:g}')
+                lines.append(f"{metric}_sum{{{label}}} {total:g}")
+                lines.append(f"{metric}_count{{{label}}} {count}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+class RequestTimings:
+    """Per-request accumulator of the queries seen by ``record_query``."""
+
+    __slots__ = ("queries", "db_seconds", "render_start", "render_seconds", "token")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.render_start = None
+        self.render_seconds = 0.0
+        self.token = None
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_seconds += time.perf_counter() - start
+            self.queries += 1
+
+    def rendered(self, response):
+        self.render_seconds = time.perf_counter() - self.render_start
+
+
+# The timings of the request being handled. A context variable follows the
+# request into the sync_to_async threads where async views run their queries,
+# whose connections are thread-local
+_timings = ContextVar("request_timings", default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    """Execute wrapper of every connection, see ``core.signals``."""
+    timings = _timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    return timings(execute, sql, params, many, context)
+
+
+def install(connection):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class RequestMetricsMiddleware:
+    # Async-capable so ASGI requests aren't adapted through a thread
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, "REQUEST_METRICS", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        timings = self.start(request)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            seconds = time.perf_counter() - start
+            self.finish(request, timings, seconds)
+        return response
+
+    async def __acall__(self, request):
+        timings = self.start(request)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            seconds = time.perf_counter() - start
+            self.finish(request, timings, seconds)
+        return response
+
+    @staticmethod
+    def start(request):
+        timings = request._metrics_timings = RequestTimings()
+        timings.token = _timings.set(timings)
+        return timings
+
+    @staticmethod
+    def finish(request, timings, seconds):
+        _timings.reset(timings.token)
+        match = request.resolver_match
+        registry.endpoint(match.url_name if match else "unresolved").add(
+            seconds, timings.db_seconds, timings.render_seconds, timings.queries
+        )
+
+    # Called right before the response is rendered
+    def process_template_response(self, request, response):
+        timings = request._metrics_timings
+        timings.render_start = time.perf_counter()
+        response.add_post_render_callback(timings.rendered)
+        return response
+
+
+def metrics(request):
+    return HttpResponse(
+        registry.prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
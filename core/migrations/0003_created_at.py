@@ -0,0 +1,56 @@
+# Generated by Django 4.2 on 2026-10-18 10:12
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0002_alter_pet_species"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="owner",
+            name="created_at",
+            field=models.DateTimeField(
+                auto_now_add=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="pet",
+            name="created_at",
+            field=models.DateTimeField(
+                auto_now_add=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="petmedicalcondition",
+            name="created_at",
+            field=models.DateTimeField(
+                auto_now_add=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name="owner",
+            index=models.Index(
+                fields=["created_at", "id"], name="core_owner_created_2e21c7_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="pet",
+            index=models.Index(
+                fields=["created_at", "id"], name="core_pet_created_5617bc_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="petmedicalcondition",
+            index=models.Index(
+                fields=["pet", "created_at", "id"], name="core_petmed_pet_id_26dbb8_idx"
+            ),
+        ),
+    ]
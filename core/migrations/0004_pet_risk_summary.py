@@ -0,0 +1,54 @@
+# Generated by Django 4.2 on 2026-10-18 10:19
+
+from django.db import migrations, models
+from django.db.models import Count, Exists, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_risk_summary(apps, schema_editor):
+    Pet = apps.get_model("core", "Pet")
+    PetMedicalCondition = apps.get_model("core", "PetMedicalCondition")
+
+    def count(condition_filter):
+        counts = (
+            PetMedicalCondition.objects.filter(condition_filter, pet=OuterRef("pk"))
+            .order_by()
+            .values("pet")
+            .annotate(count=Count("*"))
+            .values("count")
+        )
+        return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+    Pet.objects.update(
+        has_cancer=Exists(
+            PetMedicalCondition.objects.filter(pet=OuterRef("pk"), condition="CANCER")
+        ),
+        diabetes_count=count(Q(condition="DIABETES")),
+        other_condition_count=count(~Q(condition__in=["CANCER", "DIABETES"])),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0003_created_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="pet",
+            name="diabetes_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="pet",
+            name="has_cancer",
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name="pet",
+            name="other_condition_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_risk_summary, migrations.RunPython.noop),
+    ]
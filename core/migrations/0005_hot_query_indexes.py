@@ -0,0 +1,59 @@
+# Generated by Django 4.2 on 2026-10-18 10:20
+
+from django.db import migrations, models
+from django.db.models import Count, F
+
+
+def remove_duplicate_conditions(apps, schema_editor):
+    Pet = apps.get_model("core", "Pet")
+    PetMedicalCondition = apps.get_model("core", "PetMedicalCondition")
+
+    duplicates = (
+        PetMedicalCondition.objects.values("pet", "condition")
+        .annotate(rows=Count("id"))
+        .filter(rows__gt=1)
+    )
+    for duplicate in duplicates.iterator():
+        rows = PetMedicalCondition.objects.filter(
+            pet=duplicate["pet"], condition=duplicate["condition"]
+        ).order_by("created_at", "id")
+        keep = rows.values_list("id", flat=True)[0]
+        removed, _ = rows.exclude(id=keep).delete()
+
+        # Keep the risk summary in step, cancer is a flag rather than a count
+        if duplicate["condition"] == "DIABETES":
+            field = "diabetes_count"
+        elif duplicate["condition"] != "CANCER":
+            field = "other_condition_count"
+        else:
+            continue
+        Pet.objects.filter(pk=duplicate["pet"]).update(**{field: F(field) - removed})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0004_pet_risk_summary"),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_conditions, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="pet",
+            index=models.Index(
+                fields=["owner", "created_at", "id"], name="core_pet_owner_i_85b455_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="pet",
+            index=models.Index(
+                fields=["species", "age"], name="core_pet_species_cac2b5_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="petmedicalcondition",
+            constraint=models.UniqueConstraint(
+                fields=("pet", "condition"), name="unique_pet_condition"
+            ),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 4.2 on 2026-10-18 10:27
+
+from django.db import migrations, models
+import django.utils.timezone
+
+# The README rates, as in core.underwriting.DEFAULT_RULES when this migration
+# was written
+INITIAL_RULES = {
+    "base_cost_per_year": 2.0,
+    "max_age_by_species": {"DOG": 8, "CAT": 10},
+    "province_multipliers": {"ON": 1.5, "BC": 1.25},
+    "condition_surcharges": {"CANCER": None, "DIABETES": 8.0},
+    "default_condition_surcharge": 5.0,
+}
+
+
+def seed_rate_table(apps, schema_editor):
+    RateTable = apps.get_model("core", "RateTable")
+    RateTable.objects.create(
+        version=1,
+        effective_from=django.utils.timezone.now(),
+        rules=INITIAL_RULES,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0005_hot_query_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RateTable",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("version", models.PositiveIntegerField(unique=True)),
+                (
+                    "effective_from",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                ("rules", models.JSONField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="ratetable",
+            index=models.Index(
+                fields=["effective_from", "version"],
+                name="core_rateta_effecti_5e8051_idx",
+            ),
+        ),
+        migrations.RunPython(seed_rate_table, migrations.RunPython.noop),
+    ]
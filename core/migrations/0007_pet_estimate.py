@@ -0,0 +1,49 @@
+# Generated by Django 4.2 on 2026-10-18 10:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0006_rate_table"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PetEstimate",
+            fields=[
+                (
+                    "pet",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="materialized_estimate",
+                        serialize=False,
+                        to="core.pet",
+                    ),
+                ),
+                ("eligible", models.BooleanField(default=False)),
+                ("reason", models.CharField(max_length=16, null=True)),
+                ("cost_of_insurance", models.FloatField(null=True)),
+                ("rate_version", models.PositiveIntegerField(null=True)),
+                ("dirty", models.BooleanField(default=True)),
+                ("refreshed_at", models.DateTimeField(null=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="petestimate",
+            index=models.Index(
+                condition=models.Q(("dirty", True)),
+                fields=["pet"],
+                name="core_petestimate_dirty_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="petestimate",
+            index=models.Index(
+                fields=["rate_version"], name="core_petest_rate_ve_9c8b0b_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2 on 2026-10-18 10:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0007_pet_estimate"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="owner",
+            name="revision",
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.AddField(
+            model_name="pet",
+            name="conditions_revision",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="pet",
+            name="revision",
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+    ]
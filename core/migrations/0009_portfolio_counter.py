@@ -0,0 +1,114 @@
+# Generated by Django 4.2 on 2026-10-18 10:54
+
+from django.db import migrations, models
+
+
+def recount_estimates(apps, schema_editor):
+    # Rows refreshed before the counters existed are counted by the refresher
+    PetEstimate = apps.get_model("core", "PetEstimate")
+    PetEstimate.objects.update(dirty=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0008_revisions"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PortfolioCounter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "province",
+                    models.CharField(
+                        choices=[
+                            ("AB", "Alberta"),
+                            ("BC", "British Columbia"),
+                            ("MB", "Manitoba"),
+                            ("NB", "New Brunswick"),
+                            ("NL", "Newfoundland And Labrador"),
+                            ("NS", "Nova Scotia"),
+                            ("ON", "Ontario"),
+                            ("PE", "Prince Edward Island"),
+                            ("QC", "Quebec"),
+                            ("SK", "Saskatchewan"),
+                            ("YT", "Yukon"),
+                            ("NT", "Northwest Territories"),
+                            ("NU", "Nunavut"),
+                        ],
+                        max_length=2,
+                    ),
+                ),
+                (
+                    "species",
+                    models.CharField(
+                        choices=[
+                            ("DOG", "Dog"),
+                            ("CAT", "Cat"),
+                            ("BIRD", "Bird"),
+                            ("FISH", "Fish"),
+                        ],
+                        max_length=6,
+                    ),
+                ),
+                ("eligible", models.BooleanField()),
+                ("pets", models.BigIntegerField(default=0)),
+                ("premium", models.FloatField(default=0.0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="petestimate",
+            name="province",
+            field=models.CharField(
+                choices=[
+                    ("AB", "Alberta"),
+                    ("BC", "British Columbia"),
+                    ("MB", "Manitoba"),
+                    ("NB", "New Brunswick"),
+                    ("NL", "Newfoundland And Labrador"),
+                    ("NS", "Nova Scotia"),
+                    ("ON", "Ontario"),
+                    ("PE", "Prince Edward Island"),
+                    ("QC", "Quebec"),
+                    ("SK", "Saskatchewan"),
+                    ("YT", "Yukon"),
+                    ("NT", "Northwest Territories"),
+                    ("NU", "Nunavut"),
+                ],
+                max_length=2,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="petestimate",
+            name="species",
+            field=models.CharField(
+                choices=[
+                    ("DOG", "Dog"),
+                    ("CAT", "Cat"),
+                    ("BIRD", "Bird"),
+                    ("FISH", "Fish"),
+                ],
+                max_length=6,
+                null=True,
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="portfoliocounter",
+            constraint=models.UniqueConstraint(
+                fields=("province", "species", "eligible"),
+                name="unique_portfolio_counter",
+            ),
+        ),
+        migrations.RunPython(recount_estimates, migrations.RunPython.noop),
+    ]
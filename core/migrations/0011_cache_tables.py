@@ -0,0 +1,21 @@
+from django.core.management import call_command
+from django.db import migrations
+
+
+def create_cache_tables(apps, schema_editor):
+    # The tables of the DatabaseCache backends in settings.CACHES, such as the
+    # idempotency cache. Tables that already exist are left as they are
+    call_command(
+        "createcachetable", database=schema_editor.connection.alias, verbosity=0
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0010_job"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_cache_tables, migrations.RunPython.noop),
+    ]
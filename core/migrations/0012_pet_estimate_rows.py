@@ -0,0 +1,33 @@
+from itertools import islice
+
+from django.db import migrations
+
+BATCH_SIZE = 1000
+
+
+def add_missing_rows(apps, schema_editor):
+    # Pets now get their row when they are created, and the refresher no longer
+    # looks for pets without one. Create the rows of the pets that predate it
+    Pet = apps.get_model("core", "Pet")
+    PetEstimate = apps.get_model("core", "PetEstimate")
+    missing = (
+        Pet.objects.filter(materialized_estimate__isnull=True)
+        .values_list("pk", flat=True)
+        .iterator(chunk_size=BATCH_SIZE)
+    )
+    while pet_ids := list(islice(missing, BATCH_SIZE)):
+        PetEstimate.objects.bulk_create(
+            [PetEstimate(pet_id=pet_id) for pet_id in pet_ids],
+            ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0011_cache_tables"),
+    ]
+
+    operations = [
+        migrations.RunPython(add_missing_rows, migrations.RunPython.noop),
+    ]
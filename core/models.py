@@ -1,4 +1,15 @@
+from django.core.exceptions import ValidationError
 from django.db import models
+from django.utils import timezone
+from django.db.models import (
+    BooleanField,
+    ExpressionWrapper,
+    F,
+    Q,
+    Value,
+)
+from .rates import active_rates
+from .underwriting import Estimate, compile_rules
 import uuid
 
 
@@ -23,10 +34,32 @@ class Owner(models.Model):
     first_name = models.TextField()
     last_name = models.TextField()
     province = models.CharField(max_length=2, choices=Province.choices)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Bumped by every save, the owner's ETag (see core.conditional)
+    revision = models.PositiveIntegerField(default=1, editable=False)
+
+    class Meta:
+        indexes = [models.Index(fields=["created_at", "id"])]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
 
+    def save(self, *args, **kwargs):
+        bump_revision(self, kwargs)
+        super().save(*args, **kwargs)
+        reload_revision(self)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored province so saves can tell whether it changed
+        instance._loaded_province = instance.__dict__.get("province")
+        return instance
+
+    @property
+    def province_changed(self):
+        return getattr(self, "_loaded_province", None) != self.province
+
 
 class Species(models.TextChoices):
     DOG = "DOG"
@@ -35,6 +68,74 @@ class Species(models.TextChoices):
     FISH = "FISH"
 
 
+class MedicalCondition(models.TextChoices):
+    CANCER = "CANCER"
+    DIABETES = "DIABETES"
+    HEART_DISEASE = "HEART_DISEASE"
+    OTHER = "OTHER"
+
+
+# Per-pet risk summary columns maintained by core.risk as conditions change,
+# so estimates never have to read the medical conditions table
+RISK_SUMMARY_FIELDS = ("has_cancer", "diabetes_count", "other_condition_count")
+
+
+def bump_revision(instance, save_kwargs):
+    """Increment ``revision`` in the UPDATE of an existing row's save."""
+    if instance._state.adding:
+        return
+    # In SQL, concurrent saves can't write the same revision
+    instance.revision = F("revision") + 1
+    if save_kwargs.get("update_fields") is not None:
+        save_kwargs["update_fields"] = {*save_kwargs["update_fields"], "revision"}
+
+
+def reload_revision(instance):
+    # Loaded from the database when next read, most saves never need it
+    if isinstance(instance.__dict__.get("revision"), models.Expression):
+        del instance.__dict__["revision"]
+
+
+def risk_summary_field(condition):
+    """Return the Pet summary column that accounts for a medical condition."""
+    if condition == MedicalCondition.CANCER:
+        return "has_cancer"
+    if condition == MedicalCondition.DIABETES:
+        return "diabetes_count"
+    return "other_condition_count"
+
+
+class PetQuerySet(models.QuerySet):
+    def with_estimate_inputs(self):
+        """
+        Annotate the owner's province so a single query loads everything an
+        estimate needs, the conditions are read from the summary columns.
+        """
+        return self.annotate(owner_province=F("owner__province"))
+
+    def with_eligibility(self, engine=None):
+        """
+        Annotate ``eligible`` in SQL from the compiled underwriting rules: an
+        insurable species within its age limit and no vetoing condition.
+        """
+        if engine is None:
+            engine = active_rates.engine()
+        insurable = None
+        for species, max_age in engine.max_age_by_species.items():
+            rule = Q(species=species, age__lte=max_age)
+            insurable = rule if insurable is None else insurable | rule
+        if insurable is None:
+            return self.annotate(eligible=Value(False))
+
+        # Only the conditions with their own summary column can veto a pet,
+        # see PRICED_CONDITIONS
+        for condition in engine.veto_conditions:
+            insurable &= Q(**{risk_summary_field(condition): 0})
+        return self.annotate(
+            eligible=ExpressionWrapper(insurable, output_field=BooleanField())
+        )
+
+
 # Pet associated with an owner
 class Pet(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -42,16 +143,67 @@ class Pet(models.Model):
     species = models.CharField(max_length=6, choices=Species.choices)
     age = models.IntegerField()
     owner = models.ForeignKey(Owner, on_delete=models.CASCADE)
+    created_at = models.DateTimeField(auto_now_add=True)
+    has_cancer = models.BooleanField(default=False, editable=False)
+    diabetes_count = models.PositiveIntegerField(default=0, editable=False)
+    other_condition_count = models.PositiveIntegerField(default=0, editable=False)
+    # Bumped by every save, the pet's ETag (see core.conditional)
+    revision = models.PositiveIntegerField(default=1, editable=False)
+    # Bumped with the summary columns whenever the pet's conditions change
+    conditions_revision = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = PetQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at", "id"]),
+            # An owner's pets in listing order
+            models.Index(fields=["owner", "created_at", "id"]),
+            # Eligibility sweeps by species and age
+            models.Index(fields=["species", "age"]),
+        ]
 
     def __str__(self):
         return f"{self.name} the {self.species.lower()}"
 
+    def save(self, *args, **kwargs):
+        # The summary columns are updated in place by core.risk, never write
+        # back the copy loaded with this instance as it may be stale
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in RISK_SUMMARY_FIELDS
+                and field.name != "conditions_revision"
+            ]
+        bump_revision(self, kwargs)
+        super().save(*args, **kwargs)
+        reload_revision(self)
 
-class MedicalCondition(models.TextChoices):
-    CANCER = "CANCER"
-    DIABETES = "DIABETES"
-    HEART_DISEASE = "HEART_DISEASE"
-    OTHER = "OTHER"
+    def estimate(self, engine=None):
+        """
+        Evaluate the underwriting rules for this pet, the queryset should be
+        annotated by ``PetQuerySet.with_estimate_inputs``. Uses the active rate
+        table unless an engine is given.
+        """
+        if engine is None:
+            engine = active_rates.engine()
+        return engine.evaluate_counts(
+            self.species, self.age, self.owner_province, self.condition_counts
+        )
+
+    @property
+    def condition_counts(self):
+        """
+        Condition counts for ``RulesEngine.evaluate_counts`` from the summary
+        columns, conditions other than cancer and diabetes count as OTHER.
+        """
+        return {
+            MedicalCondition.CANCER: int(self.has_cancer),
+            MedicalCondition.DIABETES: self.diabetes_count,
+            MedicalCondition.OTHER: self.other_condition_count,
+        }
 
 
 # Medical condition associated with a pet, stored in a separate table
@@ -59,3 +211,168 @@ class PetMedicalCondition(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     pet = models.ForeignKey(Pet, on_delete=models.CASCADE)
     condition = models.CharField(max_length=50, choices=MedicalCondition.choices)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["pet", "created_at", "id"])]
+        constraints = [
+            # A condition is either in a pet's history or not, a duplicate
+            # row would only inflate the estimate surcharges
+            models.UniqueConstraint(
+                fields=["pet", "condition"], name="unique_pet_condition"
+            ),
+        ]
+
+
+IMMUTABLE_RATES = "Rate tables can't be changed, create a new version."
+
+
+class RateTableQuerySet(models.QuerySet):
+    def active(self, at=None):
+        """Rate tables in effect at a time (now by default), newest first."""
+        return self.filter(effective_from__lte=at or timezone.now()).order_by(
+            "-effective_from", "-version"
+        )
+
+    def update(self, **kwargs):
+        raise ValidationError(IMMUTABLE_RATES)
+
+
+# Versioned underwriting rates, the table with the latest effective_from that
+# has passed is the one estimates are computed with. Rows can't be changed:
+# estimates are current as long as their rate version is, so new rates are
+# always a new version
+class RateTable(models.Model):
+    version = models.PositiveIntegerField(unique=True)
+    effective_from = models.DateTimeField(default=timezone.now)
+    # Rules description in the shape of core.underwriting.DEFAULT_RULES
+    rules = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = RateTableQuerySet.as_manager()
+
+    class Meta:
+        indexes = [models.Index(fields=["effective_from", "version"])]
+
+    def clean(self):
+        if not self._state.adding:
+            raise ValidationError(IMMUTABLE_RATES)
+        try:
+            compile_rules(self.rules, self.version)
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            raise ValidationError({"rules": f"Invalid rules ({e!r})."})
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValidationError(IMMUTABLE_RATES)
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"Rates v{self.version} from {self.effective_from:%Y-%m-%d}"
+
+
+# Estimate of each pet materialized by core.estimates.refresh, a row is only
+# current while it isn't dirty and was computed with the active rate version
+class PetEstimate(models.Model):
+    pet = models.OneToOneField(
+        Pet,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="materialized_estimate",
+    )
+    eligible = models.BooleanField(default=False)
+    reason = models.CharField(max_length=16, null=True)
+    cost_of_insurance = models.FloatField(null=True)
+    rate_version = models.PositiveIntegerField(null=True)
+    dirty = models.BooleanField(default=True)
+    refreshed_at = models.DateTimeField(null=True)
+    # Where the row is counted in the PortfolioCounter rows, set by refresh
+    province = models.CharField(max_length=2, choices=Province.choices, null=True)
+    species = models.CharField(max_length=6, choices=Species.choices, null=True)
+
+    class Meta:
+        indexes = [
+            # The refresher's queue, only dirty rows are indexed
+            models.Index(
+                fields=["pet"],
+                condition=Q(dirty=True),
+                name="core_petestimate_dirty_idx",
+            ),
+            models.Index(fields=["rate_version"]),
+        ]
+
+    def as_estimate(self):
+        return Estimate(
+            eligible=self.eligible,
+            cost_of_insurance=self.cost_of_insurance,
+            reason=self.reason,
+            rate_version=self.rate_version,
+        )
+
+
+# Pets and total quoted premium by province, species and eligibility, kept up
+# to date by core.estimates.refresh from the PetEstimate rows (core.portfolio)
+class PortfolioCounter(models.Model):
+    province = models.CharField(max_length=2, choices=Province.choices)
+    species = models.CharField(max_length=6, choices=Species.choices)
+    eligible = models.BooleanField()
+    pets = models.BigIntegerField(default=0)
+    premium = models.FloatField(default=0.0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["province", "species", "eligible"],
+                name="unique_portfolio_counter",
+            ),
+        ]
+
+
+class JobKind(models.TextChoices):
+    ESTIMATE_BATCH = "estimate_batch"
+    REPRICE = "reprice"
+    EXPORT = "export"
+    REFRESH_ESTIMATES = "refresh_estimates"
+
+
+class JobStatus(models.TextChoices):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+# Long-running operation queued by the API and run by ``manage.py run_workers``
+# (core.jobs), which claims a queued row by switching it to running
+class Job(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    kind = models.CharField(max_length=17, choices=JobKind.choices)
+    # Parameters of the kind, see core.serializers.JOB_PARAMS_SERIALIZERS
+    params = models.JSONField(default=dict)
+    status = models.CharField(
+        max_length=9, choices=JobStatus.choices, default=JobStatus.QUEUED
+    )
+    # Progress reported by the handler, total is None when it isn't known
+    done = models.PositiveBigIntegerField(default=0)
+    total = models.PositiveBigIntegerField(null=True)
+    result = models.JSONField(null=True)
+    error = models.TextField(null=True)
+    # Name of the worker process running the job
+    worker = models.CharField(max_length=64, null=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True)
+    # Refreshed with the progress, a running job that stops beating is requeued
+    heartbeat_at = models.DateTimeField(null=True)
+    finished_at = models.DateTimeField(null=True)
+
+    class Meta:
+        indexes = [
+            # The workers' queue, only queued jobs are indexed
+            models.Index(
+                fields=["created_at"],
+                condition=Q(status="queued"),
+                name="core_job_queued_idx",
+            ),
+            models.Index(fields=["status", "heartbeat_at"]),
+        ]
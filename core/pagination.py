@@ -0,0 +1,119 @@
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+
+
+# Keyset pagination for every list endpoint. The cursor holds the position in
+# the (created_at, id) ordering instead of an OFFSET, so page N costs the same
+# as page 1. UUID primary keys are random, so the creation timestamp provides
+# the order and the id only breaks ties between rows created together.
+#
+# DRF's CursorPagination only keeps the first ordering field in the cursor and
+# pages through equal values with an offset capped at offset_cutoff, which
+# gets stuck on more than 1000 rows sharing a timestamp. Here the position is
+# the whole (created_at, id) pair, unique per row, so no offset is needed.
+class CreatedAtCursorPagination(CursorPagination):
+    ordering = ("created_at", "id")
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+    separator = "|"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        # CursorPagination.paginate_queryset with the position filter on
+        # every ordering field
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            offset, reverse, current_position = 0, False, None
+        else:
+            offset, reverse, current_position = self.cursor
+
+        if reverse:
+            queryset = queryset.order_by(
+                *[self._reversed(field) for field in self.ordering]
+            )
+        else:
+            queryset = queryset.order_by(*self.ordering)
+        if current_position is not None:
+            queryset = queryset.filter(
+                self.after(queryset.model, current_position, reverse)
+            )
+
+        results = list(queryset[offset : offset + self.page_size + 1])
+        self.page = results[: self.page_size]
+
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(
+                results[-1], self.ordering
+            )
+        else:
+            has_following_position = False
+            following_position = None
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = current_position is not None or offset > 0
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = current_position is not None or offset > 0
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    @staticmethod
+    def _reversed(field):
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+    def after(self, model, position, reverse):
+        """
+        Match the rows past ``position`` in the paging direction, e.g.
+        (created_at, id) > (c, i) as created_at >= c AND (created_at > c OR
+        (created_at = c AND id > i)) so the created_at index range is used.
+        """
+        values = position.split(self.separator)
+        if len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        condition = Q()
+        equal = Q()
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip("-")
+            try:
+                value = model._meta.get_field(name).to_python(value)
+            except ValidationError:
+                raise NotFound(self.invalid_cursor_message)
+            # Test for: (cursor reversed) XOR (field descending)
+            lookup = "lt" if reverse != field.startswith("-") else "gt"
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            if not equal:
+                leading = Q(**{f"{name}__{lookup}e": value})
+            equal &= Q(**{name: value})
+        return leading & condition
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = []
+        for field in ordering:
+            name = field.lstrip("-")
+            if isinstance(instance, dict):
+                values.append(instance[name])
+            else:
+                values.append(getattr(instance, name))
+        return self.separator.join(str(value) for value in values)
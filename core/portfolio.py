@@ -0,0 +1,158 @@
+"""
+Portfolio statistics: pets and quoted premium by province, species and
+eligibility.
+
+The ``PortfolioCounter`` rows move when ``core.estimates.refresh`` runs, from
+``manage.py refresh_estimates`` or a ``refresh_estimates`` job, and lag the
+pets until then. A new pet gets a dirty estimate row in the transaction that
+creates it, and a change to a pet, its conditions or its owner's province
+marks the pet's row dirty, ``pending`` counts those rows. Only deletes are
+subtracted right away, by ``core.deletion`` or the ``post_delete`` handler in
+``core.signals``.
+
+``PetEstimate`` is the ledger: each materialized estimate records the province
+and species it is counted under, and a refresh moves the old contribution of a
+row to the new one in the same transaction.
+
+``live_stats`` computes the same figures with a GROUP BY over the pets and
+owners, to verify the counters.
+"""
+
+from collections import defaultdict
+
+from django.db.models import Case, Count, F, FloatField, Q, Sum, Value, When
+from django.db.models.functions import Round
+from .models import MedicalCondition, Pet, PetEstimate, PortfolioCounter
+from .rates import active_rates
+
+# Fields of a PetEstimate row that make up its contribution to the counters
+LEDGER_FIELDS = ("province", "species", "eligible", "cost_of_insurance")
+
+
+class CounterDeltas:
+    """Changes to the counters, applied with one UPDATE per counter row."""
+
+    def __init__(self):
+        self.deltas = defaultdict(lambda: [0, 0.0])
+
+    def add(self, province, species, eligible, cost, pets=1):
+        """Count a pet, or uncount it with ``pets=-1``."""
+        if province is None:
+            # The row hasn't been counted yet
+            return
+        delta = self.deltas[province, species, eligible]
+        delta[0] += pets
+        if eligible and cost is not None:
+            delta[1] += pets * cost
+
+    def apply(self):
+        deltas = {key: delta for key, delta in self.deltas.items() if any(delta)}
+        if not deltas:
+            return
+        PortfolioCounter.objects.bulk_create(
+            [
+                PortfolioCounter(province=province, species=species, eligible=eligible)
+                for province, species, eligible in deltas
+            ],
+            ignore_conflicts=True,
+        )
+        for (province, species, eligible), (pets, premium) in deltas.items():
+            PortfolioCounter.objects.filter(
+                province=province, species=species, eligible=eligible
+            ).update(pets=F("pets") + pets, premium=F("premium") + premium)
+        self.deltas.clear()
+
+
+def subtract(estimates):
+    """Uncount a queryset of PetEstimate rows that are about to be deleted."""
+    deltas = CounterDeltas()
+    groups = (
+        estimates.filter(province__isnull=False)
+        .order_by()
+        .values("province", "species", "eligible")
+        .annotate(pets=Count("*"), premium=Sum("cost_of_insurance"))
+    )
+    for group in groups:
+        delta = deltas.deltas[group["province"], group["species"], group["eligible"]]
+        delta[0] -= group["pets"]
+        delta[1] -= group["premium"] or 0.0
+    deltas.apply()
+
+
+def _group(province, species, eligible, pets, premium):
+    return {
+        "province": province,
+        "species": species,
+        "eligible": eligible,
+        "pets": pets,
+        "average_premium": round(premium / pets, 2) if eligible and pets else None,
+    }
+
+
+def stats():
+    """The statistics from the counter rows."""
+    counters = (
+        PortfolioCounter.objects.filter(pets__gt=0)
+        .order_by("province", "species", "eligible")
+        .values_list("province", "species", "eligible", "pets", "premium")
+    )
+    return {
+        "groups": [_group(*counter) for counter in counters],
+        "pending": PetEstimate.objects.filter(dirty=True).count(),
+        "exact": False,
+    }
+
+
+def _cost(engine):
+    """SQL expression of an eligible pet's cost, see RulesEngine._eligible."""
+    cost_per_year = Case(
+        *[
+            When(owner__province=province, then=Value(engine.cost_per_year(province)))
+            for province in engine.province_multipliers
+        ],
+        default=Value(engine.base_cost_per_year),
+        output_field=FloatField(),
+    )
+    cost = F("age") * cost_per_year
+    # The summary columns priced like Pet.condition_counts
+    for condition, count in [
+        (MedicalCondition.CANCER, Case(When(has_cancer=True, then=1), default=0)),
+        (MedicalCondition.DIABETES, F("diabetes_count")),
+        (MedicalCondition.OTHER, F("other_condition_count")),
+    ]:
+        surcharge = engine.surcharge(condition)
+        # None vetoes the pet, which then has no cost
+        if surcharge:
+            cost = cost + count * Value(surcharge)
+    return Round(cost, 2, output_field=FloatField())
+
+
+def live_stats(engine=None):
+    """The statistics computed from the pets with the active rates."""
+    engine = engine or active_rates.engine()
+    groups = (
+        Pet.objects.with_eligibility(engine)
+        .order_by()
+        .values("owner__province", "species", "eligible")
+        .annotate(
+            pets=Count("pk"),
+            premium=Sum(
+                Case(When(Q(eligible=True), then=_cost(engine)), default=Value(0.0))
+            ),
+        )
+        .order_by("owner__province", "species", "eligible")
+    )
+    return {
+        "groups": [
+            _group(
+                group["owner__province"],
+                group["species"],
+                group["eligible"],
+                group["pets"],
+                group["premium"] or 0.0,
+            )
+            for group in groups
+        ],
+        "pending": 0,
+        "exact": True,
+    }
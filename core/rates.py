@@ -0,0 +1,105 @@
+"""
+Active underwriting rates.
+
+Rates are stored as versioned ``RateTable`` rows. The engine compiled from the
+table in effect is kept in each process and revalidated on every use against
+a stamp in the default cache, which ``core.signals`` bumps whenever a rate
+table is saved or deleted. A rate change therefore applies on the next
+estimate without a restart, and estimates don't read the rate tables.
+
+The stamp only reaches other processes through a shared cache backend, so the
+engine is also reloaded after ``max_age`` seconds, and when the next table
+scheduled with a later ``effective_from`` comes into effect.
+"""
+
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+
+from asgiref.sync import sync_to_async
+from django.core.cache import caches
+from django.utils import timezone
+
+from .underwriting import compile_rules, engine as default_engine
+
+
+@dataclass(frozen=True)
+class _Loaded:
+    engine: object
+    stamp: object
+    # time.time() after which the engine has to be reloaded
+    expires: float
+
+
+class ActiveRates:
+    STAMP_KEY = "rates:stamp"
+
+    def __init__(self, alias="default", max_age=60):
+        self.alias = alias
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._loaded = None
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def _current(self):
+        """Return the loaded engine if it is still valid, else None."""
+        loaded = self._loaded
+        if (
+            loaded is not None
+            and loaded.expires > time.time()
+            and loaded.stamp == self.cache.get(self.STAMP_KEY)
+        ):
+            return loaded.engine
+        return None
+
+    def engine(self):
+        """Return the engine of the rate table in effect."""
+        return self._current() or self._load()
+
+    async def aengine(self):
+        """Like ``engine``, only hops to a thread when the tables are read."""
+        return self._current() or await sync_to_async(self._load)()
+
+    def _load(self):
+        from .models import RateTable
+
+        with self._lock:
+            # Another thread may have reloaded while this one waited
+            current = self._current()
+            if current is not None:
+                return current
+
+            # Read the stamp first, a bump while loading forces another load
+            stamp = self.cache.get(self.STAMP_KEY)
+            now = timezone.now()
+            table = RateTable.objects.active(now).only("version", "rules").first()
+            engine = (
+                compile_rules(table.rules, table.version) if table else default_engine
+            )
+
+            expires = time.time() + self.max_age
+            upcoming = (
+                RateTable.objects.filter(effective_from__gt=now)
+                .order_by("effective_from")
+                .values_list("effective_from", flat=True)
+                .first()
+            )
+            if upcoming is not None:
+                expires = min(expires, upcoming.timestamp())
+
+            self._loaded = _Loaded(engine, stamp, expires)
+            return engine
+
+    def bump(self):
+        """Make every process reload the rates on its next estimate."""
+        self.cache.set(self.STAMP_KEY, uuid.uuid4().hex, timeout=None)
+
+    def reset(self):
+        self._loaded = None
+
+
+active_rates = ActiveRates()
@@ -0,0 +1,160 @@
+"""
+Vectorized repricing of the whole portfolio with NumPy.
+
+Pets are read in keyset batches of plain columns and every rule of the
+compiled ``RulesEngine`` is applied to whole arrays at once, so memory is
+bounded by the batch size and there is no per-pet Python loop.
+"""
+
+import copy
+
+import numpy as np
+from .models import (
+    MedicalCondition,
+    Pet,
+    Province,
+    RateTable,
+    Species,
+    risk_summary_field,
+)
+from .underwriting import DEFAULT_RULES, compile_rules
+
+COLUMNS = (
+    "id",
+    "species",
+    "age",
+    "owner__province",
+    "has_cancer",
+    "diabetes_count",
+    "other_condition_count",
+)
+
+PROVINCES = np.array(sorted(Province.values))
+SPECIES = np.array(sorted(Species.values))
+
+# Condition priced for each summary column, see Pet.condition_counts
+_SUMMARY_CONDITION = {
+    risk_summary_field(condition): condition
+    for condition in [
+        MedicalCondition.CANCER,
+        MedicalCondition.DIABETES,
+        MedicalCondition.OTHER,
+    ]
+}
+
+
+def repricing_engine(multipliers=(), base_cost=None):
+    """
+    Compile the active rate table with (province, multiplier) pairs and the
+    cost per year of age overridden. Raises ValueError for an unknown province.
+    """
+    table = RateTable.objects.active().first()
+    rules = copy.deepcopy(table.rules if table else DEFAULT_RULES)
+    province_multipliers = dict(rules["province_multipliers"])
+    for province, multiplier in multipliers:
+        if province not in Province.values:
+            raise ValueError(f"Unknown province {province}.")
+        province_multipliers[province] = multiplier
+    rules["province_multipliers"] = province_multipliers
+    if base_cost is not None:
+        rules["base_cost_per_year"] = base_cost
+    return compile_rules(rules, table.version if table else None)
+
+
+def pet_batches(batch_size, pets=None):
+    """Yield lists of ``COLUMNS`` tuples, paging on the primary key."""
+    pets = (Pet.objects.all() if pets is None else pets).order_by("pk")
+    last = None
+    while True:
+        page = pets if last is None else pets.filter(pk__gt=last)
+        rows = list(page.values_list(*COLUMNS)[:batch_size])
+        if not rows:
+            return
+        yield rows
+        last = rows[-1][0]
+
+
+def _indexes(categories, values, name):
+    """
+    Index of each value in the sorted ``categories``. Raises ValueError for a
+    value that isn't one, searchsorted alone would give it a neighbour's.
+    """
+    known = np.isin(values, categories)
+    if not known.all():
+        raise ValueError(f"Unknown {name} {values[~known][0]}.")
+    return np.searchsorted(categories, values)
+
+
+def _lookup(categories, indexes, table, default):
+    """Map each category index to ``table[category]``."""
+    column = np.array([table.get(category, default) for category in categories])
+    return column[indexes]
+
+
+def reprice(engine, rows):
+    """
+    Price a batch of ``COLUMNS`` rows. Returns the province and species
+    indexes into PROVINCES/SPECIES, the eligibility mask and the costs (NaN
+    for ineligible pets). Raises ValueError for a province or species that
+    isn't one of the models' choices.
+    """
+    _, species, age, province, has_cancer, diabetes, other = zip(*rows)
+    species = _indexes(SPECIES, np.array(species), "species")
+    province = _indexes(PROVINCES, np.array(province), "province")
+    age = np.array(age, dtype=np.int64)
+
+    max_age = _lookup(SPECIES, species, engine.max_age_by_species, -1)
+    cost_per_year = _lookup(
+        PROVINCES,
+        province,
+        {p: engine.cost_per_year(p) for p in PROVINCES},
+        engine.base_cost_per_year,
+    )
+    eligible = (max_age >= 0) & (age <= max_age)
+
+    surcharges = np.zeros(len(rows))
+    for field, counts in [
+        ("has_cancer", has_cancer),
+        ("diabetes_count", diabetes),
+        ("other_condition_count", other),
+    ]:
+        counts = np.array(counts, dtype=np.int64)
+        surcharge = engine.surcharge(_SUMMARY_CONDITION[field])
+        if surcharge is None:
+            eligible &= counts == 0
+        else:
+            surcharges += counts * surcharge
+
+    costs = np.where(eligible, np.round(age * cost_per_year + surcharges, 2), np.nan)
+    return province, species, eligible, costs
+
+
+class PortfolioSummary:
+    """Pets, eligible pets and total premium per (province, species)."""
+
+    def __init__(self):
+        shape = (len(PROVINCES), len(SPECIES))
+        self.pets = np.zeros(shape, dtype=np.int64)
+        self.eligible = np.zeros(shape, dtype=np.int64)
+        self.premium = np.zeros(shape)
+
+    def add(self, province, species, eligible, costs):
+        np.add.at(self.pets, (province, species), 1)
+        np.add.at(self.eligible, (province[eligible], species[eligible]), 1)
+        np.add.at(
+            self.premium, (province[eligible], species[eligible]), costs[eligible]
+        )
+
+    def rows(self):
+        """Yield (province, species, pets, eligible, premium, average premium)."""
+        for p, s in zip(*np.nonzero(self.pets)):
+            eligible = int(self.eligible[p, s])
+            premium = round(float(self.premium[p, s]), 2)
+            yield (
+                str(PROVINCES[p]),
+                str(SPECIES[s]),
+                int(self.pets[p, s]),
+                eligible,
+                premium,
+                round(premium / eligible, 2) if eligible else None,
+            )
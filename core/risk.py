@@ -0,0 +1,77 @@
+"""
+Maintenance of the per-pet risk summary columns (see ``RISK_SUMMARY_FIELDS``).
+
+Conditions adjust the summary of their pet, and bump its
+``conditions_revision``, with a single in-place UPDATE in the same transaction
+as the condition write, and ``rebuild_summaries`` / ``summary_mismatches``
+recompute and check them from the conditions table.
+"""
+
+from collections import Counter
+from django.db.models import Count, Exists, F, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from .models import MedicalCondition, Pet, PetMedicalCondition, risk_summary_field
+
+
+def _has_cancer():
+    return Exists(
+        PetMedicalCondition.objects.filter(
+            pet=OuterRef("pk"), condition=MedicalCondition.CANCER
+        )
+    )
+
+
+def _count(condition_filter):
+    counts = (
+        PetMedicalCondition.objects.filter(condition_filter, pet=OuterRef("pk"))
+        .order_by()
+        .values("pet")
+        .annotate(count=Count("*"))
+        .values("count")
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def _live_summary():
+    known = [MedicalCondition.CANCER, MedicalCondition.DIABETES]
+    return {
+        "has_cancer": _has_cancer(),
+        "diabetes_count": _count(Q(condition=MedicalCondition.DIABETES)),
+        "other_condition_count": _count(~Q(condition__in=known)),
+    }
+
+
+def apply_conditions(pet_id, conditions, added=True):
+    """Account for conditions added to (or removed from) a pet."""
+    counts = Counter(risk_summary_field(condition) for condition in conditions)
+    sign = 1 if added else -1
+    updates = {
+        field: F(field) + sign * count
+        for field, count in counts.items()
+        if field != "has_cancer"
+    }
+    if "has_cancer" in counts:
+        # Another cancer row may remain when one is removed
+        updates["has_cancer"] = True if added else _has_cancer()
+    if updates:
+        updates["conditions_revision"] = F("conditions_revision") + 1
+        Pet.objects.filter(pk=pet_id).update(**updates)
+
+
+def rebuild_summaries(pets=None):
+    """Recompute the summary columns from the conditions table."""
+    pets = Pet.objects.all() if pets is None else pets
+    return pets.update(
+        **_live_summary(), conditions_revision=F("conditions_revision") + 1
+    )
+
+
+def summary_mismatches(pets=None):
+    """Return the pets whose summary columns disagree with their conditions."""
+    pets = Pet.objects.all() if pets is None else pets
+    live = {f"live_{field}": value for field, value in _live_summary().items()}
+    return pets.annotate(**live).filter(
+        ~Q(has_cancer=F("live_has_cancer"))
+        | ~Q(diabetes_count=F("live_diabetes_count"))
+        | ~Q(other_condition_count=F("live_other_condition_count"))
+    )
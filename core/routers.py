@@ -0,0 +1,133 @@
+"""
+Read replica routing.
+
+``ReplicaRoutingMiddleware`` marks the requests that only read, safe methods
+and the estimate endpoints, and ``ReplicaRouter`` sends their queries to the
+``replica`` database when one is configured. Everything else, including
+writes, management commands and requests from a client that wrote less than
+``READ_YOUR_WRITES_SECONDS`` ago, uses ``default``.
+
+The replica is kept in sync by a replication step, ``manage.py sync_replica``
+for SQLite. Its lag has to stay below ``EstimateCache.invalidation_grace`` so
+an estimate read from the replica can't be cached after an invalidation.
+"""
+
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+REPLICA = "replica"
+# Estimates are computed by POST but don't write anything
+READ_ONLY_URL_NAMES = {"pet-estimate", "pet-estimate-batch", "async-pet-estimate"}
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+STICKY_COOKIE = "read_primary_until"
+
+_use_replica = ContextVar("use_replica", default=False)
+
+
+def replica_configured():
+    return REPLICA in settings.DATABASES
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if _use_replica.get() and replica_configured():
+            return REPLICA
+        return "default"
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets its schema from replication
+        return db != REPLICA
+
+
+def routed(iterator, use_replica):
+    """Iterate with the routing of the request that returned the iterator."""
+    iterator = iter(iterator)
+    while True:
+        token = _use_replica.set(use_replica)
+        try:
+            chunk = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            _use_replica.reset(token)
+        yield chunk
+
+
+class ReplicaRoutingMiddleware:
+    # Async-capable so ASGI requests aren't adapted through a thread
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not replica_configured():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        request.read_only = request.use_replica = request.writes = False
+        try:
+            response = self.get_response(request)
+        finally:
+            _use_replica.set(False)
+        return self.process_response(request, response)
+
+    async def __acall__(self, request):
+        request.read_only = request.use_replica = request.writes = False
+        try:
+            response = await self.get_response(request)
+        finally:
+            _use_replica.set(False)
+        return self.process_response(request, response)
+
+    def process_response(self, request, response):
+        if request.use_replica and response.streaming:
+            # Streamed content is produced after this middleware returns
+            response.streaming_content = routed(response.streaming_content, True)
+        # Only requests that reached a view that writes, not e.g. redirects
+        if request.writes and response.status_code < 400:
+            # Read from default until the replica has caught up with this write
+            seconds = getattr(settings, "READ_YOUR_WRITES_SECONDS", 5)
+            response.set_cookie(
+                STICKY_COOKIE,
+                str(time.time() + seconds),
+                max_age=seconds,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.read_only = (
+            request.method in SAFE_METHODS
+            or request.resolver_match.url_name in READ_ONLY_URL_NAMES
+        )
+        request.writes = not request.read_only
+        request.use_replica = request.read_only and not self.sticky(request)
+        if request.use_replica:
+            # Reset by __call__, the value is set in the request's context
+            # (under ASGI, copied back from the thread running this method)
+            _use_replica.set(True)
+        return None
+
+    @staticmethod
+    def sticky(request):
+        try:
+            return float(request.COOKIES[STICKY_COOKIE]) > time.time()
+        except (KeyError, ValueError):
+            return False
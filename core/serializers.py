@@ -1,27 +1,197 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
 from rest_framework import serializers
-from .models import PetMedicalCondition, Pet, Owner
+from .models import (
+    Job,
+    JobKind,
+    MedicalCondition,
+    PetMedicalCondition,
+    Pet,
+    Owner,
+    Province,
+)
+from .signals import bulk_created
+
+
+# Primary key field that looks related objects up in ``prefetched`` when the
+# list serializer filled it, instead of running one query per item
+class PrefetchedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    prefetched = None
+
+    def to_internal_value(self, data):
+        if self.prefetched is not None:
+            instance = self.prefetched.get(str(data))
+            if instance is not None:
+                return instance
+        return super().to_internal_value(data)
+
+
+# Used for list payloads (many=True): every item is validated first and the
+# rows are then inserted with bulk_create in batches in a single transaction
+class BulkCreateListSerializer(serializers.ListSerializer):
+    batch_size = 1000
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            for name, field in self.child.fields.items():
+                if isinstance(field, PrefetchedPrimaryKeyRelatedField):
+                    field.prefetched = self.prefetch(field, data, name)
+        return super().to_internal_value(data)
+
+    def prefetch(self, field, data, name):
+        """Load the objects referenced by ``name`` across all items, by pk."""
+        pk_field = field.get_queryset().model._meta.pk
+        pks = set()
+        for item in data:
+            try:
+                pks.add(pk_field.to_python(item[name]))
+            except (TypeError, KeyError, DjangoValidationError):
+                # Reported per item by the field itself
+                continue
+
+        pks = list(pks)
+        prefetched = {}
+        for start in range(0, len(pks), self.batch_size):
+            batch = field.get_queryset().filter(
+                pk__in=pks[start : start + self.batch_size]
+            )
+            prefetched.update((str(instance.pk), instance) for instance in batch)
+        return prefetched
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        instances = [model(**attrs) for attrs in validated_data]
+        with transaction.atomic():
+            model.objects.bulk_create(instances, batch_size=self.batch_size)
+            bulk_created.send(sender=model, instances=instances)
+        return instances
+
+
+# Fast path for read endpoints: maps the rows of
+# ``values_list(*columns, named=True)`` to the representation the serializer
+# would build from model instances, with the per-field conversion worked out
+# once per serializer class instead of per row. Only fields read from a single
+# column are supported.
+class ValuesSerializer:
+    # Fields whose representation of a column value is the value itself
+    identity_fields = (
+        serializers.BooleanField,
+        serializers.CharField,
+        serializers.ChoiceField,
+        serializers.IntegerField,
+    )
+    _compiled = {}
+
+    def __init__(self, serializer_class):
+        self.names = []
+        self.columns = []
+        # (name, function) for the fields converted from the column value,
+        # None is represented as None like Serializer.to_representation does
+        self.converters = []
+        for name, field in serializer_class().fields.items():
+            if field.write_only:
+                continue
+            if (
+                isinstance(
+                    field, (serializers.BaseSerializer, serializers.ManyRelatedField)
+                )
+                or field.source == "*"
+                or "." in field.source
+            ):
+                raise ImproperlyConfigured(
+                    f"{serializer_class.__name__}.{name} isn't read from a column."
+                )
+            self.names.append(name)
+            self.columns.append(field.source)
+            converter = self.converter(field)
+            if converter is not None:
+                self.converters.append((name, converter))
+
+    @classmethod
+    def for_serializer(cls, serializer_class):
+        try:
+            return cls._compiled[serializer_class]
+        except KeyError:
+            return cls._compiled.setdefault(serializer_class, cls(serializer_class))
+
+    def converter(self, field):
+        if type(field) in self.identity_fields:
+            return None
+        if (
+            isinstance(field, serializers.UUIDField)
+            and field.uuid_format == "hex_verbose"
+        ):
+            return str
+        if isinstance(field, serializers.PrimaryKeyRelatedField):
+            # The column holds the primary key already
+            return None if field.pk_field is None else field.pk_field.to_representation
+        if isinstance(field, serializers.RelatedField):
+            raise ImproperlyConfigured(f"{field.field_name} needs the related object.")
+        return field.to_representation
+
+    def to_representation(self, row):
+        # Rows may have trailing extra columns, e.g. for the pagination cursor
+        data = dict(zip(self.names, row))
+        for name, convert in self.converters:
+            value = data[name]
+            if value is not None:
+                data[name] = convert(value)
+        return data
 
 
 class PetMedicalConditionSerializer(serializers.ModelSerializer):
+    serializer_related_field = PrefetchedPrimaryKeyRelatedField
+
     class Meta:
         model = PetMedicalCondition
         fields = ["id", "pet", "condition"]
+        list_serializer_class = BulkCreateListSerializer
 
 
 class PetMedicalConditionCreateSerializer(serializers.Serializer):
-    condition = serializers.CharField(max_length=255)
+    condition = serializers.ChoiceField(choices=MedicalCondition.choices)
+
+
+# Request serializer for deleting several of a pet's medical conditions
+class PetMedicalConditionBulkDeleteSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.UUIDField(), required=False, max_length=1000
+    )
+    all = serializers.BooleanField(required=False)
+
+    def validate(self, attrs):
+        if ("ids" in attrs) == bool(attrs.get("all")):
+            raise serializers.ValidationError(
+                "Provide either a list of condition ids or all: true."
+            )
+        return attrs
 
 
 class PetSerializer(serializers.ModelSerializer):
+    serializer_related_field = PrefetchedPrimaryKeyRelatedField
+
     class Meta:
         model = Pet
         fields = ["id", "name", "species", "age", "owner"]
+        list_serializer_class = BulkCreateListSerializer
+
+
+# Task 3
+# Pet summary with the insurance eligibility annotated by the queryset
+class OwnerPetSerializer(serializers.ModelSerializer):
+    eligible = serializers.BooleanField(read_only=True)
+
+    class Meta:
+        model = Pet
+        fields = ["id", "name", "species", "eligible"]
 
 
 class OwnerSerializer(serializers.ModelSerializer):
     class Meta:
         model = Owner
         fields = ["id", "first_name", "last_name", "province"]
+        list_serializer_class = BulkCreateListSerializer
 
 
 # Task 2
@@ -30,3 +200,92 @@ class PetEstimateSerializer(serializers.Serializer):
     eligible = serializers.BooleanField()
     costOfInsurance = serializers.FloatField(required=False)
     reason = serializers.CharField(required=False)
+    rateVersion = serializers.IntegerField(required=False)
+
+
+# Request serializer for the batch estimate endpoint
+class PetEstimateBatchSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.UUIDField(), required=False, max_length=100_000
+    )
+    owner = serializers.UUIDField(required=False)
+    province = serializers.ChoiceField(choices=Province.choices, required=False)
+
+    def validate(self, attrs):
+        if not attrs:
+            raise serializers.ValidationError(
+                "Provide a list of pet ids or an owner/province filter."
+            )
+        return attrs
+
+
+# Parameters of the background jobs (core.jobs), a batch estimate job takes
+# the body of the batch estimate endpoint
+class RepriceParamsSerializer(serializers.Serializer):
+    multipliers = serializers.DictField(
+        child=serializers.FloatField(min_value=0), required=False
+    )
+    base_cost = serializers.FloatField(min_value=0, required=False)
+
+    def validate_multipliers(self, value):
+        unknown = set(value) - set(Province.values)
+        if unknown:
+            raise serializers.ValidationError(
+                f"Unknown provinces: {', '.join(sorted(unknown))}."
+            )
+        return value
+
+
+class ExportParamsSerializer(serializers.Serializer):
+    model = serializers.ChoiceField(choices=["owners", "pets"])
+
+
+class RefreshEstimatesParamsSerializer(serializers.Serializer):
+    batch_size = serializers.IntegerField(min_value=1, max_value=100_000, default=1000)
+
+
+JOB_PARAMS_SERIALIZERS = {
+    JobKind.ESTIMATE_BATCH: PetEstimateBatchSerializer,
+    JobKind.REPRICE: RepriceParamsSerializer,
+    JobKind.EXPORT: ExportParamsSerializer,
+    JobKind.REFRESH_ESTIMATES: RefreshEstimatesParamsSerializer,
+}
+
+
+class JobSerializer(serializers.ModelSerializer):
+    params = serializers.JSONField(required=False, default=dict)
+
+    class Meta:
+        model = Job
+        fields = [
+            "id",
+            "kind",
+            "params",
+            "status",
+            "done",
+            "total",
+            "result",
+            "error",
+            "attempts",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
+        read_only_fields = [
+            "status",
+            "done",
+            "total",
+            "result",
+            "error",
+            "attempts",
+            "started_at",
+            "finished_at",
+        ]
+
+    def validate(self, attrs):
+        params = JOB_PARAMS_SERIALIZERS[attrs["kind"]](data=attrs["params"])
+        if not params.is_valid():
+            raise serializers.ValidationError({"params": params.errors})
+        # Stored in their JSON representation, e.g. UUIDs as strings
+        attrs["params"] = params.data
+        return attrs
@@ -0,0 +1,125 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+from .cache import estimate_cache
+from .estimates import add_dirty, mark_dirty
+from . import metrics
+from .rates import active_rates
+from .risk import apply_conditions, rebuild_summaries
+from .models import Owner, Pet, PetEstimate, PetMedicalCondition, RateTable
+from .portfolio import CounterDeltas
+
+# Sent with the instances by BulkCreateListSerializer, which inserts them with
+# bulk_create and so without post_save
+bulk_created = Signal()
+
+
+def invalidate_estimates(pet_ids):
+    """
+    Drop cached estimates now and again once the transaction commits, so a
+    request reading the old rows before the commit cannot leave them cached,
+    and mark the materialized estimates dirty with the change.
+    """
+    pet_ids = list(pet_ids)
+    if not pet_ids:
+        return
+    mark_dirty(pet_ids)
+    invalidate_cached_estimates(pet_ids)
+
+
+def invalidate_cached_estimates(pet_ids):
+    """The cache part of ``invalidate_estimates``, e.g. for deleted pets."""
+
+    def invalidate():
+        estimate_cache.invalidate(pet_ids, active_rates.engine().version)
+
+    invalidate()
+    transaction.on_commit(invalidate)
+
+
+@receiver(post_save, sender=Pet)
+@receiver(post_delete, sender=Pet)
+def pet_changed(sender, instance, created=False, **kwargs):
+    if created:
+        # Pending in the portfolio stats from now on
+        add_dirty([instance.pk])
+    else:
+        invalidate_estimates([instance.pk])
+
+
+@receiver(bulk_created, sender=Pet)
+def pets_bulk_created(sender, instances, **kwargs):
+    add_dirty([pet.pk for pet in instances])
+
+
+@receiver(post_delete, sender=PetEstimate)
+def estimate_deleted(sender, instance, **kwargs):
+    # Uncount the row from the portfolio counters
+    deltas = CounterDeltas()
+    deltas.add(
+        instance.province,
+        instance.species,
+        instance.eligible,
+        instance.cost_of_insurance,
+        pets=-1,
+    )
+    deltas.apply()
+
+
+@receiver(post_save, sender=PetMedicalCondition)
+def medical_condition_saved(sender, instance, created, **kwargs):
+    if created:
+        apply_conditions(instance.pet_id, [instance.condition])
+    else:
+        # The previous condition is unknown, recount the pet
+        rebuild_summaries(Pet.objects.filter(pk=instance.pet_id))
+    invalidate_estimates([instance.pet_id])
+
+
+@receiver(post_delete, sender=PetMedicalCondition)
+def medical_condition_deleted(sender, instance, **kwargs):
+    apply_conditions(instance.pet_id, [instance.condition], added=False)
+    invalidate_estimates([instance.pet_id])
+
+
+def medical_conditions_bulk_created(pet, medical_conditions):
+    """Side effects of post_save for conditions inserted with bulk_create."""
+    apply_conditions(pet.pk, [item.condition for item in medical_conditions])
+    invalidate_estimates([pet.pk])
+
+
+@receiver(post_save, sender=Owner)
+def owner_changed(sender, instance, created, **kwargs):
+    # Only the province affects estimates
+    if not created and instance.province_changed:
+        invalidate_estimates(
+            Pet.objects.filter(owner=instance).values_list("id", flat=True)
+        )
+    instance._loaded_province = instance.province
+
+
+@receiver(post_save, sender=RateTable)
+@receiver(post_delete, sender=RateTable)
+def rate_table_changed(sender, instance, **kwargs):
+    # Cached estimates are keyed by rate version and need no invalidation,
+    # only the active engine has to be reloaded once the change is visible
+    transaction.on_commit(active_rates.bump)
+
+
+@receiver(connection_created)
+def record_queries(sender, connection, **kwargs):
+    # A no-op unless a request is being measured by RequestMetricsMiddleware
+    metrics.install(connection)
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    if connection.vendor != "sqlite":
+        return
+    pragmas = getattr(settings, "SQLITE_PRAGMAS", {})
+    if pragmas:
+        with connection.cursor() as cursor:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
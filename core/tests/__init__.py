@@ -1,3 +1,26 @@
 from .base import OwnerTests, PetTests
 from .task_1 import PetMedicalConditionTests
 from .task_2 import PetEstimateTests
+from .underwriting import RulesEngineTests, PetEstimateEngineTests
+from .estimate_batch import PetEstimateBatchTests
+from .task_3 import OwnerPetListTests
+from .pagination import CursorPaginationTests
+from .export import ExportTests
+from .cache import EstimateCacheTests
+from .bulk_create import BulkCreateTests
+from .risk_summary import PetRiskSummaryTests
+from .query_plans import QueryPlanTests
+from .async_views import AsyncViewTests
+from .repricing import RepricePortfolioTests
+from .rates import RateTableTests
+from .materialized import PetEstimateMaterializationTests
+from .metrics import RequestMetricsTests
+from .sqlite import SQLitePragmaTests
+from .routers import ReplicaRoutingTests, SyncReplicaTests
+from .values_serializer import ValuesSerializerTests
+from .renderers import FastJSONRendererTests, RendererParityTests
+from .conditional import ConditionalRequestTests
+from .idempotency import IdempotencyTests
+from .deletion import DeletionTests
+from .portfolio import PortfolioStatsTests
+from .jobs import JobTests
@@ -0,0 +1,133 @@
+from django.test import AsyncClient, TestCase
+from rest_framework.test import APIClient
+from django.urls import reverse
+from ..models import Pet, PetMedicalCondition, Owner, MedicalCondition, Species
+import uuid
+
+
+class AsyncViewTests(TestCase):
+    def setUp(self):
+        self.async_client = AsyncClient()
+        self.client = APIClient()
+        self.owner = Owner.objects.create(
+            first_name="John", last_name="Smith", province="ON"
+        )
+        self.pet = Pet.objects.create(
+            name="Rocky", species=Species.DOG, age=4, owner=self.owner
+        )
+        PetMedicalCondition.objects.create(
+            pet=self.pet, condition=MedicalCondition.DIABETES
+        )
+
+    async def test_retrieve_pet_matches_sync_view(self):
+        # Act
+        response = await self.async_client.get(
+            reverse("async-pet-retrieve", kwargs={"pk": self.pet.id})
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {
+                "id": str(self.pet.id),
+                "name": "Rocky",
+                "species": "DOG",
+                "age": 4,
+                "owner": str(self.owner.id),
+            },
+        )
+
+    async def test_list_medical_conditions(self):
+        # Act
+        response = await self.async_client.get(
+            reverse("async-pet-medical-condition-list", kwargs={"pk": self.pet.id})
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [row["condition"] for row in response.json()["results"]], ["DIABETES"]
+        )
+
+    async def test_estimate(self):
+        # Act
+        response = await self.async_client.post(
+            reverse("async-pet-estimate", kwargs={"pk": self.pet.id})
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {"eligible": True, "costOfInsurance": 20.0, "rateVersion": 1},
+        )
+
+    async def test_not_found(self):
+        # Act
+        responses = [
+            await self.async_client.get(
+                reverse("async-pet-retrieve", kwargs={"pk": uuid.uuid4()})
+            ),
+            await self.async_client.get(
+                reverse("async-pet-medical-condition-list", kwargs={"pk": uuid.uuid4()})
+            ),
+            await self.async_client.post(
+                reverse("async-pet-estimate", kwargs={"pk": uuid.uuid4()})
+            ),
+        ]
+
+        # Assert
+        self.assertEqual([r.status_code for r in responses], [404, 404, 404])
+
+    def test_responses_match_sync_views(self):
+        # Act
+        sync_estimate = self.client.post(
+            reverse("pet-estimate", kwargs={"pk": self.pet.id})
+        ).json()
+        sync_pet = self.client.get(
+            reverse("pet-retrieve-update-destroy", kwargs={"pk": self.pet.id})
+        ).json()
+        async_estimate = self.client.post(
+            reverse("async-pet-estimate", kwargs={"pk": self.pet.id})
+        ).json()
+        async_pet = self.client.get(
+            reverse("async-pet-retrieve", kwargs={"pk": self.pet.id})
+        ).json()
+        sync_conditions = self.client.get(
+            reverse("pet-medical-condition-list-create", kwargs={"pk": self.pet.id})
+        ).json()
+        async_conditions = self.client.get(
+            reverse("async-pet-medical-condition-list", kwargs={"pk": self.pet.id})
+        ).json()
+
+        # Assert
+        self.assertEqual(sync_estimate, async_estimate)
+        self.assertEqual(sync_pet, async_pet)
+        self.assertEqual(sync_conditions, async_conditions)
+
+    def test_not_found_matches_sync_views(self):
+        # Arrange
+        pk = uuid.uuid4()
+
+        for sync_name, async_name, method in [
+            ("pet-retrieve-update-destroy", "async-pet-retrieve", "get"),
+            (
+                "pet-medical-condition-list-create",
+                "async-pet-medical-condition-list",
+                "get",
+            ),
+            ("pet-estimate", "async-pet-estimate", "post"),
+        ]:
+            with self.subTest(async_name):
+                # Act
+                request = getattr(self.client, method)
+                sync_response = request(reverse(sync_name, kwargs={"pk": pk}))
+                async_response = request(reverse(async_name, kwargs={"pk": pk}))
+
+                # Assert
+                self.assertEqual(async_response.status_code, 404)
+                self.assertEqual(
+                    async_response.content and async_response.json(),
+                    sync_response.content and sync_response.json(),
+                )
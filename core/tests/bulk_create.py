@@ -0,0 +1,200 @@
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+from django.urls import reverse
+from ..models import Pet, PetMedicalCondition, Owner, MedicalCondition, Species
+
+
+class BulkCreateTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.owner = Owner.objects.create(
+            first_name="John", last_name="Smith", province="ON"
+        )
+
+    def test_bulk_create_owners(self):
+        # Arrange
+        payload = [
+            {"first_name": f"First {i}", "last_name": "Doe", "province": "BC"}
+            for i in range(25)
+        ]
+
+        # Act
+        response = self.client.post(
+            reverse("owner-list-create"), payload, format="json"
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 25)
+        self.assertEqual(Owner.objects.filter(last_name="Doe").count(), 25)
+        self.assertTrue(Owner.objects.filter(id=response.data[0]["id"]).exists())
+
+    def test_bulk_create_reports_errors_per_item(self):
+        # Arrange
+        payload = [
+            {"first_name": "Alex", "last_name": "Doe", "province": "ON"},
+            {"first_name": "Sam", "last_name": "Doe", "province": "XX"},
+            {"first_name": "Kim", "province": "QC"},
+        ]
+
+        # Act
+        response = self.client.post(
+            reverse("owner-list-create"), payload, format="json"
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn("province", response.data[1])
+        self.assertIn("last_name", response.data[2])
+        self.assertFalse(Owner.objects.filter(last_name="Doe").exists())
+
+    def test_bulk_create_pets(self):
+        # Arrange
+        payload = [
+            {
+                "name": f"Pet {i}",
+                "species": Species.DOG,
+                "age": 2,
+                "owner": self.owner.id,
+            }
+            for i in range(10)
+        ]
+
+        # Act
+        response = self.client.post(reverse("pet-list-create"), payload, format="json")
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Pet.objects.filter(owner=self.owner).count(), 10)
+
+    def test_bulk_create_medical_conditions(self):
+        # Arrange
+        pet = Pet.objects.create(
+            name="Rocky", species=Species.DOG, age=4, owner=self.owner
+        )
+        url = reverse("pet-medical-condition-list-create", kwargs={"pk": pet.id})
+        estimate_url = reverse("pet-estimate", kwargs={"pk": pet.id})
+        self.client.post(estimate_url)
+
+        # Act
+        response = self.client.post(
+            url,
+            [
+                {"condition": MedicalCondition.DIABETES},
+                {"condition": MedicalCondition.OTHER},
+            ],
+            format="json",
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            sorted(row["condition"] for row in response.data), ["DIABETES", "OTHER"]
+        )
+        self.assertEqual(PetMedicalCondition.objects.filter(pet=pet).count(), 2)
+        # Bulk inserts skip signals, the cached estimate must still be dropped
+        self.assertEqual(
+            self.client.post(estimate_url).data,
+            {"eligible": True, "costOfInsurance": 25.0, "rateVersion": 1},
+        )
+
+    def test_bulk_create_medical_conditions_invalid_item(self):
+        # Arrange
+        pet = Pet.objects.create(
+            name="Rocky", species=Species.DOG, age=4, owner=self.owner
+        )
+
+        # Act
+        response = self.client.post(
+            reverse("pet-medical-condition-list-create", kwargs={"pk": pet.id}),
+            [{"condition": MedicalCondition.DIABETES}, {"condition": "FLU"}],
+            format="json",
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn("condition", response.data[1])
+        self.assertFalse(PetMedicalCondition.objects.filter(pet=pet).exists())
+
+    def test_bulk_create_pets_resolves_owners_in_one_query(self):
+        # Arrange
+        other_owner = Owner.objects.create(
+            first_name="Jane", last_name="Doe", province="BC"
+        )
+        payload = [
+            {
+                "name": f"Pet {i}",
+                "species": Species.CAT,
+                "age": 1,
+                "owner": str((self.owner if i % 2 else other_owner).id),
+            }
+            for i in range(20)
+        ]
+
+        # Act
+        # Owner lookup, savepoint, insert of the pets and of their estimate
+        # rows, savepoint release
+        with self.assertNumQueries(5):
+            response = self.client.post(
+                reverse("pet-list-create"), payload, format="json"
+            )
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Pet.objects.filter(owner=other_owner).count(), 10)
+
+    def test_bulk_create_pets_unknown_owner(self):
+        # Arrange
+        payload = [
+            {"name": "Rex", "species": Species.DOG, "age": 2, "owner": self.owner.id},
+            {"name": "Max", "species": Species.DOG, "age": 2, "owner": "not-a-uuid"},
+            {
+                "name": "Fido",
+                "species": Species.DOG,
+                "age": 2,
+                "owner": "00000000-0000-0000-0000-000000000000",
+            },
+        ]
+
+        # Act
+        response = self.client.post(reverse("pet-list-create"), payload, format="json")
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn("owner", response.data[1])
+        self.assertIn("owner", response.data[2])
+        self.assertFalse(Pet.objects.exists())
+
+    def test_create_duplicate_medical_conditions(self):
+        # Arrange
+        pet = Pet.objects.create(
+            name="Rocky", species=Species.DOG, age=4, owner=self.owner
+        )
+        url = reverse("pet-medical-condition-list-create", kwargs={"pk": pet.id})
+        existing = self.client.post(url, {"condition": MedicalCondition.DIABETES})
+
+        # Act
+        single = self.client.post(url, {"condition": MedicalCondition.DIABETES})
+        many = self.client.post(
+            url,
+            [
+                {"condition": MedicalCondition.OTHER},
+                {"condition": MedicalCondition.OTHER},
+                {"condition": MedicalCondition.DIABETES},
+            ],
+            format="json",
+        )
+
+        # Assert
+        self.assertEqual(single.status_code, status.HTTP_200_OK)
+        self.assertEqual(single.data, existing.data)
+        self.assertEqual(many.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(many.data[0], many.data[1])
+        self.assertEqual(many.data[2], existing.data)
+        self.assertEqual(PetMedicalCondition.objects.filter(pet=pet).count(), 2)
+        pet.refresh_from_db()
+        self.assertEqual((pet.diabetes_count, pet.other_condition_count), (1, 1))
@@ -0,0 +1,194 @@
+from django.db import connection
+from django.db.models import F
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from django.urls import reverse
+from ..cache import EstimateCache, estimate_cache
+from ..models import (
+    MedicalCondition,
+    Owner,
+    Pet,
+    PetEstimate,
+    PetMedicalCondition,
+    Species,
+)
+
+
+class EstimateCacheTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.owner = Owner.objects.create(
+            first_name="John", last_name="Smith", province="ON"
+        )
+        self.pet = Pet.objects.create(
+            name="Buddy", species=Species.DOG, age=3, owner=self.owner
+        )
+
+    def estimate(self, pet=None):
+        pet = pet or self.pet
+        return self.client.post(reverse("pet-estimate", kwargs={"pk": pet.id})).data
+
+    def test_estimate_is_served_from_cache(self):
+        # Arrange
+        self.estimate()
+
+        # Act
+        # Only the revisions the local cache's entry is checked against
+        with CaptureQueriesContext(connection) as queries:
+            data = self.estimate()
+
+        # Assert
+        self.assertEqual(
+            data, {"eligible": True, "costOfInsurance": 9.0, "rateVersion": 1}
+        )
+        self.assertEqual(len(queries), 1)
+        self.assertIn('"revision"', queries[0]["sql"])
+        self.assertNotIn(PetEstimate._meta.db_table, queries[0]["sql"])
+
+    def test_change_made_by_another_process_is_not_served(self):
+        # Arrange
+        self.estimate()
+
+        # Act
+        # Saved by another process, whose invalidation doesn't reach this cache
+        Pet.objects.filter(id=self.pet.id).update(age=4, revision=F("revision") + 1)
+
+        # Assert
+        self.assertEqual(
+            self.estimate(),
+            {"eligible": True, "costOfInsurance": 12.0, "rateVersion": 1},
+        )
+
+    def test_pet_update_invalidates(self):
+        # Arrange
+        self.estimate()
+
+        # Act
+        self.pet.age = 4
+        self.pet.save()
+
+        # Assert
+        self.assertEqual(
+            self.estimate(),
+            {"eligible": True, "costOfInsurance": 12.0, "rateVersion": 1},
+        )
+
+    def test_medical_condition_changes_invalidate(self):
+        # Arrange
+        self.estimate()
+
+        # Act / Assert
+        condition = PetMedicalCondition.objects.create(
+            pet=self.pet, condition=MedicalCondition.CANCER
+        )
+        self.assertEqual(
+            self.estimate(), {"eligible": False, "reason": "HEALTH", "rateVersion": 1}
+        )
+        condition.delete()
+        self.assertEqual(
+            self.estimate(),
+            {"eligible": True, "costOfInsurance": 9.0, "rateVersion": 1},
+        )
+
+    def test_owner_province_change_invalidates_all_pets(self):
+        # Arrange
+        other_pet = Pet.objects.create(
+            name="Rex", species=Species.DOG, age=2, owner=self.owner
+        )
+        self.estimate()
+        self.estimate(other_pet)
+
+        # Act
+        owner = Owner.objects.get(id=self.owner.id)
+        owner.province = "BC"
+        owner.save()
+
+        # Assert
+        self.assertEqual(
+            self.estimate(),
+            {"eligible": True, "costOfInsurance": 7.5, "rateVersion": 1},
+        )
+        self.assertEqual(
+            self.estimate(other_pet),
+            {"eligible": True, "costOfInsurance": 5.0, "rateVersion": 1},
+        )
+
+    def test_owner_save_without_province_change_keeps_cache(self):
+        # Arrange
+        self.estimate()
+        owner = Owner.objects.get(id=self.owner.id)
+
+        # Act
+        owner.first_name = "Johnny"
+        with self.assertNumQueries(1):
+            owner.save()
+
+        # Assert
+        # Not invalidated, though a local cache's revisions check turns it away
+        self.assertIsNotNone(estimate_cache.get(self.pet.id, 1))
+
+    def test_invalidated_during_computation_is_not_cached(self):
+        # Arrange
+        # A request misses and reads the pet before a concurrent update...
+        self.assertIsNone(estimate_cache.get(self.pet.id, 1))
+        stale = {"eligible": True, "costOfInsurance": 9.0, "rateVersion": 1}
+
+        # Act
+        # ...which invalidates before the first request stores its result
+        self.pet.age = 5
+        self.pet.save()
+        estimate_cache.add(self.pet.id, 1, stale)
+
+        # Assert
+        self.assertIsNone(estimate_cache.get(self.pet.id, 1))
+        self.assertEqual(
+            self.estimate(),
+            {"eligible": True, "costOfInsurance": 15.0, "rateVersion": 1},
+        )
+
+    def test_invalidates_again_on_commit(self):
+        # Act
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            self.pet.age = 6
+            self.pet.save()
+
+        # Assert
+        self.assertEqual(len(callbacks), 1)
+
+    @override_settings(
+        CACHES={
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+            "small": {
+                "BACKEND": "core.cache.CountingLocMemCache",
+                "LOCATION": "small-estimates",
+                "OPTIONS": {"MAX_ENTRIES": 2, "CULL_FREQUENCY": 2},
+            },
+        }
+    )
+    def test_stats(self):
+        # Arrange
+        cache = EstimateCache("small")
+
+        # Act
+        for i in range(3):
+            cache.add(i, 1, {"eligible": False, "reason": "SPECIES", "rateVersion": 1})
+        cache.get(2, 1)
+        cache.get(0, 1)
+
+        # Assert
+        stats = cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hit_ratio"], 0.5)
+        self.assertEqual(stats["evictions"], 1)
+        self.assertEqual(stats["entries"], 2)
+
+    def test_stats_endpoint(self):
+        # Act
+        response = self.client.get(reverse("estimate-cache-stats"))
+
+        # Assert
+        self.assertEqual(
+            set(response.data), {"hits", "misses", "hit_ratio", "evictions", "entries"}
+        )
@@ -0,0 +1,144 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from ..cache import estimate_cache
+from ..models import MedicalCondition, Owner, Pet, PetMedicalCondition, RateTable
+from ..models import Species
+from ..rates import active_rates
+from ..underwriting import DEFAULT_RULES
+
+
+class ConditionalRequestTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.owner = Owner.objects.create(
+            first_name="John", last_name="Smith", province="ON"
+        )
+        self.pet = Pet.objects.create(
+            name="Buddy", species=Species.DOG, age=3, owner=self.owner
+        )
+        self.pet_url = reverse(
+            "pet-retrieve-update-destroy", kwargs={"pk": self.pet.id}
+        )
+        self.owner_url = reverse(
+            "owner-retrieve-update-destroy", kwargs={"pk": self.owner.id}
+        )
+        self.estimate_url = reverse("pet-estimate", kwargs={"pk": self.pet.id})
+        self.addCleanup(active_rates.reset)
+        # Estimates cached by another test would skip the queries counted here
+        estimate_cache.cache.clear()
+        active_rates.engine()
+
+    def test_save_bumps_revision(self):
+        # Act
+        self.pet.name = "Rex"
+        self.pet.save()
+        self.pet.save(update_fields=["name"])
+        self.owner.save()
+
+        # Assert
+        self.assertEqual(self.pet.revision, 3)
+        self.assertEqual(self.owner.revision, 2)
+
+    def test_pet_not_modified(self):
+        # Arrange
+        etag = self.client.get(self.pet_url)["ETag"]
+
+        # Act
+        with self.assertNumQueries(1):
+            response = self.client.get(self.pet_url, HTTP_IF_NONE_MATCH=etag)
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+    def test_pet_update_changes_etag(self):
+        # Arrange
+        etag = self.client.get(self.pet_url)["ETag"]
+
+        # Act
+        self.client.patch(self.pet_url, {"age": 4}, format="json")
+        response = self.client.get(self.pet_url, HTTP_IF_NONE_MATCH=etag)
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.data["age"], 4)
+
+    def test_owner_not_modified(self):
+        # Arrange
+        etag = self.client.get(self.owner_url)["ETag"]
+
+        # Act
+        not_modified = self.client.get(
+            self.owner_url, HTTP_IF_NONE_MATCH=f'"0", W/{etag}'
+        )
+        self.client.patch(self.owner_url, {"last_name": "Doe"}, format="json")
+        modified = self.client.get(self.owner_url, HTTP_IF_NONE_MATCH=etag)
+
+        # Assert
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(modified.status_code, status.HTTP_200_OK)
+
+    def test_missing_object(self):
+        # Act
+        response = self.client.get(
+            reverse("pet-retrieve-update-destroy", kwargs={"pk": self.owner.id}),
+            HTTP_IF_NONE_MATCH="*",
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_estimate_not_modified(self):
+        # Arrange
+        etag = self.client.post(self.estimate_url)["ETag"]
+        estimate_cache.cache.clear()
+
+        # Act
+        with self.assertNumQueries(1):
+            uncached = self.client.post(self.estimate_url, HTTP_IF_NONE_MATCH=etag)
+        self.client.post(self.estimate_url)
+        # The cached entry checked against the revisions
+        with self.assertNumQueries(1):
+            cached = self.client.post(self.estimate_url, HTTP_IF_NONE_MATCH=etag)
+
+        # Assert
+        self.assertEqual(uncached.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(cached["ETag"], etag)
+
+    def test_estimate_etag_covers_inputs(self):
+        # Arrange
+        etags = [self.client.post(self.estimate_url)["ETag"]]
+
+        # Act
+        PetMedicalCondition.objects.create(
+            pet=self.pet, condition=MedicalCondition.DIABETES
+        )
+        etags.append(self.client.post(self.estimate_url)["ETag"])
+        self.owner.province = "QC"
+        self.owner.save()
+        etags.append(self.client.post(self.estimate_url)["ETag"])
+        with self.captureOnCommitCallbacks(execute=True):
+            RateTable.objects.create(version=2, rules=DEFAULT_RULES)
+        response = self.client.post(self.estimate_url, HTTP_IF_NONE_MATCH=etags[-1])
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etags.append(response["ETag"])
+        self.assertEqual(len(set(etags)), 4)
+
+    async def test_async_estimate_not_modified(self):
+        # Arrange
+        url = reverse("async-pet-estimate", kwargs={"pk": self.pet.id})
+        etag = (await self.async_client.post(url))["ETag"]
+
+        # Act
+        response = await self.async_client.post(url, headers={"If-None-Match": etag})
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
@@ -0,0 +1,186 @@
+from django.db import connection
+from django.db.models.signals import post_delete
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from ..deletion import fast_deletes
+from ..estimates import refresh
+from ..models import (
+    MedicalCondition,
+    Owner,
+    Pet,
+    PetEstimate,
+    PetMedicalCondition,
+    Species,
+)
+from ..rates import active_rates
+
+
+class DeletionTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.owner = Owner.objects.create(
+            first_name="John", last_name="Smith", province="ON"
+        )
+        self.pet = self.create_pet(self.owner)
+        self.other_owner = Owner.objects.create(
+            first_name="Jane", last_name="Doe", province="BC"
+        )
+        self.other_pet = self.create_pet(self.other_owner)
+        self.addCleanup(active_rates.reset)
+        active_rates.engine()
+
+    def create_pet(self, owner):
+        pet = Pet.objects.create(name="Buddy", species=Species.DOG, age=3, owner=owner)
+        for condition in (MedicalCondition.DIABETES, MedicalCondition.OTHER):
+            PetMedicalCondition.objects.create(pet=pet, condition=condition)
+        return pet
+
+    def estimate(self, pet):
+        return self.client.post(reverse("pet-estimate", kwargs={"pk": pet.id}))
+
+    def delete_conditions(self, pet, body):
+        return self.client.delete(
+            reverse("pet-medical-condition-list-create", kwargs={"pk": pet.id}),
+            body,
+            format="json",
+        )
+
+    def test_delete_conditions_by_id(self):
+        # Arrange
+        diabetes = PetMedicalCondition.objects.get(
+            pet=self.pet, condition=MedicalCondition.DIABETES
+        )
+        other_pets = PetMedicalCondition.objects.filter(pet=self.other_pet)
+        before = self.estimate(self.pet).data
+
+        # Act
+        response = self.delete_conditions(
+            self.pet, {"ids": [diabetes.id, *other_pets.values_list("id", flat=True)]}
+        )
+
+        # Assert
+        self.assertEqual(response.data, {"deleted": 1})
+        self.assertEqual(other_pets.count(), 2)
+        self.pet.refresh_from_db()
+        self.assertEqual(
+            (self.pet.diabetes_count, self.pet.other_condition_count), (0, 1)
+        )
+        self.assertNotEqual(self.estimate(self.pet).data, before)
+
+    def test_delete_all_conditions(self):
+        # Act
+        response = self.delete_conditions(self.pet, {"all": True})
+
+        # Assert
+        self.assertEqual(response.data, {"deleted": 2})
+        self.assertFalse(PetMedicalCondition.objects.filter(pet=self.pet).exists())
+        self.pet.refresh_from_db()
+        self.assertEqual(
+            (self.pet.diabetes_count, self.pet.other_condition_count), (0, 0)
+        )
+
+    def test_delete_conditions_requires_a_selection(self):
+        for body in ({}, {"all": True, "ids": []}, {"all": False}):
+            with self.subTest(body=body):
+                response = self.delete_conditions(self.pet, body)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(PetMedicalCondition.objects.filter(pet=self.pet).count(), 2)
+
+    def owner_deletion_queries(self, pets):
+        owner = Owner.objects.create(first_name="Many", last_name="Pets", province="ON")
+        for _ in range(pets):
+            self.create_pet(owner)
+        refresh()
+        url = reverse("owner-retrieve-update-destroy", kwargs={"pk": owner.id})
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.delete(url)
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Pet.objects.filter(owner=owner).exists())
+        return len(queries)
+
+    def test_delete_owner(self):
+        # Arrange
+        refresh()
+        self.estimate(self.pet)
+
+        # Act
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(
+                reverse("owner-retrieve-update-destroy", kwargs={"pk": self.owner.id})
+            )
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Owner.objects.filter(pk=self.owner.pk).exists())
+        self.assertFalse(Pet.objects.filter(pk=self.pet.pk).exists())
+        self.assertFalse(PetMedicalCondition.objects.filter(pet=self.pet.pk).exists())
+        self.assertFalse(PetEstimate.objects.filter(pet=self.pet.pk).exists())
+        self.assertEqual(self.estimate(self.pet).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(
+            PetMedicalCondition.objects.filter(pet=self.other_pet).count(), 2
+        )
+        self.assertTrue(PetEstimate.objects.filter(pet=self.other_pet).exists())
+
+    def test_delete_owner_queries_do_not_grow_with_pets(self):
+        self.assertEqual(
+            self.owner_deletion_queries(2), self.owner_deletion_queries(20)
+        )
+
+    def test_delete_pet(self):
+        # Arrange
+        refresh()
+        self.estimate(self.pet)
+
+        # Act
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(
+                reverse("pet-retrieve-update-destroy", kwargs={"pk": self.pet.id})
+            )
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(PetMedicalCondition.objects.filter(pet=self.pet.pk).exists())
+        self.assertFalse(PetEstimate.objects.filter(pet=self.pet.pk).exists())
+        self.assertEqual(self.estimate(self.pet).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_other_receivers_get_signal_deletes(self):
+        # Arrange
+        deleted = []
+
+        def receiver(sender, instance, **kwargs):
+            deleted.append(instance.pk)
+
+        post_delete.connect(receiver, sender=PetEstimate)
+        self.addCleanup(post_delete.disconnect, receiver, sender=PetEstimate)
+        refresh()
+
+        # Act
+        conditions = self.delete_conditions(self.pet, {"all": True})
+        owner = self.client.delete(
+            reverse("owner-retrieve-update-destroy", kwargs={"pk": self.other_owner.id})
+        )
+
+        # Assert
+        self.assertEqual(conditions.data, {"deleted": 2})
+        self.assertEqual(owner.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Pet.objects.filter(pk=self.other_pet.pk).exists())
+        self.assertEqual(deleted, [self.other_pet.pk])
+
+    def test_fast_deletes(self):
+        # Arrange
+        def receiver(sender, **kwargs):
+            pass
+
+        # Act / Assert
+        for model in (Owner, Pet, PetMedicalCondition):
+            self.assertTrue(fast_deletes(model))
+        post_delete.connect(receiver, sender=PetEstimate)
+        self.addCleanup(post_delete.disconnect, receiver, sender=PetEstimate)
+        self.assertFalse(fast_deletes(Owner))
+        self.assertFalse(fast_deletes(Pet))
+        self.assertTrue(fast_deletes(PetMedicalCondition))
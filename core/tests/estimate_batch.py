@@ -0,0 +1,142 @@
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+from django.urls import reverse
+from ..models import Pet, PetMedicalCondition, Owner, MedicalCondition, Species
+from ..views import PetEstimateBatchView
+from unittest import mock
+import json
+import uuid
+
+
+class PetEstimateBatchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.ontario_owner = Owner.objects.create(
+            first_name="John", last_name="Smith", province="ON"
+        )
+        self.bc_owner = Owner.objects.create(
+            first_name="Jane", last_name="Doe", province="BC"
+        )
+        self.dog = Pet.objects.create(
+            name="Buddy", species=Species.DOG, age=3, owner=self.ontario_owner
+        )
+        self.cat = Pet.objects.create(
+            name="Mittens", species=Species.CAT, age=6, owner=self.bc_owner
+        )
+        PetMedicalCondition.objects.create(
+            pet=self.cat, condition=MedicalCondition.CANCER
+        )
+        self.bird = Pet.objects.create(
+            name="Tweety", species=Species.BIRD, age=2, owner=self.bc_owner
+        )
+
+    def post_batch(self, data):
+        response = self.client.post(reverse("pet-estimate-batch"), data, format="json")
+        if response.status_code != status.HTTP_200_OK:
+            return response, None
+        return response, json.loads(b"".join(response.streaming_content))
+
+    def test_batch_by_ids(self):
+        # Arrange
+        missing_id = uuid.uuid4()
+
+        # Act
+        response, data = self.post_batch(
+            {"ids": [str(self.dog.id), str(self.cat.id), str(missing_id)]}
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            data,
+            {
+                str(self.dog.id): {
+                    "eligible": True,
+                    "costOfInsurance": 9.0,
+                    "rateVersion": 1,
+                },
+                str(self.cat.id): {
+                    "eligible": False,
+                    "reason": "HEALTH",
+                    "rateVersion": 1,
+                },
+                str(missing_id): None,
+            },
+        )
+
+    def test_batch_by_filters(self):
+        # Act
+        _, by_owner = self.post_batch({"owner": str(self.ontario_owner.id)})
+        _, by_province = self.post_batch({"province": "BC"})
+
+        # Assert
+        self.assertEqual(list(by_owner), [str(self.dog.id)])
+        self.assertEqual(
+            by_province,
+            {
+                str(self.cat.id): {
+                    "eligible": False,
+                    "reason": "HEALTH",
+                    "rateVersion": 1,
+                },
+                str(self.bird.id): {
+                    "eligible": False,
+                    "reason": "SPECIES",
+                    "rateVersion": 1,
+                },
+            },
+        )
+
+    def test_batch_query_count_is_constant(self):
+        # Arrange
+        pets = [
+            Pet.objects.create(
+                name=f"Pet {i}", species=Species.DOG, age=i % 8, owner=self.bc_owner
+            )
+            for i in range(50)
+        ]
+
+        # Act / Assert
+        for count in (1, 50):
+            with self.assertNumQueries(1):
+                _, data = self.post_batch({"ids": [str(p.id) for p in pets[:count]]})
+            self.assertEqual(len(data), count)
+
+    def test_batch_streams_in_chunks(self):
+        # Arrange
+        ids = [str(uuid.uuid4()) for _ in range(5)]
+
+        # Act
+        with mock.patch.object(PetEstimateBatchView, "chunk_size", 2):
+            response = self.client.post(
+                reverse("pet-estimate-batch"), {"ids": ids}, format="json"
+            )
+            chunks = list(response.streaming_content)
+
+        # Assert
+        # Opening brace, three chunks and the closing brace
+        self.assertEqual(len(chunks), 5)
+        self.assertEqual(json.loads(b"".join(chunks)), dict.fromkeys(ids))
+
+    def test_batch_lists_repeated_ids_once(self):
+        # Arrange
+        ids = [str(self.dog.id), str(self.cat.id), str(self.dog.id)]
+
+        # Act
+        with mock.patch.object(PetEstimateBatchView, "chunk_size", 2):
+            response = self.client.post(
+                reverse("pet-estimate-batch"), {"ids": ids}, format="json"
+            )
+            content = b"".join(response.streaming_content).decode()
+
+        # Assert
+        self.assertEqual(content.count(str(self.dog.id)), 1)
+        self.assertEqual(list(json.loads(content)), ids[:2])
+
+    def test_batch_requires_ids_or_filter(self):
+        # Act
+        response, _ = self.post_batch({})
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,66 @@
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+from django.urls import reverse
+from ..models import Pet, Owner, Species
+from ..views import PetExportView
+from unittest import mock
+import json
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.owner = Owner.objects.create(
+            first_name="John", last_name="Smith", province="ON"
+        )
+
+    def read_ndjson(self, response):
+        content = b"".join(response.streaming_content).decode()
+        self.assertTrue(content == "" or content.endswith("\n"))
+        return [json.loads(line) for line in content.splitlines()]
+
+    def test_export_owners(self):
+        # Act
+        response = self.client.get(reverse("owner-export"))
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertEqual(
+            self.read_ndjson(response),
+            [
+                {
+                    "id": str(self.owner.id),
+                    "first_name": "John",
+                    "last_name": "Smith",
+                    "province": "ON",
+                }
+            ],
+        )
+
+    def test_export_pets_matches_serializer(self):
+        # Arrange
+        for i in range(5):
+            Pet.objects.create(
+                name=f"Pet {i}", species=Species.DOG, age=i, owner=self.owner
+            )
+
+        # Act
+        with mock.patch.object(PetExportView, "chunk_size", 2):
+            response = self.client.get(reverse("pet-export"))
+            rows = self.read_ndjson(response)
+
+        # Assert
+        listed = self.client.get(reverse("pet-list-create")).json()["results"]
+        self.assertEqual(
+            sorted(rows, key=lambda row: row["id"]),
+            sorted(listed, key=lambda row: row["id"]),
+        )
+
+    def test_export_empty_table(self):
+        # Act
+        response = self.client.get(reverse("pet-export"))
+
+        # Assert
+        self.assertEqual(self.read_ndjson(response), [])
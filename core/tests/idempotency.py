@@ -0,0 +1,112 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from unittest import mock
+from ..cache import estimate_cache
+from ..idempotency import idempotency_store
+from ..models import MedicalCondition, Owner, Pet, PetMedicalCondition, Species
+
+
+class IdempotencyTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.owner = Owner.objects.create(
+            first_name="John", last_name="Smith", province="ON"
+        )
+        self.pet = Pet.objects.create(
+            name="Buddy", species=Species.DOG, age=3, owner=self.owner
+        )
+        self.url = reverse(
+            "pet-medical-condition-list-create", kwargs={"pk": self.pet.id}
+        )
+        idempotency_store.cache.clear()
+
+    def post(self, body, key):
+        return self.client.post(self.url, body, format="json", HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_retry_replays_response(self):
+        # Arrange
+        body = [{"condition": MedicalCondition.CANCER}]
+        first = self.post(body, "abc")
+
+        # Act
+        with CaptureQueriesContext(connection) as queries:
+            retry = self.post(body, "abc")
+
+        # Assert
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.content, first.content)
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(PetMedicalCondition.objects.count(), 1)
+        # Only the cache's queries, the view didn't run
+        self.assertEqual(
+            [query["sql"] for query in queries if "core_" in query["sql"]], []
+        )
+
+    def test_key_reused_with_another_body(self):
+        # Arrange
+        self.post({"condition": MedicalCondition.CANCER}, "abc")
+
+        # Act
+        response = self.post({"condition": MedicalCondition.DIABETES}, "abc")
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(PetMedicalCondition.objects.count(), 1)
+
+    def test_key_in_progress(self):
+        # Arrange
+        idempotency_store.start(idempotency_store.key(self.url, "abc"))
+
+        # Act
+        response = self.post({"condition": MedicalCondition.CANCER}, "abc")
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertFalse(PetMedicalCondition.objects.exists())
+
+    def test_failed_requests_can_be_retried(self):
+        # Arrange
+        invalid = self.post({"condition": "FLU"}, "abc")
+        with mock.patch(
+            "core.views.PetMedicalConditionListCreateView.upsert",
+            side_effect=RuntimeError,
+        ):
+            with self.assertRaises(RuntimeError):
+                self.post({"condition": MedicalCondition.CANCER}, "abc")
+
+        # Act
+        retry = self.post({"condition": MedicalCondition.CANCER}, "abc")
+
+        # Assert
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertNotIn("Idempotent-Replayed", retry)
+
+    def test_invalid_key(self):
+        # Act
+        response = self.post({"condition": MedicalCondition.CANCER}, "x" * 256)
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_duplicate_is_a_no_op(self):
+        # Arrange
+        self.client.post(self.url, {"condition": MedicalCondition.DIABETES})
+
+        # Act
+        with mock.patch.object(estimate_cache, "invalidate") as invalidate:
+            with self.assertNumQueries(2):
+                response = self.client.post(
+                    self.url, {"condition": MedicalCondition.DIABETES}
+                )
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        invalidate.assert_not_called()
+        self.pet.refresh_from_db()
+        self.assertEqual(self.pet.diabetes_count, 1)
@@ -0,0 +1,296 @@
+from datetime import timedelta
+from django.core.management import call_command
+from django.db import OperationalError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from io import StringIO
+from rest_framework import status
+from rest_framework.test import APIClient
+from unittest import mock, skipUnless
+from ..jobs import MAX_ATTEMPTS, claim, requeue_stale, work
+from ..management.commands.run_workers import Command as RunWorkersCommand
+from ..management.commands.run_workers import WorkerStop, run_worker
+from ..models import Job, JobKind, JobStatus, Owner, Pet, PetEstimate, Species
+from ..rates import active_rates
+import importlib.util
+import json
+import os
+import signal
+import tempfile
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+
+class JobTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.addCleanup(active_rates.reset)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings = override_settings(JOB_OUTPUT_DIR=directory.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.owner = Owner.objects.create(
+            first_name="John", last_name="Smith", province="ON"
+        )
+        self.pets = [
+            Pet.objects.create(
+                name="Buddy", species=Species.DOG, age=3, owner=self.owner
+            ),
+            Pet.objects.create(
+                name="Tom", species=Species.CAT, age=30, owner=self.owner
+            ),
+        ]
+
+    def queue(self, kind, params=None, **headers):
+        return self.client.post(
+            reverse("job-create"),
+            {"kind": kind, "params": params or {}},
+            format="json",
+            headers=headers,
+        )
+
+    def job(self, response):
+        return self.client.get(response["Location"]).json()
+
+    def test_queue_and_run(self):
+        # Act
+        response = self.queue(JobKind.ESTIMATE_BATCH, {"owner": self.owner.id})
+        queued = self.job(response)
+        ran = work(burst=True)
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(queued["status"], JobStatus.QUEUED)
+        self.assertEqual(queued["params"], {"owner": str(self.owner.id)})
+        self.assertEqual(ran, 1)
+        job = self.job(response)
+        self.assertEqual(job["status"], JobStatus.SUCCEEDED)
+        self.assertEqual(job["attempts"], 1)
+        self.assertEqual((job["done"], job["result"]["pets"]), (2, 2))
+
+        output = self.client.get(reverse("job-output", kwargs={"pk": job["id"]}))
+        self.assertEqual(output["Content-Type"], "application/json")
+        estimates = json.loads(b"".join(output.streaming_content))
+        self.assertEqual(
+            estimates[str(self.pets[0].id)],
+            {"eligible": True, "costOfInsurance": 9.0, "rateVersion": 1},
+        )
+        self.assertEqual(estimates[str(self.pets[1].id)]["reason"], "AGE")
+
+    def test_invalid_params(self):
+        # Act
+        responses = [
+            self.queue(JobKind.ESTIMATE_BATCH),
+            self.queue(JobKind.EXPORT, {"model": "rates"}),
+            self.queue(JobKind.REPRICE, {"multipliers": {"XX": 1.5}}),
+            self.queue("backup"),
+        ]
+
+        # Assert
+        for response in responses:
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("params", responses[0].json())
+        self.assertFalse(Job.objects.exists())
+
+    def test_idempotent_queueing(self):
+        # Act
+        first = self.queue(JobKind.REFRESH_ESTIMATES, **{"Idempotency-Key": "k"})
+        retry = self.queue(JobKind.REFRESH_ESTIMATES, **{"Idempotency-Key": "k"})
+
+        # Assert
+        self.assertEqual(retry.json()["id"], first.json()["id"])
+        self.assertEqual(Job.objects.count(), 1)
+
+    def test_export_and_refresh(self):
+        # Arrange
+        export = self.queue(JobKind.EXPORT, {"model": "pets"})
+        refresh = self.queue(JobKind.REFRESH_ESTIMATES, {"batch_size": 1})
+
+        # Act
+        call_command("run_workers", workers=1, burst=True, stdout=StringIO())
+
+        # Assert
+        job = self.job(export)
+        self.assertEqual((job["done"], job["total"]), (2, 2))
+        output = self.client.get(reverse("job-output", kwargs={"pk": job["id"]}))
+        rows = b"".join(output.streaming_content).decode().splitlines()
+        self.assertEqual(
+            {json.loads(row)["id"] for row in rows},
+            {str(pet.id) for pet in self.pets},
+        )
+        self.assertEqual(self.job(refresh)["result"], {"refreshed": 2})
+        self.assertFalse(PetEstimate.objects.filter(dirty=True).exists())
+
+    @skipUnless(HAS_NUMPY, "repricing requires NumPy")
+    def test_reprice(self):
+        # Arrange
+        response = self.queue(JobKind.REPRICE, {"multipliers": {"ON": 2}})
+
+        # Act
+        work(burst=True)
+
+        # Assert
+        self.assertEqual(
+            self.job(response)["result"]["groups"],
+            [
+                {
+                    "province": "ON",
+                    "species": "CAT",
+                    "pets": 1,
+                    "eligible": 0,
+                    "premium": 0.0,
+                    "average_premium": None,
+                },
+                {
+                    "province": "ON",
+                    "species": "DOG",
+                    "pets": 1,
+                    "eligible": 1,
+                    "premium": 12.0,
+                    "average_premium": 12.0,
+                },
+            ],
+        )
+
+    def test_failed_job(self):
+        # Arrange
+        response = self.queue(JobKind.ESTIMATE_BATCH, {"province": "ON"})
+        Job.objects.update(params={"province": "XX"})
+
+        # Act
+        with self.assertLogs("core.jobs", "ERROR"):
+            work(burst=True)
+
+        # Assert
+        job = self.job(response)
+        self.assertEqual(job["status"], JobStatus.FAILED)
+        self.assertIn("ValidationError", job["error"])
+        output = self.client.get(reverse("job-output", kwargs={"pk": job["id"]}))
+        self.assertEqual(output.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_claims_are_exclusive(self):
+        # Arrange
+        first = Job.objects.create(kind=JobKind.REFRESH_ESTIMATES)
+        second = Job.objects.create(kind=JobKind.REFRESH_ESTIMATES)
+
+        # Act
+        claims = [claim("a"), claim("b"), claim("c")]
+
+        # Assert
+        self.assertEqual(
+            [job and job.pk for job in claims], [first.pk, second.pk, None]
+        )
+        self.assertEqual(claims[0].worker, "a")
+        self.assertEqual(claims[0].status, JobStatus.RUNNING)
+
+    def test_stale_jobs_are_requeued(self):
+        # Arrange
+        stale = timezone.now() - timedelta(hours=1)
+        requeued = Job.objects.create(
+            kind=JobKind.REFRESH_ESTIMATES,
+            status=JobStatus.RUNNING,
+            worker="gone",
+            attempts=1,
+            heartbeat_at=stale,
+        )
+        exhausted = Job.objects.create(
+            kind=JobKind.REFRESH_ESTIMATES,
+            status=JobStatus.RUNNING,
+            worker="gone",
+            attempts=MAX_ATTEMPTS,
+            heartbeat_at=stale,
+        )
+        running = Job.objects.create(
+            kind=JobKind.REFRESH_ESTIMATES,
+            status=JobStatus.RUNNING,
+            worker="alive",
+            heartbeat_at=timezone.now(),
+        )
+
+        # Act
+        count = requeue_stale()
+
+        # Assert
+        self.assertEqual(count, 1)
+        for job, expected in [
+            (requeued, JobStatus.QUEUED),
+            (exhausted, JobStatus.FAILED),
+            (running, JobStatus.RUNNING),
+        ]:
+            job.refresh_from_db()
+            self.assertEqual(job.status, expected)
+        self.assertIsNone(requeued.worker)
+
+    def test_database_errors_are_retried(self):
+        # Arrange
+        Job.objects.create(kind=JobKind.REFRESH_ESTIMATES)
+        attempts = []
+
+        def flaky_claim(worker):
+            attempts.append(worker)
+            if len(attempts) == 1:
+                raise OperationalError("database is locked")
+            return claim(worker)
+
+        # Act
+        with mock.patch("core.jobs.claim", flaky_claim), mock.patch(
+            "core.jobs.close_old_connections"
+        ) as close_old_connections, self.assertLogs("core.jobs", "ERROR"):
+            ran = work(burst=True, poll_interval=0)
+
+        # Assert
+        self.assertEqual(ran, 1)
+        close_old_connections.assert_called_once()
+
+    def test_dead_workers_are_restarted(self):
+        # Arrange
+        command = RunWorkersCommand(stdout=StringIO(), stderr=StringIO())
+        alive, stopped, crashed = [mock.Mock() for _ in range(3)]
+        alive.is_alive.return_value = True
+        for process, exitcode in [(stopped, 0), (crashed, -9)]:
+            process.is_alive.return_value = False
+            process.exitcode = exitcode
+        processes = [alive, stopped, crashed]
+        stop = mock.Mock()
+        stop.is_set.return_value = False
+
+        # Act
+        with mock.patch.object(command, "start_worker") as start_worker:
+            running = command.supervise(processes, stop, 1.0, False)
+
+        # Assert
+        self.assertTrue(running)
+        start_worker.assert_called_once_with(2, stop, 1.0, False)
+        self.assertEqual(processes, [alive, stopped, start_worker.return_value])
+
+    def test_worker_signals_stop_it_after_the_running_job(self):
+        # Arrange
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            self.addCleanup(signal.signal, signum, signal.getsignal(signum))
+        shared = mock.Mock(**{"is_set.return_value": False})
+
+        # Act
+        with mock.patch("core.jobs.work") as work:
+            run_worker(shared, 1.0, False, os.getppid())
+        stop = work.call_args.kwargs["stop"]
+        running = stop.is_set()
+        signal.getsignal(signal.SIGTERM)(signal.SIGTERM, None)
+
+        # Assert
+        self.assertFalse(running)
+        self.assertTrue(stop.is_set())
+        self.assertTrue(stop.wait(1.0))
+        self.assertEqual(signal.getsignal(signal.SIGINT), stop.handle)
+
+    def test_orphaned_worker_stops(self):
+        # Arrange
+        shared = mock.Mock(**{"is_set.return_value": False})
+
+        # Act
+        stop = WorkerStop(shared, parent=os.getppid() + 1)
+
+        # Assert
+        self.assertTrue(stop.is_set())
+        self.assertFalse(WorkerStop(shared, parent=os.getppid()).wait(0.01))
@@ -0,0 +1,172 @@
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.urls import reverse
+from io import StringIO
+from rest_framework.test import APIClient
+from ..cache import estimate_cache
+from ..estimates import estimate_mismatches, refresh
+from ..models import (
+    Pet,
+    PetEstimate,
+    PetMedicalCondition,
+    Owner,
+    MedicalCondition,
+    RateTable,
+    Species,
+)
+from ..rates import active_rates
+from ..underwriting import DEFAULT_RULES
+
+
+class PetEstimateMaterializationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.owner = Owner.objects.create(
+            first_name="John", last_name="Smith", province="ON"
+        )
+        self.pet = Pet.objects.create(
+            name="Buddy", species=Species.DOG, age=3, owner=self.owner
+        )
+        self.cat = Pet.objects.create(
+            name="Whiskers", species=Species.CAT, age=12, owner=self.owner
+        )
+        self.addCleanup(active_rates.reset)
+
+    def materialized(self, pet=None):
+        return PetEstimate.objects.get(pet=pet or self.pet)
+
+    def estimate(self, pet=None):
+        pet = pet or self.pet
+        estimate_cache.cache.clear()
+        return self.client.post(reverse("pet-estimate", kwargs={"pk": pet.id})).data
+
+    def test_refresh_computes_new_rows(self):
+        # Act
+        refreshed = refresh()
+
+        # Assert
+        self.assertEqual(refreshed, 2)
+        self.assertEqual(
+            self.materialized().as_estimate().as_dict(),
+            {"eligible": True, "costOfInsurance": 9.0, "rateVersion": 1},
+        )
+        self.assertEqual(
+            self.materialized(self.cat).as_estimate().as_dict(),
+            {"eligible": False, "reason": "AGE", "rateVersion": 1},
+        )
+        self.assertFalse(self.materialized().dirty)
+        self.assertEqual(refresh(), 0)
+
+    def test_missing_rows_are_created_on_request(self):
+        # Arrange
+        Pet.objects.bulk_create(
+            [
+                Pet(name=f"Pet {i}", species=Species.FISH, age=1, owner=self.owner)
+                for i in range(3)
+            ]
+        )
+        out = StringIO()
+
+        # Act
+        refreshed = refresh()
+        call_command("refresh_estimates", "--missing", "--batch-size", "2", stdout=out)
+
+        # Assert
+        self.assertEqual(refreshed, 2)
+        self.assertIn("Created 3 missing estimates.", out.getvalue())
+        self.assertIn("Refreshed 3 estimates", out.getvalue())
+        self.assertEqual(PetEstimate.objects.filter(dirty=False).count(), 5)
+
+    def test_changes_mark_rows_dirty(self):
+        # Arrange
+        refresh()
+
+        # Act / Assert
+        self.pet.age = 4
+        self.pet.save()
+        self.assertTrue(self.materialized().dirty)
+        self.assertEqual(refresh(), 1)
+        self.assertEqual(self.materialized().cost_of_insurance, 12.0)
+
+        PetMedicalCondition.objects.create(
+            pet=self.pet, condition=MedicalCondition.DIABETES
+        )
+        self.assertTrue(self.materialized().dirty)
+        refresh()
+        self.assertEqual(self.materialized().cost_of_insurance, 20.0)
+
+        self.owner.province = "AB"
+        self.owner.save()
+        self.assertTrue(self.materialized().dirty)
+        self.assertTrue(self.materialized(self.cat).dirty)
+        self.assertEqual(refresh(), 2)
+        self.assertEqual(self.materialized().cost_of_insurance, 16.0)
+
+    def test_rate_change_refreshes_all_rows(self):
+        # Arrange
+        refresh()
+        rules = dict(DEFAULT_RULES, base_cost_per_year=4.0)
+        with self.captureOnCommitCallbacks(execute=True):
+            RateTable.objects.create(version=2, rules=rules)
+
+        # Act
+        refreshed = refresh()
+
+        # Assert
+        self.assertEqual(refreshed, 2)
+        self.assertEqual(self.materialized().rate_version, 2)
+        self.assertEqual(self.materialized().cost_of_insurance, 18.0)
+
+    def test_estimate_reads_materialized_row(self):
+        # Arrange
+        refresh()
+        PetEstimate.objects.filter(pet=self.pet).update(cost_of_insurance=1.0)
+
+        # Act
+        with self.assertNumQueries(1):
+            data = self.estimate()
+
+        # Assert
+        self.assertEqual(
+            data, {"eligible": True, "costOfInsurance": 1.0, "rateVersion": 1}
+        )
+
+    def test_estimate_ignores_dirty_row(self):
+        # Arrange
+        refresh()
+        self.pet.age = 4
+        self.pet.save()
+
+        # Act
+        with self.assertNumQueries(1):
+            data = self.estimate()
+
+        # Assert
+        self.assertEqual(
+            data, {"eligible": True, "costOfInsurance": 12.0, "rateVersion": 1}
+        )
+
+    def test_check_estimates(self):
+        # Arrange
+        refresh()
+        out = StringIO()
+        call_command("check_estimates", stdout=out)
+        self.assertIn("All current estimates match.", out.getvalue())
+
+        # Act
+        PetEstimate.objects.filter(pet=self.pet).update(cost_of_insurance=1.0)
+
+        # Assert
+        self.assertEqual([row[0] for row in estimate_mismatches()], [self.pet.id])
+        with self.assertRaises(CommandError):
+            call_command("check_estimates", stdout=StringIO(), stderr=StringIO())
+
+    def test_refresh_command(self):
+        # Act
+        out = StringIO()
+        call_command("refresh_estimates", "--batch-size", "1", stdout=out)
+
+        # Assert
+        self.assertIn("Refreshed 2 estimates", out.getvalue())
+        self.assertFalse(PetEstimate.objects.filter(dirty=True).exists())
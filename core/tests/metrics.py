@@ -0,0 +1,102 @@
+from asgiref.sync import iscoroutinefunction
+from django.http import HttpResponse
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from ..metrics import RequestMetricsMiddleware, RingBuffer, registry
+from ..models import Owner, Pet, Species
+from ..rates import active_rates
+
+
+@override_settings(REQUEST_METRICS=True)
+class RequestMetricsTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.owner = Owner.objects.create(
+            first_name="John", last_name="Smith", province="ON"
+        )
+        self.pet = Pet.objects.create(
+            name="Buddy", species=Species.DOG, age=3, owner=self.owner
+        )
+        # Load the rates outside of the measured requests
+        active_rates.engine()
+        registry.clear()
+
+    def test_ring_buffer(self):
+        # Arrange
+        buffer = RingBuffer(size=4)
+
+        # Act
+        for value in range(10):
+            buffer.add(value)
+
+        # Assert
+        self.assertEqual(buffer.count, 10)
+        self.assertEqual(buffer.sum, 45)
+        self.assertEqual(
+            buffer.quantiles((0.0, 0.5, 1.0)), [(0.0, 6), (0.5, 8), (1.0, 9)]
+        )
+
+    def test_records_by_url_name(self):
+        # Act
+        for _ in range(2):
+            self.client.get(
+                reverse("owner-retrieve-update-destroy", args=[self.owner.id])
+            )
+        self.client.get(reverse("owner-pet-list", kwargs={"pk": self.owner.id}))
+
+        # Assert
+        owner = registry.endpoints["owner-retrieve-update-destroy"]
+        self.assertEqual(owner.seconds.count, 2)
+        self.assertEqual(owner.queries.sum, 2)
+        self.assertGreater(owner.db_seconds.sum, 0)
+        self.assertGreater(owner.render_seconds.sum, 0)
+        self.assertLessEqual(owner.render_seconds.sum, owner.seconds.sum)
+        self.assertEqual(registry.endpoints["owner-pet-list"].queries.sum, 2)
+
+    def test_prometheus_endpoint(self):
+        # Arrange
+        self.client.get(reverse("owner-retrieve-update-destroy", args=[self.owner.id]))
+
+        # Act
+        response = self.client.get(reverse("metrics"))
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        lines = response.content.decode().splitlines()
+        self.assertIn("# TYPE http_request_seconds summary", lines)
+        self.assertIn(
+            'http_request_queries_count{endpoint="owner-retrieve-update-destroy"} 1',
+            lines,
+        )
+        self.assertIn(
+            'http_request_queries{endpoint="owner-retrieve-update-destroy",'
+            'quantile="0.5"} 1',
+            lines,
+        )
+
+    async def test_async_requests(self):
+        # Arrange
+        async def view(request):
+            return HttpResponse()
+
+        # Act
+        await AsyncClient().get(
+            reverse("async-pet-retrieve", kwargs={"pk": self.pet.id})
+        )
+
+        # Assert
+        self.assertTrue(iscoroutinefunction(RequestMetricsMiddleware(view)))
+        self.assertFalse(iscoroutinefunction(RequestMetricsMiddleware(HttpResponse)))
+        metrics = registry.endpoints["async-pet-retrieve"]
+        self.assertEqual(metrics.seconds.count, 1)
+        self.assertEqual(metrics.queries.sum, 1)
+
+    @override_settings(REQUEST_METRICS=False)
+    def test_disabled(self):
+        # Act
+        self.client.get(reverse("owner-retrieve-update-destroy", args=[self.owner.id]))
+
+        # Assert
+        self.assertEqual(registry.endpoints, {})
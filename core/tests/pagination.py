@@ -0,0 +1,128 @@
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+from django.urls import reverse
+from django.utils import timezone
+from ..models import Pet, PetMedicalCondition, Owner, MedicalCondition, Species
+
+
+class CursorPaginationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.owner = Owner.objects.create(
+            first_name="John", last_name="Smith", province="ON"
+        )
+
+    def collect(self, url, **params):
+        ids = []
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        while True:
+            ids.extend(row["id"] for row in response.data["results"])
+            if not response.data["next"]:
+                return ids
+            response = self.client.get(response.data["next"])
+
+    def test_pets_paginate_in_creation_order(self):
+        # Arrange
+        pets = [
+            Pet.objects.create(
+                name=f"Pet {i}", species=Species.DOG, age=1, owner=self.owner
+            )
+            for i in range(7)
+        ]
+
+        # Act
+        ids = self.collect(reverse("pet-list-create"), page_size=3)
+
+        # Assert
+        self.assertEqual(ids, [str(pet.id) for pet in pets])
+
+    def test_pagination_is_stable_with_identical_timestamps(self):
+        # Arrange
+        pets = [
+            Pet.objects.create(
+                name=f"Pet {i}", species=Species.CAT, age=1, owner=self.owner
+            )
+            for i in range(5)
+        ]
+        Pet.objects.update(created_at=timezone.now())
+
+        # Act
+        ids = self.collect(reverse("pet-list-create"), page_size=2)
+
+        # Assert
+        self.assertEqual(sorted(ids), sorted(str(pet.id) for pet in pets))
+
+    def test_new_rows_do_not_shift_pages(self):
+        # Arrange
+        for i in range(4):
+            Pet.objects.create(
+                name=f"Pet {i}", species=Species.DOG, age=1, owner=self.owner
+            )
+        url = reverse("pet-list-create")
+        first_page = self.client.get(url, {"page_size": 2})
+
+        # Act
+        Pet.objects.create(name="Late", species=Species.DOG, age=1, owner=self.owner)
+        second_page = self.client.get(first_page.data["next"])
+
+        # Assert
+        first_ids = {row["id"] for row in first_page.data["results"]}
+        second_ids = {row["id"] for row in second_page.data["results"]}
+        self.assertFalse(first_ids & second_ids)
+        self.assertEqual(len(second_ids), 2)
+
+    def test_owners_and_medical_conditions_are_paginated(self):
+        # Arrange
+        pet = Pet.objects.create(
+            name="Rex", species=Species.DOG, age=1, owner=self.owner
+        )
+        for condition in [MedicalCondition.DIABETES, MedicalCondition.OTHER]:
+            PetMedicalCondition.objects.create(pet=pet, condition=condition)
+
+        # Act
+        owner_ids = self.collect(reverse("owner-list-create"), page_size=1)
+        condition_ids = self.collect(
+            reverse("pet-medical-condition-list-create", kwargs={"pk": pet.id}),
+            page_size=1,
+        )
+
+        # Assert
+        self.assertEqual(owner_ids, [str(self.owner.id)])
+        self.assertEqual(len(condition_ids), 2)
+
+    def test_more_rows_than_offset_cutoff_share_a_timestamp(self):
+        # Arrange
+        Owner.objects.bulk_create(
+            Owner(first_name="Ann", last_name=f"Lee {i}", province="QC")
+            for i in range(1250)
+        )
+        Owner.objects.update(created_at=timezone.now())
+        url = reverse("owner-list-create")
+
+        # Act
+        ids = self.collect(url, page_size=100)
+
+        # Assert
+        self.assertEqual(len(ids), 1251)
+        self.assertEqual(len(set(ids)), 1251)
+
+        # Paging back from the last page visits the same rows
+        response = self.client.get(url, {"page_size": 100})
+        while response.data["next"]:
+            response = self.client.get(response.data["next"])
+        previous_ids = [row["id"] for row in response.data["results"]]
+        while response.data["previous"]:
+            response = self.client.get(response.data["previous"])
+            previous_ids[:0] = [row["id"] for row in response.data["results"]]
+        self.assertEqual(previous_ids, ids)
+
+    def test_invalid_cursor(self):
+        # Act
+        response = self.client.get(
+            reverse("pet-list-create"), {"cursor": "cD1ub3QtYS1kYXRl"}
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,144 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from ..estimates import refresh
+from ..models import (
+    MedicalCondition,
+    Owner,
+    Pet,
+    PetMedicalCondition,
+    PortfolioCounter,
+    Species,
+)
+from ..portfolio import live_stats, stats
+from ..rates import active_rates
+
+
+class PortfolioStatsTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.addCleanup(active_rates.reset)
+        self.ontario = Owner.objects.create(
+            first_name="John", last_name="Smith", province="ON"
+        )
+        self.quebec = Owner.objects.create(
+            first_name="Jane", last_name="Doe", province="QC"
+        )
+        self.dog = Pet.objects.create(
+            name="Buddy", species=Species.DOG, age=3, owner=self.ontario
+        )
+        self.cat = Pet.objects.create(
+            name="Tom", species=Species.CAT, age=5, owner=self.ontario
+        )
+        self.fish = Pet.objects.create(
+            name="Nemo", species=Species.FISH, age=1, owner=self.quebec
+        )
+        PetMedicalCondition.objects.create(
+            pet=self.cat, condition=MedicalCondition.DIABETES
+        )
+        PetMedicalCondition.objects.create(
+            pet=self.cat, condition=MedicalCondition.OTHER
+        )
+        refresh()
+
+    def assertCountersExact(self):
+        counted, live = stats(), live_stats()
+        self.assertEqual(counted["pending"], 0)
+        self.assertEqual(len(counted["groups"]), len(live["groups"]))
+        for group, expected in zip(counted["groups"], live["groups"]):
+            average = group.pop("average_premium")
+            expected_average = expected.pop("average_premium")
+            self.assertEqual(group, expected)
+            if expected_average is None:
+                self.assertIsNone(average)
+            else:
+                self.assertAlmostEqual(average, expected_average)
+
+    def groups(self):
+        return {
+            (group["province"], group["species"], group["eligible"]): group["pets"]
+            for group in stats()["groups"]
+        }
+
+    def test_counters_match_live_aggregate(self):
+        self.assertCountersExact()
+        self.assertEqual(
+            self.groups(),
+            {("ON", "CAT", True): 1, ("ON", "DOG", True): 1, ("QC", "FISH", False): 1},
+        )
+
+    def test_changes_move_counts_on_refresh(self):
+        # Arrange
+        self.ontario.province = "BC"
+        self.ontario.save()
+        PetMedicalCondition.objects.create(
+            pet=self.dog, condition=MedicalCondition.CANCER
+        )
+        Pet.objects.create(name="Rex", species=Species.DOG, age=2, owner=self.quebec)
+
+        # Act
+        pending = stats()["pending"]
+        refresh()
+
+        # Assert
+        self.assertEqual(pending, 3)
+        self.assertCountersExact()
+        self.assertNotIn(("ON", "CAT", True), self.groups())
+
+    def test_new_pets_are_pending(self):
+        # Arrange
+        pet = {"name": "Rex", "species": Species.DOG, "age": 2}
+        owner = str(self.quebec.id)
+
+        # Act
+        self.client.post(reverse("pet-list-create"), {**pet, "owner": owner})
+        self.client.post(
+            reverse("pet-list-create"), [{**pet, "owner": owner}] * 2, format="json"
+        )
+        pending = stats()["pending"]
+        refresh()
+
+        # Assert
+        self.assertEqual(pending, 3)
+        self.assertEqual(self.groups()[("QC", "DOG", True)], 3)
+        self.assertCountersExact()
+
+    def test_refreshing_again_changes_nothing(self):
+        # Arrange
+        counters = list(PortfolioCounter.objects.values_list("pets", "premium"))
+        self.cat.save()
+
+        # Act
+        refresh()
+
+        # Assert
+        self.assertEqual(
+            list(PortfolioCounter.objects.values_list("pets", "premium")), counters
+        )
+
+    def test_deletes_are_uncounted(self):
+        # Act
+        self.client.delete(
+            reverse("owner-retrieve-update-destroy", kwargs={"pk": self.quebec.id})
+        )
+        self.client.delete(
+            reverse("pet-retrieve-update-destroy", kwargs={"pk": self.dog.id})
+        )
+        self.cat.delete()
+
+        # Assert
+        self.assertEqual(self.groups(), {})
+        self.assertCountersExact()
+
+    def test_endpoint(self):
+        # Act
+        response = self.client.get(reverse("portfolio-stats"))
+        exact = self.client.get(reverse("portfolio-stats"), {"exact": "1"})
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.json()["exact"])
+        self.assertTrue(exact.json()["exact"])
+        self.assertEqual(len(response.json()["groups"]), 3)
+        self.assertEqual(exact.json()["groups"], response.json()["groups"])
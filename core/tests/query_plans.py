@@ -0,0 +1,87 @@
+from django.db import connection
+from django.test import TestCase
+from unittest import skipUnless
+from ..estimates import _version_filter
+from ..models import (
+    Pet,
+    PetEstimate,
+    PetMedicalCondition,
+    Owner,
+    MedicalCondition,
+    Species,
+)
+import re
+import uuid
+
+# A plan step reading a whole table without an index, e.g. "SCAN core_pet"
+FULL_SCAN = re.compile(r"^SCAN (?!.*\bUSING\b)")
+
+
+@skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN is SQLite syntax")
+class QueryPlanTests(TestCase):
+    """The hot queries must be served by an index, never a full table scan."""
+
+    def setUp(self):
+        owner = Owner.objects.create(
+            first_name="John", last_name="Smith", province="ON"
+        )
+        pet = Pet.objects.create(name="Rex", species=Species.DOG, age=3, owner=owner)
+        PetMedicalCondition.objects.create(pet=pet, condition=MedicalCondition.OTHER)
+
+    def plan(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            return [row[-1] for row in cursor.fetchall()]
+
+    def assertUsesIndexes(self, queryset):
+        plan = self.plan(queryset)
+        scans = [step for step in plan if FULL_SCAN.match(step)]
+        self.assertFalse(scans, f"Full table scan in {plan}")
+
+    def test_pets_by_owner(self):
+        self.assertUsesIndexes(
+            Pet.objects.filter(owner_id=uuid.uuid4())
+            .with_eligibility()
+            .order_by("created_at", "id")
+        )
+
+    def test_conditions_by_pet_and_condition(self):
+        self.assertUsesIndexes(
+            PetMedicalCondition.objects.filter(
+                pet_id=uuid.uuid4(), condition=MedicalCondition.CANCER
+            )
+        )
+
+    def test_conditions_by_pet(self):
+        self.assertUsesIndexes(
+            PetMedicalCondition.objects.filter(pet_id=uuid.uuid4()).order_by(
+                "created_at", "id"
+            )
+        )
+
+    def test_pets_by_species_and_age(self):
+        self.assertUsesIndexes(Pet.objects.filter(species=Species.DOG, age__lte=8))
+
+    def test_estimate_inputs(self):
+        self.assertUsesIndexes(
+            Pet.objects.with_estimate_inputs().filter(id=uuid.uuid4())
+        )
+
+    def test_full_scan_is_detected(self):
+        self.assertTrue(
+            any(
+                FULL_SCAN.match(step)
+                for step in self.plan(Pet.objects.filter(name="Rex"))
+            )
+        )
+
+    def test_dirty_estimates(self):
+        self.assertUsesIndexes(
+            PetEstimate.objects.filter(dirty=True).values_list("pet_id")[:1000]
+        )
+
+    def test_outdated_estimates(self):
+        self.assertUsesIndexes(
+            PetEstimate.objects.filter(_version_filter(2), dirty=False)
+        )
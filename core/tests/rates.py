@@ -0,0 +1,148 @@
+from datetime import timedelta
+from unittest import mock
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from ..models import Owner, Pet, RateTable, Species
+from ..rates import active_rates
+from ..underwriting import DEFAULT_RULES
+import copy
+import time
+
+
+def rules(**overrides):
+    rules = copy.deepcopy(DEFAULT_RULES)
+    rules.update(overrides)
+    return rules
+
+
+class RateTableTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.owner = Owner.objects.create(
+            first_name="John", last_name="Smith", province="ON"
+        )
+        self.pet = Pet.objects.create(
+            name="Buddy", species=Species.DOG, age=3, owner=self.owner
+        )
+        # Rate tables created by a test are rolled back, don't keep their engine
+        self.addCleanup(active_rates.reset)
+
+    def estimate(self):
+        return self.client.post(
+            reverse("pet-estimate", kwargs={"pk": self.pet.id})
+        ).data
+
+    def test_seeded_from_default_rules(self):
+        # Act
+        table = RateTable.objects.active().get()
+
+        # Assert
+        self.assertEqual(table.version, 1)
+        self.assertEqual(table.rules, DEFAULT_RULES)
+
+    def test_engine_is_cached_in_process(self):
+        # Arrange
+        engine = active_rates.engine()
+
+        # Act / Assert
+        with self.assertNumQueries(0):
+            self.assertIs(active_rates.engine(), engine)
+
+    def test_new_rates_apply_after_commit(self):
+        # Arrange
+        self.assertEqual(
+            self.estimate(),
+            {"eligible": True, "costOfInsurance": 9.0, "rateVersion": 1},
+        )
+
+        # Act
+        with self.captureOnCommitCallbacks(execute=True):
+            RateTable.objects.create(
+                version=2, rules=rules(province_multipliers={"ON": 2.0})
+            )
+
+        # Assert
+        self.assertEqual(
+            self.estimate(),
+            {"eligible": True, "costOfInsurance": 12.0, "rateVersion": 2},
+        )
+
+    def test_eligibility_follows_active_rates(self):
+        # Arrange
+        url = reverse("owner-pet-list", kwargs={"pk": self.owner.id})
+
+        # Act
+        with self.captureOnCommitCallbacks(execute=True):
+            RateTable.objects.create(
+                version=2, rules=rules(max_age_by_species={"DOG": 2})
+            )
+        response = self.client.get(url)
+
+        # Assert
+        self.assertFalse(response.data["results"][0]["eligible"])
+
+    def test_scheduled_rates_apply_once_effective(self):
+        # Arrange
+        effective_from = timezone.now() + timedelta(hours=1)
+        with self.captureOnCommitCallbacks(execute=True):
+            RateTable.objects.create(
+                version=2,
+                effective_from=effective_from,
+                rules=rules(base_cost_per_year=3.0),
+            )
+
+        # Act / Assert
+        self.assertEqual(active_rates.engine().version, 1)
+        later = effective_from + timedelta(seconds=1)
+        with mock.patch("core.rates.timezone.now", return_value=later):
+            with mock.patch("core.rates.time.time", return_value=later.timestamp()):
+                self.assertEqual(active_rates.engine().version, 2)
+
+    def test_reloads_after_max_age_without_stamp(self):
+        # Arrange
+        active_rates.engine()
+        # The commit callback bumping the stamp doesn't run, like in a process
+        # that doesn't share the default cache
+        RateTable.objects.create(version=2, rules=rules())
+        expired = time.time() + active_rates.max_age + 1
+
+        # Act / Assert
+        self.assertEqual(active_rates.engine().version, 1)
+        with mock.patch("core.rates.time.time", return_value=expired):
+            self.assertEqual(active_rates.engine().version, 2)
+
+    def test_invalid_rules_are_rejected(self):
+        # Arrange
+        table = RateTable(version=2, rules={"base_cost_per_year": 2.0})
+
+        # Act / Assert
+        with self.assertRaises(ValidationError):
+            table.full_clean()
+
+    def test_surcharges_of_unpriced_conditions_are_rejected(self):
+        # Arrange
+        table = RateTable(
+            version=2, rules=rules(condition_surcharges={"HEART_DISEASE": 20.0})
+        )
+
+        # Act / Assert
+        with self.assertRaisesMessage(ValidationError, "HEART_DISEASE"):
+            table.full_clean()
+
+    def test_rate_tables_are_immutable(self):
+        # Arrange
+        table = RateTable.objects.get(version=1)
+        table.rules = rules(province_multipliers={"ON": 2.0})
+
+        # Act / Assert
+        for change in (
+            table.save,
+            table.full_clean,
+            lambda: RateTable.objects.update(rules=table.rules),
+        ):
+            with self.assertRaises(ValidationError):
+                change()
+        self.assertEqual(RateTable.objects.get(version=1).rules, DEFAULT_RULES)
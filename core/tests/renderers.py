@@ -0,0 +1,175 @@
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from unittest import mock
+from ..models import (
+    Job,
+    JobKind,
+    MedicalCondition,
+    Owner,
+    Pet,
+    PetMedicalCondition,
+    Species,
+)
+from ..renderers import FastJSONRenderer
+from ..urls import urlpatterns
+import datetime
+import decimal
+import uuid
+
+# Endpoints that don't render with DRF: streamed, plain text or async views
+NOT_RENDERED = {
+    "metrics",
+    "owner-export",
+    "pet-export",
+    "pet-estimate-batch",
+    "job-output",
+    "async-pet-retrieve",
+    "async-pet-medical-condition-list",
+    "async-pet-estimate",
+}
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    def assertSameBytes(self, data):
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_types(self):
+        self.assertSameBytes(
+            {
+                "id": uuid.uuid4(),
+                "ids": (uuid.uuid4(), uuid.uuid4()),
+                "name": 'Zoë    \x00 "quoted"',
+                "cost": 1234.5,
+                "small": 0.1,
+                "decimal": decimal.Decimal("1.25"),
+                "created_at": timezone.now(),
+                "date": datetime.date(2024, 1, 2),
+                "eligible": True,
+                "reason": None,
+                1: [],
+            }
+        )
+
+    def test_non_str_keys(self):
+        self.assertSameBytes({1: "a", 2.5: "b", True: "c", None: "d"})
+        for renderer in (FastJSONRenderer(), JSONRenderer()):
+            with self.assertRaises(TypeError):
+                renderer.render({uuid.uuid4(): 1})
+
+    def test_exponents_and_big_integers(self):
+        self.assertSameBytes([1e16, 1e-05, 2.5e-07, "1e16", {"a": -1e22}])
+        self.assertSameBytes(1e16)
+        self.assertSameBytes({"count": 2**70})
+
+    def test_indent(self):
+        # Act
+        content = FastJSONRenderer().render({"a": 1}, "application/json; indent=2")
+
+        # Assert
+        self.assertEqual(content, b'{\n  "a": 1\n}')
+
+    def test_without_orjson(self):
+        # Arrange
+        data = {"id": uuid.uuid4(), "name": "Zoë"}
+
+        # Act
+        with mock.patch("core.renderers.orjson", None):
+            content = FastJSONRenderer().render(data)
+
+        # Assert
+        self.assertEqual(content, JSONRenderer().render(data))
+
+
+class RendererParityTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.owner = Owner.objects.create(
+            first_name="Zoë", last_name="Smith", province="ON"
+        )
+        self.pet = Pet.objects.create(
+            name="Buddy", species=Species.DOG, age=3, owner=self.owner
+        )
+        self.condition = PetMedicalCondition.objects.create(
+            pet=self.pet, condition=MedicalCondition.DIABETES
+        )
+        self.job = Job.objects.create(kind=JobKind.REFRESH_ESTIMATES)
+        pet = {"pk": self.pet.id}
+        # (url name, method, url kwargs, body) for every DRF endpoint, with
+        # error responses too
+        self.requests = [
+            ("owner-list-create", "get", {}, None),
+            ("owner-list-create", "post", {}, {"first_name": "Ann"}),
+            (
+                "owner-list-create",
+                "post",
+                {},
+                [{"first_name": "Ann", "last_name": "Lee", "province": "QC"}],
+            ),
+            ("owner-retrieve-update-destroy", "get", {"pk": self.owner.id}, None),
+            ("owner-retrieve-update-destroy", "get", {"pk": uuid.uuid4()}, None),
+            (
+                "owner-retrieve-update-destroy",
+                "patch",
+                {"pk": self.owner.id},
+                {"last_name": "Doe"},
+            ),
+            ("owner-pet-list", "get", {"pk": self.owner.id}, None),
+            ("pet-list-create", "get", {}, None),
+            (
+                "pet-list-create",
+                "post",
+                {},
+                {"name": "Rex", "species": "DOG", "age": 2, "owner": self.owner.id},
+            ),
+            ("pet-retrieve-update-destroy", "get", pet, None),
+            ("pet-retrieve-update-destroy", "patch", pet, {"age": -1}),
+            ("pet-medical-condition-list-create", "get", pet, None),
+            ("pet-medical-condition-list-create", "post", pet, {"condition": "CANCER"}),
+            (
+                "pet-medical-condition-list-create",
+                "post",
+                pet,
+                {"condition": "DIABETES"},
+            ),
+            (
+                "pet-medical-condition-destroy",
+                "delete",
+                {"pk": self.pet.id, "condition_pk": self.condition.id},
+                None,
+            ),
+            ("pet-estimate", "post", pet, None),
+            ("pet-estimate", "post", {"pk": uuid.uuid4()}, None),
+            ("estimate-cache-stats", "get", {}, None),
+            ("portfolio-stats", "get", {}, None),
+            ("job-create", "post", {}, {"kind": "export", "params": {"model": "pets"}}),
+            ("job-create", "post", {}, {"kind": "export", "params": {}}),
+            ("job-retrieve", "get", {"pk": self.job.id}, None),
+        ]
+
+    def test_every_endpoint_is_covered(self):
+        covered = {name for name, *_ in self.requests}
+        self.assertEqual(
+            covered | NOT_RENDERED, {pattern.name for pattern in urlpatterns}
+        )
+
+    def test_matches_json_renderer(self):
+        for name, method, kwargs, body in self.requests:
+            with self.subTest(name=name, method=method, body=body):
+                # Act
+                response = getattr(self.client, method)(
+                    reverse(name, kwargs=kwargs), body, format="json"
+                )
+
+                # Assert
+                self.assertIsInstance(response.accepted_renderer, FastJSONRenderer)
+                self.assertEqual(
+                    response.content,
+                    JSONRenderer().render(
+                        response.data,
+                        response.accepted_media_type,
+                        response.renderer_context,
+                    ),
+                )
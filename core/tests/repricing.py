@@ -0,0 +1,110 @@
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from io import StringIO
+from unittest import skipUnless
+from ..models import Pet, PetMedicalCondition, Owner, MedicalCondition, Species
+from ..underwriting import engine
+import csv
+import importlib.util
+import os
+import random
+import tempfile
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+
+@skipUnless(HAS_NUMPY, "reprice_portfolio requires NumPy")
+class RepricePortfolioTests(TestCase):
+    def setUp(self):
+        rng = random.Random(0)
+        owners = [
+            Owner.objects.create(first_name="A", last_name="B", province=province)
+            for province in ["ON", "BC", "QC", "AB"]
+        ]
+        for i in range(60):
+            pet = Pet.objects.create(
+                name=f"Pet {i}",
+                species=rng.choice(Species.values),
+                age=rng.randint(0, 12),
+                owner=rng.choice(owners),
+            )
+            for condition in rng.sample(MedicalCondition.values, rng.randint(0, 2)):
+                PetMedicalCondition.objects.create(pet=pet, condition=condition)
+
+    def test_vectorized_prices_match_engine(self):
+        from ..repricing import PROVINCES, SPECIES, pet_batches, reprice
+
+        # Act
+        priced = {}
+        for rows in pet_batches(batch_size=7):
+            province, species, eligible, costs = reprice(engine, rows)
+            for row, p, s, e, cost in zip(rows, province, species, eligible, costs):
+                self.assertEqual((PROVINCES[p], SPECIES[s]), (row[3], row[1]))
+                priced[row[0]] = (bool(e), None if cost != cost else float(cost))
+
+        # Assert
+        expected = {
+            pet.id: (estimate.eligible, estimate.cost_of_insurance)
+            for pet in Pet.objects.with_estimate_inputs()
+            for estimate in [pet.estimate()]
+        }
+        self.assertEqual(priced, expected)
+
+    def test_command_summary_and_csv(self):
+        # Arrange
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "prices.csv")
+
+            # Act
+            out = StringIO()
+            call_command(
+                "reprice_portfolio",
+                "--multiplier",
+                "QC=2",
+                "--batch-size",
+                "9",
+                "--output",
+                path,
+                stdout=out,
+            )
+            with open(path) as file:
+                rows = list(csv.DictReader(file))
+
+        # Assert
+        self.assertIn("Repriced 60 pets", out.getvalue())
+        self.assertEqual(len(rows), 60)
+        for row in rows:
+            pet = Pet.objects.with_estimate_inputs().get(id=row["id"])
+            estimate = pet.estimate()
+            if not estimate.eligible:
+                self.assertEqual(row["cost_of_insurance"], "")
+            elif row["province"] == "QC":
+                self.assertAlmostEqual(
+                    float(row["cost_of_insurance"]),
+                    estimate.cost_of_insurance + pet.age * 2,
+                )
+            else:
+                self.assertEqual(
+                    float(row["cost_of_insurance"]), estimate.cost_of_insurance
+                )
+
+    def test_command_rejects_unknown_province(self):
+        with self.assertRaises(CommandError):
+            call_command("reprice_portfolio", "--multiplier", "XX=2", stdout=StringIO())
+
+    def test_command_rejects_unknown_province_in_data(self):
+        # Arrange
+        Owner.objects.filter(province="AB").update(province="XX")
+
+        # Act
+        with self.assertRaisesMessage(CommandError, "Unknown province XX."):
+            call_command("reprice_portfolio", stdout=StringIO())
+
+    def test_command_rejects_unknown_species_in_data(self):
+        # Arrange
+        Pet.objects.filter(pk=Pet.objects.first().pk).update(species="XX")
+
+        # Act
+        with self.assertRaisesMessage(CommandError, "Unknown species XX."):
+            call_command("reprice_portfolio", stdout=StringIO())
@@ -0,0 +1,177 @@
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from django.urls import reverse
+from io import StringIO
+from ..estimates import refresh
+from ..models import (
+    MedicalCondition,
+    Owner,
+    Pet,
+    PetEstimate,
+    PetMedicalCondition,
+    Species,
+)
+from ..risk import summary_mismatches
+
+
+class PetRiskSummaryTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.owner = Owner.objects.create(
+            first_name="John", last_name="Smith", province="ON"
+        )
+        self.pet = Pet.objects.create(
+            name="Rocky", species=Species.DOG, age=4, owner=self.owner
+        )
+        self.url = reverse(
+            "pet-medical-condition-list-create", kwargs={"pk": self.pet.id}
+        )
+
+    def estimate(self):
+        return self.client.post(
+            reverse("pet-estimate", kwargs={"pk": self.pet.id})
+        ).data
+
+    def summary(self):
+        pet = Pet.objects.get(id=self.pet.id)
+        return pet.has_cancer, pet.diabetes_count, pet.other_condition_count
+
+    def test_summary_follows_created_and_deleted_conditions(self):
+        # Act / Assert
+        self.client.post(self.url, {"condition": MedicalCondition.DIABETES})
+        self.client.post(
+            self.url,
+            [
+                {"condition": MedicalCondition.HEART_DISEASE},
+                {"condition": MedicalCondition.OTHER},
+                {"condition": MedicalCondition.CANCER},
+            ],
+            format="json",
+        )
+        self.assertEqual(self.summary(), (True, 1, 2))
+
+        cancer = PetMedicalCondition.objects.get(
+            pet=self.pet, condition=MedicalCondition.CANCER
+        )
+        response = self.client.delete(
+            reverse(
+                "pet-medical-condition-destroy",
+                kwargs={"pk": self.pet.id, "condition_pk": cancer.id},
+            )
+        )
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.summary(), (False, 1, 2))
+        self.assertFalse(summary_mismatches().exists())
+
+    def test_delete_condition_of_another_pet_not_found(self):
+        # Arrange
+        other_pet = Pet.objects.create(
+            name="Rex", species=Species.DOG, age=2, owner=self.owner
+        )
+        condition = PetMedicalCondition.objects.create(
+            pet=other_pet, condition=MedicalCondition.OTHER
+        )
+
+        # Act
+        response = self.client.delete(
+            reverse(
+                "pet-medical-condition-destroy",
+                kwargs={"pk": self.pet.id, "condition_pk": condition.id},
+            )
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertTrue(PetMedicalCondition.objects.filter(id=condition.id).exists())
+
+    def test_changing_a_condition_recounts(self):
+        # Arrange
+        condition = PetMedicalCondition.objects.create(
+            pet=self.pet, condition=MedicalCondition.DIABETES
+        )
+
+        # Act
+        condition.condition = MedicalCondition.CANCER
+        condition.save()
+
+        # Assert
+        self.assertEqual(self.summary(), (True, 0, 0))
+
+    def test_pet_save_does_not_overwrite_summary(self):
+        # Arrange
+        stale = Pet.objects.get(id=self.pet.id)
+        PetMedicalCondition.objects.create(
+            pet=self.pet, condition=MedicalCondition.OTHER
+        )
+
+        # Act
+        stale.name = "Rocky II"
+        stale.save()
+
+        # Assert
+        self.assertEqual(self.summary(), (False, 0, 1))
+
+    def test_estimate_does_not_read_conditions(self):
+        # Arrange
+        PetMedicalCondition.objects.create(
+            pet=self.pet, condition=MedicalCondition.DIABETES
+        )
+
+        # Act
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                reverse("pet-estimate", kwargs={"pk": self.pet.id})
+            )
+
+        # Assert
+        self.assertEqual(
+            response.data, {"eligible": True, "costOfInsurance": 20.0, "rateVersion": 1}
+        )
+        self.assertNotIn(
+            PetMedicalCondition._meta.db_table, " ".join(q["sql"] for q in queries)
+        )
+
+    def test_rebuild_command_repairs_and_verifies(self):
+        # Arrange
+        PetMedicalCondition.objects.create(
+            pet=self.pet, condition=MedicalCondition.CANCER
+        )
+        Pet.objects.filter(id=self.pet.id).update(has_cancer=False, diabetes_count=3)
+
+        # Act / Assert
+        with self.assertRaises(CommandError):
+            call_command("rebuild_risk_summaries", "--verify-only", stderr=StringIO())
+        call_command("rebuild_risk_summaries", stdout=StringIO())
+        self.assertEqual(self.summary(), (True, 0, 0))
+        call_command("rebuild_risk_summaries", "--verify-only", stdout=StringIO())
+
+    def test_rebuild_command_invalidates_estimates(self):
+        # Arrange
+        PetMedicalCondition.objects.create(
+            pet=self.pet, condition=MedicalCondition.DIABETES
+        )
+        other = Pet.objects.create(
+            name="Tom", species=Species.CAT, age=2, owner=self.owner
+        )
+        # The summary drifts and a refresh computes the estimate from it
+        Pet.objects.filter(id=self.pet.id).update(diabetes_count=0)
+        self.pet.save()
+        refresh()
+        self.assertEqual(self.estimate()["costOfInsurance"], 12.0)
+
+        # Act
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("rebuild_risk_summaries", stdout=StringIO())
+
+        # Assert
+        self.assertEqual(self.estimate()["costOfInsurance"], 20.0)
+        self.assertEqual(
+            list(PetEstimate.objects.filter(dirty=True).values_list("pet", flat=True)),
+            [self.pet.id],
+        )
+        self.assertFalse(PetEstimate.objects.get(pet=other).dirty)
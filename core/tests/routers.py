@@ -0,0 +1,160 @@
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.http import (
+    HttpResponse,
+    HttpResponsePermanentRedirect,
+    StreamingHttpResponse,
+)
+from django.test import RequestFactory, SimpleTestCase
+from django.urls import resolve, reverse
+from unittest import mock
+from ..management.commands.sync_replica import Command as SyncReplicaCommand
+from ..models import Pet
+from ..routers import STICKY_COOKIE, ReplicaRouter, ReplicaRoutingMiddleware
+import os
+import sqlite3
+import tempfile
+import time
+import uuid
+
+
+class ReplicaRoutingTests(SimpleTestCase):
+    def setUp(self):
+        patcher = mock.patch("core.routers.replica_configured", return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.router = ReplicaRouter()
+        self.middleware = ReplicaRoutingMiddleware(self.view)
+        self.factory = RequestFactory()
+
+    def view(self, request):
+        # What Django's handler does between the middleware and the view
+        request.resolver_match = resolve(request.path_info)
+        self.middleware.process_view(request, None, (), {})
+        return HttpResponse(self.router.db_for_read(Pet))
+
+    def request(self, method, path, cookies=None):
+        request = getattr(self.factory, method)(path)
+        request.COOKIES.update(cookies or {})
+        return self.middleware(request)
+
+    def test_router_defaults(self):
+        self.assertEqual(self.router.db_for_read(Pet), "default")
+        self.assertEqual(self.router.db_for_write(Pet), "default")
+        self.assertFalse(self.router.allow_migrate("replica", "core"))
+        self.assertTrue(self.router.allow_migrate("default", "core"))
+
+    def test_reads_use_replica(self):
+        # Act
+        response = self.request("get", reverse("pet-list-create"))
+
+        # Assert
+        self.assertEqual(response.content, b"replica")
+        self.assertNotIn(STICKY_COOKIE, response.cookies)
+        self.assertEqual(self.router.db_for_read(Pet), "default")
+
+    def test_estimates_use_replica(self):
+        # Act
+        response = self.request(
+            "post", reverse("pet-estimate", kwargs={"pk": uuid.uuid4()})
+        )
+
+        # Assert
+        self.assertEqual(response.content, b"replica")
+        self.assertNotIn(STICKY_COOKIE, response.cookies)
+
+    def test_writes_use_default_and_stick(self):
+        # Arrange
+        url = reverse("pet-medical-condition-list-create", kwargs={"pk": uuid.uuid4()})
+
+        # Act
+        response = self.request("post", url)
+
+        # Assert
+        self.assertEqual(response.content, b"default")
+        cookie = response.cookies[STICKY_COOKIE]
+        self.assertGreater(float(cookie.value), time.time())
+
+        # A read right after the write sees it on default
+        response = self.request("get", url, {STICKY_COOKIE: cookie.value})
+        self.assertEqual(response.content, b"default")
+
+    def test_expired_stickiness(self):
+        # Act
+        response = self.request(
+            "get", reverse("pet-list-create"), {STICKY_COOKIE: str(time.time() - 1)}
+        )
+
+        # Assert
+        self.assertEqual(response.content, b"replica")
+
+    def test_streaming_content_is_routed(self):
+        # Arrange
+        def view(request):
+            self.view(request)
+            return StreamingHttpResponse(self.router.db_for_read(Pet) for _ in range(2))
+
+        self.middleware = ReplicaRoutingMiddleware(view)
+
+        # Act
+        response = self.request("get", reverse("pet-export"))
+
+        # Assert
+        self.assertEqual(b"".join(response.streaming_content), b"replicareplica")
+        self.assertEqual(self.router.db_for_read(Pet), "default")
+
+    def test_redirects_do_not_stick(self):
+        # Arrange
+        self.middleware = ReplicaRoutingMiddleware(
+            lambda request: HttpResponsePermanentRedirect("/api/pets/")
+        )
+
+        # Act
+        response = self.request("post", "/api/pets")
+
+        # Assert
+        self.assertNotIn(STICKY_COOKIE, response.cookies)
+
+    async def test_async_requests(self):
+        # Arrange
+        async def view(request):
+            # What Django's async handler does for a sync process_view
+            request.resolver_match = resolve(request.path_info)
+            await sync_to_async(self.middleware.process_view)(request, None, (), {})
+            return HttpResponse(self.router.db_for_read(Pet))
+
+        self.middleware = ReplicaRoutingMiddleware(view)
+
+        # Act
+        response = await self.middleware(self.factory.get(reverse("pet-list-create")))
+
+        # Assert
+        self.assertTrue(iscoroutinefunction(self.middleware))
+        self.assertEqual(response.content, b"replica")
+        self.assertEqual(self.router.db_for_read(Pet), "default")
+
+
+class SyncReplicaTests(SimpleTestCase):
+    def test_copies_database(self):
+        # Arrange
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        source = os.path.join(directory.name, "default.sqlite3")
+        target = os.path.join(directory.name, "replica.sqlite3")
+        with sqlite3.connect(source) as db:
+            db.execute("CREATE TABLE pet (name TEXT)")
+            db.execute("INSERT INTO pet VALUES ('Rex')")
+        db.close()
+
+        # Act
+        SyncReplicaCommand.sync(source, target)
+
+        # Assert
+        db = sqlite3.connect(target)
+        self.addCleanup(db.close)
+        self.assertEqual(db.execute("SELECT name FROM pet").fetchall(), [("Rex",)])
+
+    def test_requires_replica(self):
+        with self.assertRaises(CommandError):
+            call_command("sync_replica")
@@ -0,0 +1,47 @@
+from django.db import connection, connections
+from django.test import SimpleTestCase, override_settings
+from unittest import skipUnless
+import os
+import tempfile
+
+
+@skipUnless(connection.vendor == "sqlite", "SQLite pragmas")
+class SQLitePragmaTests(SimpleTestCase):
+    def connect(self):
+        """Open a new connection to a database file, like a new worker would."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings_dict = {
+            **connection.settings_dict,
+            "NAME": os.path.join(directory.name, "db.sqlite3"),
+        }
+        wrapper = type(connections["default"])(settings_dict, alias="pragma-test")
+        wrapper.connect()
+        self.addCleanup(wrapper.close)
+        return wrapper
+
+    def pragma(self, wrapper, name):
+        with wrapper.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    def test_pragmas_applied_on_connect(self):
+        # Act
+        wrapper = self.connect()
+
+        # Assert
+        self.assertEqual(self.pragma(wrapper, "journal_mode"), "wal")
+        # NORMAL
+        self.assertEqual(self.pragma(wrapper, "synchronous"), 1)
+        self.assertEqual(self.pragma(wrapper, "cache_size"), -64_000)
+        self.assertEqual(self.pragma(wrapper, "busy_timeout"), 5000)
+
+    @override_settings(SQLITE_PRAGMAS={})
+    def test_defaults_without_tuning(self):
+        # Act
+        wrapper = self.connect()
+
+        # Assert
+        self.assertEqual(self.pragma(wrapper, "journal_mode"), "delete")
+        # FULL
+        self.assertEqual(self.pragma(wrapper, "synchronous"), 2)
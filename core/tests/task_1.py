@@ -27,7 +27,7 @@ class PetMedicalConditionTests(TestCase):
 
         # Assert
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data["results"]), 2)
 
     # Test that medical conditions cannot be retrieved for a non-existent pet
     def test_list_medical_conditions_not_found(self):
@@ -0,0 +1,104 @@
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+from django.urls import reverse
+from ..models import Pet, PetMedicalCondition, Owner, MedicalCondition, Species
+import uuid
+
+
+class OwnerPetListTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.owner = Owner.objects.create(
+            first_name="John", last_name="Smith", province="ON"
+        )
+        self.other_owner = Owner.objects.create(
+            first_name="Jane", last_name="Doe", province="BC"
+        )
+
+    def test_list_owner_pets_with_eligibility(self):
+        # Arrange
+        dog = Pet.objects.create(
+            name="Dodge", species=Species.DOG, age=3, owner=self.owner
+        )
+        old_cat = Pet.objects.create(
+            name="Shadow", species=Species.CAT, age=11, owner=self.owner
+        )
+        sick_cat = Pet.objects.create(
+            name="Mittens", species=Species.CAT, age=2, owner=self.owner
+        )
+        PetMedicalCondition.objects.create(
+            pet=sick_cat, condition=MedicalCondition.CANCER
+        )
+        bird = Pet.objects.create(
+            name="Tweety", species=Species.BIRD, age=1, owner=self.owner
+        )
+        Pet.objects.create(
+            name="Rex", species=Species.DOG, age=2, owner=self.other_owner
+        )
+
+        # Act
+        response = self.client.get(
+            reverse("owner-pet-list", kwargs={"pk": self.owner.id})
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        pets = {pet["id"]: pet for pet in response.data["results"]}
+        self.assertEqual(
+            pets[str(dog.id)],
+            {"id": str(dog.id), "name": "Dodge", "species": "DOG", "eligible": True},
+        )
+        self.assertFalse(pets[str(old_cat.id)]["eligible"])
+        self.assertFalse(pets[str(sick_cat.id)]["eligible"])
+        self.assertFalse(pets[str(bird.id)]["eligible"])
+        self.assertEqual(len(pets), 4)
+
+    def test_list_owner_pets_fixed_query_count(self):
+        # Arrange
+        for i in range(30):
+            pet = Pet.objects.create(
+                name=f"Pet {i}", species=Species.DOG, age=i % 10, owner=self.owner
+            )
+            PetMedicalCondition.objects.create(
+                pet=pet, condition=MedicalCondition.DIABETES
+            )
+
+        # Act
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                reverse("owner-pet-list", kwargs={"pk": self.owner.id})
+            )
+
+        # Assert
+        self.assertEqual(len(response.data["results"]), 30)
+
+    def test_list_owner_pets_cursor_pagination(self):
+        # Arrange
+        for i in range(5):
+            Pet.objects.create(
+                name=f"Pet {i}", species=Species.CAT, age=1, owner=self.owner
+            )
+        url = reverse("owner-pet-list", kwargs={"pk": self.owner.id})
+
+        # Act
+        seen = []
+        response = self.client.get(url, {"page_size": 2})
+        while True:
+            seen.extend(pet["id"] for pet in response.data["results"])
+            if not response.data["next"]:
+                break
+            response = self.client.get(response.data["next"])
+
+        # Assert
+        self.assertEqual(len(seen), 5)
+        self.assertEqual(len(set(seen)), 5)
+
+    def test_list_owner_pets_not_found(self):
+        # Act
+        response = self.client.get(
+            reverse("owner-pet-list", kwargs={"pk": uuid.uuid4()})
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
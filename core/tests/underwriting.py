@@ -0,0 +1,152 @@
+from django.test import SimpleTestCase, TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+from django.urls import reverse
+from ..models import Pet, PetMedicalCondition, Owner, MedicalCondition, Species
+from ..underwriting import (
+    DEFAULT_RULES,
+    REASON_AGE,
+    REASON_HEALTH,
+    REASON_SPECIES,
+    compile_rules,
+)
+
+
+class RulesEngineTests(SimpleTestCase):
+    def setUp(self):
+        self.engine = compile_rules(DEFAULT_RULES)
+
+    def test_species_not_insurable(self):
+        estimate = self.engine.evaluate(Species.BIRD, 2, "ON")
+        self.assertFalse(estimate.eligible)
+        self.assertEqual(estimate.reason, REASON_SPECIES)
+
+    def test_age_limits(self):
+        self.assertTrue(self.engine.evaluate(Species.DOG, 8, "AB").eligible)
+        self.assertEqual(self.engine.evaluate(Species.DOG, 9, "AB").reason, REASON_AGE)
+        self.assertTrue(self.engine.evaluate(Species.CAT, 10, "AB").eligible)
+        self.assertEqual(self.engine.evaluate(Species.CAT, 11, "AB").reason, REASON_AGE)
+
+    def test_province_multipliers(self):
+        self.assertEqual(
+            self.engine.evaluate(Species.DOG, 3, "ON").cost_of_insurance, 9.0
+        )
+        self.assertEqual(
+            self.engine.evaluate(Species.CAT, 5, "BC").cost_of_insurance, 12.5
+        )
+        self.assertEqual(
+            self.engine.evaluate(Species.DOG, 3, "QC").cost_of_insurance, 6.0
+        )
+
+    def test_condition_surcharges(self):
+        conditions = [
+            MedicalCondition.DIABETES,
+            MedicalCondition.HEART_DISEASE,
+            MedicalCondition.OTHER,
+        ]
+        estimate = self.engine.evaluate(Species.DOG, 4, "ON", conditions)
+        # $8 * 1.5 = $12, plus $8 + $5 + $5
+        self.assertEqual(estimate.cost_of_insurance, 30.0)
+
+    def test_cancer_is_ineligible(self):
+        conditions = [MedicalCondition.DIABETES, MedicalCondition.CANCER]
+        estimate = self.engine.evaluate(Species.CAT, 2, "ON", conditions)
+        self.assertFalse(estimate.eligible)
+        self.assertEqual(estimate.reason, REASON_HEALTH)
+
+    def test_evaluate_counts_matches_evaluate(self):
+        counts = {MedicalCondition.DIABETES: 2, MedicalCondition.OTHER: 1}
+        conditions = [
+            MedicalCondition.DIABETES,
+            MedicalCondition.DIABETES,
+            MedicalCondition.OTHER,
+        ]
+        self.assertEqual(
+            self.engine.evaluate_counts(Species.CAT, 7, "BC", counts),
+            self.engine.evaluate(Species.CAT, 7, "BC", conditions),
+        )
+        self.assertEqual(
+            self.engine.evaluate_counts(
+                Species.CAT, 7, "BC", {MedicalCondition.CANCER: 1}
+            ).reason,
+            REASON_HEALTH,
+        )
+
+    def test_only_priced_conditions_have_their_own_surcharge(self):
+        rules = {
+            **DEFAULT_RULES,
+            "condition_surcharges": {MedicalCondition.HEART_DISEASE: None},
+        }
+        with self.assertRaisesMessage(ValueError, "not HEART_DISEASE"):
+            compile_rules(rules)
+
+    def test_as_dict(self):
+        self.assertEqual(
+            self.engine.evaluate(Species.DOG, 1, "AB").as_dict(),
+            {"eligible": True, "costOfInsurance": 2.0},
+        )
+        self.assertEqual(
+            self.engine.evaluate(Species.FISH, 1, "AB").as_dict(),
+            {"eligible": False, "reason": REASON_SPECIES},
+        )
+
+
+class PetEstimateEngineTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.owner = Owner.objects.create(
+            first_name="John", last_name="Smith", province="ON"
+        )
+
+    def test_estimate_uses_engine(self):
+        # Arrange
+        pet = Pet.objects.create(
+            name="Rocky", species=Species.DOG, age=4, owner=self.owner
+        )
+        PetMedicalCondition.objects.create(pet=pet, condition=MedicalCondition.DIABETES)
+
+        # Act
+        response = self.client.post(reverse("pet-estimate", kwargs={"pk": pet.id}))
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data, {"eligible": True, "costOfInsurance": 20.0, "rateVersion": 1}
+        )
+
+    def test_estimate_ineligible_species(self):
+        # Arrange
+        pet = Pet.objects.create(
+            name="Nemo", species=Species.FISH, age=1, owner=self.owner
+        )
+
+        # Act
+        response = self.client.post(reverse("pet-estimate", kwargs={"pk": pet.id}))
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data, {"eligible": False, "reason": "SPECIES", "rateVersion": 1}
+        )
+
+    def test_estimate_single_query(self):
+        # Arrange
+        pet = Pet.objects.create(
+            name="Charlie", species=Species.DOG, age=5, owner=self.owner
+        )
+        PetMedicalCondition.objects.create(
+            pet=pet, condition=MedicalCondition.HEART_DISEASE
+        )
+        PetMedicalCondition.objects.create(pet=pet, condition=MedicalCondition.OTHER)
+        PetMedicalCondition.objects.create(pet=pet, condition=MedicalCondition.DIABETES)
+
+        # Act
+        with self.assertNumQueries(1):
+            response = self.client.post(reverse("pet-estimate", kwargs={"pk": pet.id}))
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # $10 * 1.5 = $15, plus $5 + $5 + $8
+        self.assertEqual(
+            response.data, {"eligible": True, "costOfInsurance": 33.0, "rateVersion": 1}
+        )
@@ -0,0 +1,88 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import serializers, status
+from rest_framework.test import APIClient
+from unittest import mock
+from ..models import MedicalCondition, Owner, Pet, PetMedicalCondition, Species
+from ..serializers import OwnerSerializer, PetSerializer, ValuesSerializer
+from ..views import ValuesListMixin
+
+
+class ValuesSerializerTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.owner = Owner.objects.create(
+            first_name="Zoë", last_name="Smith", province="ON"
+        )
+        self.pets = [
+            Pet.objects.create(
+                name=f"Pet {i}", species=species, age=i, owner=self.owner
+            )
+            for i, species in enumerate([Species.DOG, Species.CAT, Species.DOG] * 2)
+        ]
+        PetMedicalCondition.objects.create(
+            pet=self.pets[0], condition=MedicalCondition.CANCER
+        )
+        PetMedicalCondition.objects.create(
+            pet=self.pets[0], condition=MedicalCondition.DIABETES
+        )
+
+    def assertSameResponses(self, url):
+        """Every page is the same byte for byte with and without the fast path."""
+        url = f"{url}?page_size=4"
+        while url:
+            fast = self.client.get(url)
+            with mock.patch.object(ValuesListMixin, "use_values", False):
+                slow = self.client.get(url)
+            self.assertEqual(fast.status_code, status.HTTP_200_OK)
+            self.assertEqual(fast.content, slow.content)
+            url = fast.data["next"]
+
+    def test_owner_list(self):
+        self.assertSameResponses(reverse("owner-list-create"))
+
+    def test_pet_list(self):
+        self.assertSameResponses(reverse("pet-list-create"))
+
+    def test_owner_pet_list(self):
+        self.assertSameResponses(
+            reverse("owner-pet-list", kwargs={"pk": self.owner.id})
+        )
+
+    def test_medical_condition_list(self):
+        self.assertSameResponses(
+            reverse("pet-medical-condition-list-create", kwargs={"pk": self.pets[0].id})
+        )
+
+    def test_maps_rows(self):
+        # Arrange
+        pet = self.pets[0]
+        values = ValuesSerializer.for_serializer(PetSerializer)
+        rows = Pet.objects.filter(id=pet.id).values_list(*values.columns, "created_at")
+
+        # Act
+        data = values.to_representation(rows[0])
+
+        # Assert
+        self.assertEqual(data, PetSerializer(pet).data)
+        self.assertIs(ValuesSerializer.for_serializer(PetSerializer), values)
+
+    def test_nulls(self):
+        # Arrange
+        values = ValuesSerializer.for_serializer(OwnerSerializer)
+
+        # Act
+        data = values.to_representation((None, "John", "Smith", "ON"))
+
+        # Assert
+        self.assertIsNone(data["id"])
+
+    def test_unsupported_fields(self):
+        # Arrange
+        class PetNameSerializer(serializers.Serializer):
+            owner_name = serializers.CharField(source="owner.first_name")
+
+        # Act / Assert
+        with self.assertRaises(ImproperlyConfigured):
+            ValuesSerializer(PetNameSerializer)
@@ -0,0 +1,188 @@
+"""
+Underwriting rules engine.
+
+The rules from the README are described as plain data (``DEFAULT_RULES``) and
+compiled once into lookup tables by ``compile_rules``. Evaluating a pet is then
+one dict lookup per factor (species, province, each condition) with no
+branching over the model enums, so this module deliberately does not import
+anything from Django.
+"""
+
+from dataclasses import dataclass, replace
+from typing import Iterable, Mapping, Optional
+
+# Conditions a rate table can price on their own. The pets' risk summary
+# columns count every other condition together, so those share the default
+# surcharge
+PRICED_CONDITIONS = frozenset({"CANCER", "DIABETES"})
+
+# Reasons returned for ineligible pets
+REASON_SPECIES = "SPECIES"
+REASON_AGE = "AGE"
+REASON_HEALTH = "HEALTH"
+
+
+DEFAULT_RULES = {
+    # Cost per year of age, before the province multiplier
+    "base_cost_per_year": 2.0,
+    # Insurable species and their maximum age (inclusive)
+    "max_age_by_species": {"DOG": 8, "CAT": 10},
+    # Province multipliers, provinces not listed use 1.0
+    "province_multipliers": {"ON": 1.5, "BC": 1.25},
+    # Surcharge per condition among PRICED_CONDITIONS, a surcharge of None
+    # makes the pet ineligible
+    "condition_surcharges": {"CANCER": None, "DIABETES": 8.0},
+    # Surcharge for any condition not listed above
+    "default_condition_surcharge": 5.0,
+}
+
+
+@dataclass(frozen=True)
+class Estimate:
+    eligible: bool
+    cost_of_insurance: Optional[float] = None
+    reason: Optional[str] = None
+    # Version of the rate table the estimate was computed with, if any
+    rate_version: Optional[int] = None
+
+    def as_dict(self):
+        """Return the estimate in the shape of ``PetEstimateSerializer``."""
+        if self.eligible:
+            data = {"eligible": True, "costOfInsurance": self.cost_of_insurance}
+        else:
+            data = {"eligible": False, "reason": self.reason}
+        if self.rate_version is not None:
+            data["rateVersion"] = self.rate_version
+        return data
+
+
+INELIGIBLE_SPECIES = Estimate(eligible=False, reason=REASON_SPECIES)
+INELIGIBLE_AGE = Estimate(eligible=False, reason=REASON_AGE)
+INELIGIBLE_HEALTH = Estimate(eligible=False, reason=REASON_HEALTH)
+
+
+class RulesEngine:
+    """Compiled underwriting rules, build one with ``compile_rules``."""
+
+    def __init__(
+        self,
+        base_cost_per_year,
+        max_age_by_species,
+        province_multipliers,
+        condition_surcharges,
+        default_condition_surcharge,
+        version=None,
+    ):
+        self.version = version
+        self.base_cost_per_year = float(base_cost_per_year)
+        self.max_age_by_species = dict(max_age_by_species)
+        self.province_multipliers = {
+            province: float(multiplier)
+            for province, multiplier in province_multipliers.items()
+        }
+        self.condition_surcharges = {
+            condition: None if surcharge is None else float(surcharge)
+            for condition, surcharge in condition_surcharges.items()
+        }
+        self.default_condition_surcharge = float(default_condition_surcharge)
+        self.veto_conditions = frozenset(
+            condition
+            for condition, surcharge in self.condition_surcharges.items()
+            if surcharge is None
+        )
+
+        # Province cost per year of age, so the base cost and the multiplier
+        # are folded into a single lookup
+        self._cost_per_year = {
+            province: self.base_cost_per_year * multiplier
+            for province, multiplier in self.province_multipliers.items()
+        }
+
+        # Ineligible results are shared, tagged with the rate version
+        self._ineligible_species = replace(INELIGIBLE_SPECIES, rate_version=version)
+        self._ineligible_age = replace(INELIGIBLE_AGE, rate_version=version)
+        self._ineligible_health = replace(INELIGIBLE_HEALTH, rate_version=version)
+
+    def cost_per_year(self, province):
+        return self._cost_per_year.get(province, self.base_cost_per_year)
+
+    def surcharge(self, condition):
+        """Return the surcharge for a condition, None if it vetoes the pet."""
+        return self.condition_surcharges.get(
+            condition, self.default_condition_surcharge
+        )
+
+    def evaluate(self, species, age, province, conditions: Iterable[str] = ()):
+        """Estimate a pet from its list of medical condition codes."""
+        max_age = self.max_age_by_species.get(species)
+        if max_age is None:
+            return self._ineligible_species
+        if age > max_age:
+            return self._ineligible_age
+
+        surcharges = self.condition_surcharges
+        default = self.default_condition_surcharge
+        total = 0.0
+        for condition in conditions:
+            surcharge = surcharges.get(condition, default)
+            if surcharge is None:
+                return self._ineligible_health
+            total += surcharge
+
+        return self._eligible(age, province, total)
+
+    def evaluate_counts(self, species, age, province, counts: Mapping[str, int]):
+        """Estimate a pet from a mapping of condition code to occurrences."""
+        max_age = self.max_age_by_species.get(species)
+        if max_age is None:
+            return self._ineligible_species
+        if age > max_age:
+            return self._ineligible_age
+
+        surcharges = self.condition_surcharges
+        default = self.default_condition_surcharge
+        total = 0.0
+        for condition, count in counts.items():
+            if not count:
+                continue
+            surcharge = surcharges.get(condition, default)
+            if surcharge is None:
+                return self._ineligible_health
+            total += surcharge * count
+
+        return self._eligible(age, province, total)
+
+    def _eligible(self, age, province, surcharge):
+        cost = age * self._cost_per_year.get(province, self.base_cost_per_year)
+        return Estimate(
+            eligible=True,
+            cost_of_insurance=round(cost + surcharge, 2),
+            rate_version=self.version,
+        )
+
+
+def compile_rules(rules: Mapping = DEFAULT_RULES, version=None) -> RulesEngine:
+    """
+    Compile a rules description (see ``DEFAULT_RULES``) into an engine, the
+    version of the rate table it came from is recorded on its estimates.
+    Raises ValueError for a surcharge on a condition not in PRICED_CONDITIONS.
+    """
+    unknown = set(rules["condition_surcharges"]) - PRICED_CONDITIONS
+    if unknown:
+        raise ValueError(
+            f"Only {', '.join(sorted(PRICED_CONDITIONS))} can have their own "
+            f"surcharge, not {', '.join(sorted(unknown))}."
+        )
+    return RulesEngine(
+        base_cost_per_year=rules["base_cost_per_year"],
+        max_age_by_species=rules["max_age_by_species"],
+        province_multipliers=rules["province_multipliers"],
+        condition_surcharges=rules["condition_surcharges"],
+        default_condition_surcharge=rules["default_condition_surcharge"],
+        version=version,
+    )
+
+
+# The README rules, used when no rate table is in effect. Requests use the
+# engine of the active RateTable, see core.rates.
+engine = compile_rules()
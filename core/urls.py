@@ -1,22 +1,40 @@
 from django.urls import path
+from .async_views import (
+    AsyncPetRetrieveView,
+    AsyncPetMedicalConditionListView,
+    AsyncPetEstimateView,
+)
+from .metrics import metrics
 from .views import (
     OwnerListCreateView,
+    OwnerExportView,
     OwnerRetrieveUpdateDestroyView,
+    OwnerPetListView,
     PetListCreateView,
+    PetExportView,
     PetRetrieveUpdateDestroyView,
     PetMedicalConditionDestroyView,
     PetMedicalConditionListCreateView,
     PetEstimateView,
+    PetEstimateBatchView,
+    EstimateCacheStatsView,
+    PortfolioStatsView,
+    JobCreateView,
+    JobRetrieveView,
+    JobOutputView,
 )
 
 urlpatterns = [
+    path("_metrics", metrics, name="metrics"),
     path("owners/", OwnerListCreateView.as_view(), name="owner-list-create"),
+    path("owners/export", OwnerExportView.as_view(), name="owner-export"),
     path(
         "owners/<uuid:pk>/",
         OwnerRetrieveUpdateDestroyView.as_view(),
         name="owner-retrieve-update-destroy",
     ),
     path("pets/", PetListCreateView.as_view(), name="pet-list-create"),
+    path("pets/export", PetExportView.as_view(), name="pet-export"),
     path(
         "pets/<uuid:pk>/",
         PetRetrieveUpdateDestroyView.as_view(),
@@ -35,6 +53,33 @@ urlpatterns = [
     ),
     # Task 2
     path("pets/<uuid:pk>/estimate/", PetEstimateView.as_view(), name="pet-estimate"),
+    path("estimates/batch", PetEstimateBatchView.as_view(), name="pet-estimate-batch"),
+    path(
+        "estimates/cache",
+        EstimateCacheStatsView.as_view(),
+        name="estimate-cache-stats",
+    ),
+    path("stats/portfolio", PortfolioStatsView.as_view(), name="portfolio-stats"),
+    # Background jobs, run by manage.py run_workers
+    path("jobs", JobCreateView.as_view(), name="job-create"),
+    path("jobs/<uuid:pk>", JobRetrieveView.as_view(), name="job-retrieve"),
+    path("jobs/<uuid:pk>/output", JobOutputView.as_view(), name="job-output"),
+    # Async variants for ASGI deployments
+    path(
+        "async/pets/<uuid:pk>/",
+        AsyncPetRetrieveView.as_view(),
+        name="async-pet-retrieve",
+    ),
+    path(
+        "async/pets/<uuid:pk>/medical-conditions/",
+        AsyncPetMedicalConditionListView.as_view(),
+        name="async-pet-medical-condition-list",
+    ),
+    path(
+        "async/pets/<uuid:pk>/estimate/",
+        AsyncPetEstimateView.as_view(),
+        name="async-pet-estimate",
+    ),
     # Task 3
-    # path('owners/<int:pk>/pets/', PetListCreateView.as_view(), name='pet-list-create'),
+    path("owners/<uuid:pk>/pets/", OwnerPetListView.as_view(), name="owner-pet-list"),
 ]
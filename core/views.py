@@ -1,35 +1,218 @@
+import json
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.http import FileResponse, Http404, StreamingHttpResponse
+from django.urls import reverse
+from django.core.serializers.json import DjangoJSONEncoder
 from rest_framework.response import Response
 from rest_framework import generics, status
-from .models import Owner, Pet, PetMedicalCondition
+from .models import Job, JobStatus, Owner, Pet, PetMedicalCondition
+from .cache import estimate_cache
+from .deletion import (
+    delete_medical_conditions,
+    delete_owners,
+    delete_pets,
+    fast_deletes,
+)
+from .conditional import (
+    cached_estimate,
+    current_estimate_etag,
+    estimate_etag,
+    make_etag,
+    none_match,
+)
+from .estimates import current_estimate
+from .idempotency import idempotent
+from .jobs import output_path
+from . import portfolio
+from .rates import active_rates
+from .signals import medical_conditions_bulk_created
 from .serializers import (
+    BulkCreateListSerializer,
+    ValuesSerializer,
     OwnerSerializer,
     PetSerializer,
     PetMedicalConditionSerializer,
     PetMedicalConditionCreateSerializer,
+    PetMedicalConditionBulkDeleteSerializer,
     PetEstimateSerializer,
+    PetEstimateBatchSerializer,
+    OwnerPetSerializer,
+    JobSerializer,
 )
 
 
-class OwnerListCreateView(generics.ListCreateAPIView):
+class BulkCreateMixin:
+    """Accept a list payload on create, validated per item and bulk inserted."""
+
+    def get_serializer(self, *args, **kwargs):
+        if isinstance(kwargs.get("data"), list):
+            kwargs["many"] = True
+        return super().get_serializer(*args, **kwargs)
+
+
+class ValuesListMixin:
+    """
+    Opt-in fast path for list endpoints: pages are read as value rows and
+    mapped by the serializer's ``ValuesSerializer`` instead of loading model
+    instances and running the serializer fields on each of them. The response
+    is the same.
+    """
+
+    use_values = True
+
+    def list(self, request, *args, **kwargs):
+        return self.list_response(self.filter_queryset(self.get_queryset()))
+
+    def list_response(self, queryset):
+        if self.use_values:
+            values = ValuesSerializer.for_serializer(self.get_serializer_class())
+            columns = list(values.columns)
+            # The cursor of the next page is read from the last row
+            ordering = getattr(self.paginator, "ordering", ())
+            for field in [ordering] if isinstance(ordering, str) else ordering:
+                if field.lstrip("-") not in columns:
+                    columns.append(field.lstrip("-"))
+            queryset = queryset.values_list(*columns, named=True)
+
+        page = self.paginate_queryset(queryset)
+        rows = queryset if page is None else page
+        if self.use_values:
+            data = [values.to_representation(row) for row in rows]
+        else:
+            data = self.get_serializer(rows, many=True).data
+        if page is None:
+            return Response(data)
+        return self.get_paginated_response(data)
+
+
+class ConditionalRetrieveMixin:
+    """
+    Strong ETag from the object's ``revision`` on retrieve. A matching
+    If-None-Match is answered with 304 from the revision column alone.
+    """
+
+    def retrieve(self, request, *args, **kwargs):
+        if "If-None-Match" in request.headers:
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            revision = (
+                self.filter_queryset(self.get_queryset())
+                .filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+                .values_list("revision", flat=True)
+                .first()
+            )
+            if revision is not None and none_match(request, make_etag(revision)):
+                return not_modified(make_etag(revision))
+
+        instance = self.get_object()
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data, headers={"ETag": make_etag(instance.revision)})
+
+
+def not_modified(etag):
+    return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
+class OwnerListCreateView(ValuesListMixin, BulkCreateMixin, generics.ListCreateAPIView):
     queryset = Owner.objects.all()
     serializer_class = OwnerSerializer
 
 
-class OwnerRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
+class NDJSONExportView(generics.GenericAPIView):
+    # Fields exported for each row, in the same shape as the model serializer
+    export_fields = ()
+    chunk_size = 2000
+
+    # Stream the whole table as newline-delimited JSON, reading plain value
+    # rows in chunks so memory stays flat regardless of the table size
+    def get(self, request, *args, **kwargs):
+        return StreamingHttpResponse(
+            self.stream(self.rows()), content_type="application/x-ndjson"
+        )
+
+    def rows(self):
+        return (
+            self.get_queryset()
+            .order_by()
+            .values(*self.export_fields)
+            .iterator(chunk_size=self.chunk_size)
+        )
+
+    def stream(self, rows):
+        encode = DjangoJSONEncoder(separators=(",", ":")).encode
+        lines = []
+        for row in rows:
+            lines.append(encode(row))
+            if len(lines) == self.chunk_size:
+                lines.append("")
+                yield "\n".join(lines)
+                lines = []
+        if lines:
+            lines.append("")
+            yield "\n".join(lines)
+
+
+class OwnerExportView(NDJSONExportView):
+    queryset = Owner.objects.all()
+    export_fields = OwnerSerializer.Meta.fields
+
+
+class OwnerRetrieveUpdateDestroyView(
+    ConditionalRetrieveMixin, generics.RetrieveUpdateDestroyAPIView
+):
     queryset = Owner.objects.all()
     serializer_class = OwnerSerializer
 
+    # Deletes the owner's pets with set-based statements, not row by row
+    def perform_destroy(self, instance):
+        if fast_deletes(Owner):
+            delete_owners(Owner.objects.filter(pk=instance.pk))
+        else:
+            instance.delete()
+
+
+class OwnerPetListView(ValuesListMixin, generics.ListAPIView):
+    serializer_class = OwnerPetSerializer
+
+    # Task 3
+    # List an owner's pets with their eligibility, computed in the same query
+    def get_queryset(self):
+        return (
+            Pet.objects.filter(owner_id=self.kwargs.get("pk"))
+            .only("id", "name", "species", "created_at")
+            .with_eligibility()
+        )
 
-class PetRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
+    def list(self, request, *args, **kwargs):
+        if not Owner.objects.filter(id=kwargs.get("pk")).exists():
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        return super().list(request, *args, **kwargs)
+
+
+class PetRetrieveUpdateDestroyView(
+    ConditionalRetrieveMixin, generics.RetrieveUpdateDestroyAPIView
+):
     queryset = Pet.objects.all()
     serializer_class = PetSerializer
 
+    # Deletes the pet's conditions and estimate with set-based statements
+    def perform_destroy(self, instance):
+        if fast_deletes(Pet):
+            delete_pets(Pet.objects.filter(pk=instance.pk))
+        else:
+            instance.delete()
+
 
-class PetListCreateView(generics.ListCreateAPIView):
+class PetListCreateView(ValuesListMixin, BulkCreateMixin, generics.ListCreateAPIView):
     queryset = Pet.objects.all()
     serializer_class = PetSerializer
 
 
+class PetExportView(NDJSONExportView):
+    queryset = Pet.objects.all()
+    export_fields = PetSerializer.Meta.fields
+
+
 class PetMedicalConditionDestroyView(generics.DestroyAPIView):
     queryset = PetMedicalCondition.objects.all()
     serializer_class = PetMedicalConditionSerializer
@@ -39,16 +222,29 @@ class PetMedicalConditionDestroyView(generics.DestroyAPIView):
     def destroy(self, request, *args, **kwargs):
         pet_id = kwargs.get("pk")
         condition_id = kwargs.get("condition_pk")
-        return Response(status=status.HTTP_501_NOT_IMPLEMENTED)
+        medical_condition = (
+            self.get_queryset().filter(id=condition_id, pet_id=pet_id).first()
+        )
+        if not medical_condition:
+            return Response(status=status.HTTP_404_NOT_FOUND)
 
+        # The pet's risk summary is updated in the same transaction
+        with transaction.atomic():
+            medical_condition.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
 
-class PetMedicalConditionListCreateView(generics.ListCreateAPIView):
+
+class PetMedicalConditionListCreateView(
+    ValuesListMixin, BulkCreateMixin, generics.ListCreateAPIView
+):
     queryset = PetMedicalCondition.objects.all()
     serializer_class = PetMedicalConditionSerializer
 
     def get_serializer_class(self):
         if self.request.method == "POST":
             return PetMedicalConditionCreateSerializer
+        if self.request.method == "DELETE":
+            return PetMedicalConditionBulkDeleteSerializer
         return super().get_serializer_class()
 
     # Retrieve all the medical conditions for a specific pet
@@ -58,18 +254,91 @@ class PetMedicalConditionListCreateView(generics.ListCreateAPIView):
         if not pet:
             return Response(status=status.HTTP_404_NOT_FOUND)
 
-        medical_conditions = PetMedicalCondition.objects.filter(pet=pet)
-        serializer = self.get_serializer(medical_conditions, many=True)
-        return Response(serializer.data)
+        return self.list_response(PetMedicalCondition.objects.filter(pet=pet))
 
     # Task 1
-    # Create a medical condition for a pet
+    # Create a medical condition for a pet, or several from a list payload.
+    # Conditions the pet already has are returned as they are, with 200 when
+    # nothing was created, so retries don't add rows or invalidate estimates.
+    @idempotent
     def post(self, request, *args, **kwargs):
-        return Response(status=status.HTTP_501_NOT_IMPLEMENTED)
+        pet = Pet.objects.filter(id=kwargs.get("pk")).first()
+        if not pet:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        many = isinstance(request.data, list)
+        items = serializer.validated_data if many else [serializer.validated_data]
+        conditions = [item["condition"] for item in items]
+
+        try:
+            rows, created = self.upsert(pet, conditions)
+        except IntegrityError:
+            # A concurrent request added one of the conditions first
+            rows, created = self.upsert(pet, conditions)
+
+        response = PetMedicalConditionSerializer(
+            [rows[condition] for condition in conditions], many=True
+        ).data
+        return Response(
+            response if many else response[0],
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
+
+    def upsert(self, pet, conditions):
+        """
+        Return the pet's rows for ``conditions`` by condition, inserting the
+        missing ones, and whether any was inserted.
+        """
+        rows = {
+            row.condition: row
+            for row in PetMedicalCondition.objects.filter(
+                pet=pet, condition__in=set(conditions)
+            )
+        }
+        # A pet has each condition at most once
+        new = [
+            PetMedicalCondition(pet=pet, condition=condition)
+            for condition in dict.fromkeys(conditions)
+            if condition not in rows
+        ]
+        if new:
+            # The pet's risk summary is updated in the same transaction
+            with transaction.atomic():
+                PetMedicalCondition.objects.bulk_create(
+                    new, batch_size=BulkCreateListSerializer.batch_size
+                )
+                medical_conditions_bulk_created(pet, new)
+            rows.update((row.condition, row) for row in new)
+        return rows, bool(new)
+
+    # Delete some of a pet's medical conditions by id, or all of them
+    def delete(self, request, *args, **kwargs):
+        pet = Pet.objects.filter(id=kwargs.get("pk")).first()
+        if not pet:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        conditions = PetMedicalCondition.objects.all()
+        if "ids" in serializer.validated_data:
+            conditions = conditions.filter(id__in=serializer.validated_data["ids"])
+
+        if fast_deletes(PetMedicalCondition):
+            deleted = delete_medical_conditions(pet, conditions)
+        else:
+            with transaction.atomic():
+                deleted, _ = conditions.filter(pet=pet).delete()
+        return Response({"deleted": deleted})
 
 
 class PetEstimateView(generics.RetrieveAPIView):
-    queryset = Pet.objects.all()
+    queryset = (
+        Pet.objects.with_estimate_inputs()
+        .annotate(owner_revision=F("owner__revision"))
+        .select_related("materialized_estimate")
+    )
     serializer_class = PetEstimateSerializer
 
     def get_object(self):
@@ -78,4 +347,154 @@ class PetEstimateView(generics.RetrieveAPIView):
     # Task 2
     # Compute the cost of insuring a specific pet
     def post(self, request, *args, **kwargs):
-        return Response(status=status.HTTP_501_NOT_IMPLEMENTED)
+        pet_id = self.kwargs.get("pk")
+        engine = active_rates.engine()
+        # Cached with the ETag of the rows the estimate was computed from
+        cached = cached_estimate(pet_id, engine.version)
+        if cached is None and "If-None-Match" in request.headers:
+            etag = current_estimate_etag(pet_id, engine.version)
+            # The POST only reads, it's answered like a conditional GET
+            if etag is not None and none_match(request, etag):
+                return not_modified(etag)
+
+        if cached is None:
+            pet = self.get_object()
+            if not pet:
+                return Response(status=status.HTTP_404_NOT_FOUND)
+
+            # The materialized estimate when current, else computed from the
+            # same row
+            estimate = current_estimate(pet, engine) or pet.estimate(engine)
+            data = self.get_serializer(estimate.as_dict()).data
+            etag = estimate_etag(
+                pet.revision,
+                pet.conditions_revision,
+                pet.owner_revision,
+                engine.version,
+            )
+            estimate_cache.add(pet_id, engine.version, (data, etag))
+        else:
+            data, etag = cached
+            if none_match(request, etag):
+                return not_modified(etag)
+        return Response(data, headers={"ETag": etag})
+
+
+class PetEstimateBatchView(generics.GenericAPIView):
+    queryset = Pet.objects.with_estimate_inputs().select_related(
+        "materialized_estimate"
+    )
+    serializer_class = PetEstimateBatchSerializer
+    # Pets loaded per query, keeps the IN clause below SQLite's variable limit
+    chunk_size = 500
+
+    # Estimate many pets at once, streaming a JSON object keyed by pet id
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        # One rate version for the whole response
+        self.engine = active_rates.engine()
+        return StreamingHttpResponse(
+            self.stream(self.estimate_chunks(serializer.validated_data)),
+            content_type="application/json",
+        )
+
+    def stream(self, chunks):
+        yield "{"
+        first = True
+        for chunk in chunks:
+            items = ",".join(
+                f'"{pet_id}":{json.dumps(estimate, separators=(",", ":"))}'
+                for pet_id, estimate in chunk
+            )
+            yield items if first else "," + items
+            first = False
+        yield "}"
+
+    def estimate_chunks(self, params):
+        """Yield lists of (pet id, estimate or None), one query per chunk."""
+        queryset = self.get_queryset()
+        if "owner" in params:
+            queryset = queryset.filter(owner_id=params["owner"])
+        if "province" in params:
+            queryset = queryset.filter(owner__province=params["province"])
+
+        ids = params.get("ids")
+        if ids is None:
+            chunk = []
+            for pet in queryset.iterator(chunk_size=self.chunk_size):
+                chunk.append((pet.id, self.estimate(pet)))
+                if len(chunk) == self.chunk_size:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+            return
+
+        # A repeated id would repeat its key in the response
+        ids = list(dict.fromkeys(ids))
+        for start in range(0, len(ids), self.chunk_size):
+            chunk_ids = ids[start : start + self.chunk_size]
+            pets = {pet.id: pet for pet in queryset.filter(id__in=chunk_ids)}
+            yield [
+                (pet_id, self.estimate(pets[pet_id]) if pet_id in pets else None)
+                for pet_id in chunk_ids
+            ]
+
+    def estimate(self, pet):
+        estimate = current_estimate(pet, self.engine) or pet.estimate(self.engine)
+        return estimate.as_dict()
+
+
+class EstimateCacheStatsView(generics.GenericAPIView):
+    # Hit ratio and eviction counters of the estimate cache in this process
+    def get(self, request, *args, **kwargs):
+        return Response(estimate_cache.stats())
+
+
+class PortfolioStatsView(generics.GenericAPIView):
+    # Pets and average premium by province and species from the counters,
+    # as of the last refresh_estimates run. ?exact=1 computes them from the
+    # pets to verify the counters
+    def get(self, request, *args, **kwargs):
+        if request.query_params.get("exact") in ("1", "true"):
+            return Response(portfolio.live_stats())
+        return Response(portfolio.stats())
+
+
+class JobCreateView(generics.GenericAPIView):
+    queryset = Job.objects.all()
+    serializer_class = JobSerializer
+
+    # Queue a job for run_workers, 202 with the job's URL in Location
+    @idempotent
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        job = serializer.save()
+        return Response(
+            serializer.data,
+            status=status.HTTP_202_ACCEPTED,
+            headers={"Location": reverse("job-retrieve", kwargs={"pk": job.pk})},
+        )
+
+
+class JobRetrieveView(generics.RetrieveAPIView):
+    queryset = Job.objects.all()
+    serializer_class = JobSerializer
+
+
+class JobOutputView(generics.GenericAPIView):
+    queryset = Job.objects.all()
+
+    # Download the file written by a batch estimate or export job
+    def get(self, request, *args, **kwargs):
+        job = self.get_object()
+        path = output_path(job)
+        if job.status != JobStatus.SUCCEEDED or path is None:
+            raise Http404("The job has no output.")
+        try:
+            file = open(path, "rb")
+        except FileNotFoundError:
+            raise Http404("The job's output was removed.")
+        return FileResponse(file, content_type=job.result["content_type"])
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -42,6 +43,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First so its wall time covers the other middleware
+    'core.metrics.RequestMetricsMiddleware',
+    'core.routers.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -79,9 +83,104 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Seconds a connection is reused across requests, 0 closes it after
+        # each request. Set it to 0 when serving the async views over ASGI,
+        # whose connections aren't reused across requests
+        'CONN_MAX_AGE': int(os.environ.get('CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Read replica for read-only requests, routed by core.routers. Locally a second
+# SQLite file refreshed by `manage.py sync_replica --interval 1`.
+if os.environ.get('REPLICA_DATABASE'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.environ['REPLICA_DATABASE'],
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+
+# Seconds a client reads from default after a write, longer than the replica lag
+READ_YOUR_WRITES_SECONDS = 5
+
+# Pragmas run on every new SQLite connection by core.signals. WAL lets reads
+# run alongside a write, and with synchronous=NORMAL a commit no longer waits
+# for an fsync. Set SQLITE_TUNING=0 for SQLite's defaults; the journal mode
+# is stored in the database file and stays WAL until changed back.
+SQLITE_TUNING = os.environ.get('SQLITE_TUNING', '1') != '0'
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 2**20,
+    # Negative sizes are in KiB
+    'cache_size': -64_000,
+    # Milliseconds a writer waits for the lock before "database is locked"
+    'busy_timeout': 5000,
+    'temp_store': 'MEMORY',
+} if SQLITE_TUNING else {}
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Estimate results, invalidated by the signal handlers in core.signals
+    'estimates': {
+        'BACKEND': 'core.cache.CountingLocMemCache',
+        'LOCATION': 'estimates',
+        'TIMEOUT': 3600,
+        'OPTIONS': {
+            'MAX_ENTRIES': 100_000,
+        },
+    },
+    # Responses of requests sent with an Idempotency-Key (core.idempotency),
+    # shared by all the worker processes. Its table is created by migrate
+    # (core/migrations/0011_cache_tables.py)
+    'idempotency': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'idempotency_cache',
+        'TIMEOUT': 24 * 3600,
+        'OPTIONS': {
+            'MAX_ENTRIES': 100_000,
+        },
+    },
+}
+
+
+# Per-endpoint query counts and timings, served at /api/_metrics. Optional,
+# it adds a little overhead to every request
+
+REQUEST_METRICS = False
+
+
+# Background jobs (core.jobs): worker processes started by run_workers (the
+# number of CPUs when None), seconds without progress after which a running
+# job is requeued, and where batch estimates and exports are written
+
+JOB_WORKERS = None
+
+JOB_STALE_SECONDS = 600
+
+JOB_OUTPUT_DIR = BASE_DIR / 'job_output'
+
+
+# Django REST framework
+# https://www.django-rest-framework.org/api-guide/settings/
+
+REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.CreatedAtCursorPagination',
+    'PAGE_SIZE': 100,
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators